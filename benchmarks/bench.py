@@ -0,0 +1,297 @@
+"""
+框架自身热点路径的离线基准测试
+
+在本地模拟站点上测量浏览器启动、上下文/页面创建、BasePage 操作往返、各就绪策略、失败截图
+和完整场景大纲的吞吐量，结果写入 JSON，并可与基线比较以发现性能回退。
+
+用法:
+    python benchmarks/bench.py                                  # 运行并写出 reports/benchmarks/latest.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json   # 与基线比较，回退时返回非零退出码
+    python benchmarks/bench.py --save-baseline benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from playwright.sync_api import sync_playwright
+from config.config import TestConfig
+from pages.base_page import BasePage, EXPLICIT, ACTIONABILITY
+from pages.baidu_page import BaiduPage
+from utils.readiness import (
+    DOM_READY, PAGE_LOAD, NETWORK_IDLE, FULL_LOAD,
+    SelectorReadiness, NetworkSettledReadiness, PredicateReadiness,
+)
+from utils.report import ScreenshotPipeline
+from utils.context_pool import ContextPool
+from benchmarks.fake_site import FakeSearchSite
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _summarize(samples: List[float]) -> Dict[str, Any]:
+    """把秒级样本汇总为毫秒统计"""
+    ordered = sorted(samples)
+    return {
+        "unit": "ms",
+        "samples": len(ordered),
+        "min": round(ordered[0] * 1000, 2),
+        "median": round(_percentile(ordered, 0.5) * 1000, 2),
+        "p95": round(_percentile(ordered, 0.95) * 1000, 2),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+    }
+
+
+def measure(func: Callable[[], Any], iterations: int, setup: Optional[Callable[[], Any]] = None,
+            warmup: int = 1) -> Dict[str, Any]:
+    """
+    重复执行并计时
+    :param func: 被测函数
+    :param iterations: 计时次数
+    :param setup: 每次执行前调用、不计入耗时的准备函数
+    :param warmup: 预热次数
+    """
+    samples = []
+    for index in range(warmup + iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if index >= warmup:
+            samples.append(elapsed)
+    return _summarize(samples)
+
+
+class FrameworkBenchmark:
+    """
+    框架基准测试
+    :param test_config: TestConfig 实例（基准测试固定使用无头模式）
+    :param site: 本地模拟站点
+    :param iterations: 每项测量的计时次数
+    """
+
+    def __init__(self, test_config: TestConfig, site: FakeSearchSite, iterations: int):
+        self.config = test_config
+        self.site = site
+        self.iterations = iterations
+        self.results: Dict[str, Dict[str, Any]] = {}
+        BaiduPage.url = site.url
+
+    def _record(self, name: str, result: Dict[str, Any]) -> None:
+        self.results[name] = result
+        value = result.get("median", result.get("value"))
+        print(f"{name:<40} {value:>10} {result['unit']}")
+
+    def run_browser(self, playwright) -> None:
+        """浏览器启动、上下文和页面创建、上下文池复用"""
+        browser_type = getattr(playwright, self.config.browser_type)
+        launch_options = self.config.get_browser_launch_options()
+
+        def launch():
+            browser_type.launch(**launch_options).close()
+        self._record("browser.launch_close", measure(launch, max(3, self.iterations // 5)))
+
+        browser = browser_type.launch(**launch_options)
+        options = self.config.get_context_options()
+        try:
+            def new_context():
+                context = browser.new_context(**options)
+                context.new_page()
+                context.close()
+            self._record("fixture.context_page", measure(new_context, self.iterations))
+
+            pool = ContextPool(self.config)
+
+            def pooled_context():
+                context = pool.acquire(browser, options)
+                context.new_page()
+                pool.release(context)
+            self._record("fixture.context_page_pooled", measure(pooled_context, self.iterations))
+            pool.close()
+
+            self.run_page(browser, options)
+        finally:
+            browser.close()
+
+    def run_page(self, browser, options: Dict[str, Any]) -> None:
+        """页面对象操作、就绪策略和截图"""
+        context = browser.new_context(**options)
+        context.set_default_timeout(self.config.timeout)
+        page = context.new_page()
+        try:
+            baidu_page = BaiduPage(page)
+            baidu_page.navigate()
+
+            self._record("action.fill", measure(lambda: baidu_page.fill("#kw", "Playwright"), self.iterations))
+            self._record("action.get_attribute", measure(
+                lambda: baidu_page.get_attribute("#kw", "value"), self.iterations))
+            self._record("action.is_visible", measure(lambda: baidu_page.is_visible("#su"), self.iterations))
+            self._record("action.clear_input", measure(lambda: baidu_page.clear_input("#kw"), self.iterations))
+            self._record("action.evaluate", measure(
+                lambda: baidu_page.evaluate("document.title"), self.iterations))
+
+            # actionability 模式：不再单独等待元素可见，动作自带可操作性检查
+            BasePage.action_mode = ACTIONABILITY
+            try:
+                self._record("action.fill_actionability", measure(
+                    lambda: baidu_page.fill("#kw", "Playwright"), self.iterations))
+                self._record("action.clear_fill_verify_actionability", measure(
+                    lambda: baidu_page.clear_fill_verify("#kw", "Playwright"), self.iterations))
+            finally:
+                BasePage.action_mode = EXPLICIT
+
+            def search():
+                baidu_page.input_search_keyword("Playwright")
+                baidu_page.click_search()
+            self._record("action.search_round_trip", measure(search, self.iterations, setup=baidu_page.navigate))
+            self._record("action.extract_results", measure(baidu_page.get_search_result_records, self.iterations))
+
+            strategies = {
+                "dom_ready": DOM_READY,
+                "page_load": PAGE_LOAD,
+                "network_idle": NETWORK_IDLE,
+                "full_load": FULL_LOAD,
+                "selector": SelectorReadiness("#su"),
+                "network_settled": NetworkSettledReadiness(["**/api/*"], quiet_ms=100),
+                "predicate": PredicateReadiness("document.querySelector('#kw') !== null"),
+            }
+            for name, strategy in strategies.items():
+                # 网络跟踪类策略需要在导航前注册监听器；导航只等到提交，随后计时等待
+                strategy.prepare(page)
+                self._record(f"wait_for_loading.{name}", measure(
+                    lambda: baidu_page.wait_for_loading(strategy=strategy),
+                    self.iterations,
+                    setup=lambda: page.goto(self.site.url, wait_until="commit"),
+                ))
+
+            baidu_page.navigate()
+            with tempfile.TemporaryDirectory() as screenshot_dir:
+                for image_type in ("jpeg", "png"):
+                    pipeline = ScreenshotPipeline(
+                        screenshot_dir=screenshot_dir,
+                        image_type=image_type,
+                        quality=self.config.screenshot_quality,
+                        scope=self.config.screenshot_scope,
+                        save_to_disk=True,
+                        timeout=self.config.screenshot_timeout,
+                    )
+                    self._record(f"screenshot.{image_type}", measure(
+                        lambda: pipeline.capture(page, "benchmark"), self.iterations))
+                    pipeline.close()
+        finally:
+            context.close()
+
+    def run_scenarios(self, pytest_args: List[str]) -> None:
+        """以子进程执行 tests/ 下的全部场景，统计场景吞吐量"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result_path = os.path.join(tmp_dir, "scenarios.json")
+            env = dict(os.environ, POBDD_BENCH_URL=self.site.url, POBDD_BENCH_RESULT=result_path)
+            command = [sys.executable, "-m", "pytest", "tests", "-p", "benchmarks.plugin", "-q"] + pytest_args
+            start = time.perf_counter()
+            subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            wall = time.perf_counter() - start
+            if not os.path.exists(result_path):
+                print("场景执行失败，未生成统计结果")
+                return
+            with open(result_path, "r", encoding="utf-8") as f:
+                counts = json.load(f)
+        scenarios = counts["passed"] + counts["failed"]
+        self._record("scenario.throughput", {
+            "unit": "scenarios/s",
+            "value": round(scenarios / wall, 3) if wall else 0.0,
+            "higher_is_better": True,
+            "scenarios": scenarios,
+            "failed": counts["failed"],
+            "wall_seconds": round(wall, 2),
+        })
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    与基线比较
+    :param current: 本次结果
+    :param baseline: 基线结果
+    :param threshold: 允许的相对变化，如 0.2 表示慢 20% 以内不算回退
+    :return: 回退项列表
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        key = "value" if result.get("higher_is_better") else "median"
+        old, new = base.get(key), result.get(key)
+        if not old or new is None:
+            continue
+        change = (old - new) / old if result.get("higher_is_better") else (new - old) / old
+        if change > threshold:
+            regressions.append({"name": name, "baseline": old, "current": new,
+                                "change": f"{change:+.0%}", "unit": result["unit"]})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="框架热点路径离线基准测试")
+    parser.add_argument("--iterations", type=int, default=20, help="每项测量的计时次数")
+    parser.add_argument("--browser", default=None, help="浏览器类型，默认使用 TestConfig.browser_type")
+    parser.add_argument("--output", default="reports/benchmarks/latest.json", help="结果 JSON 路径")
+    parser.add_argument("--baseline", default=None, help="基线 JSON 路径，存在时与之比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定为回退的相对变化")
+    parser.add_argument("--save-baseline", default=None, help="把本次结果保存为基线")
+    parser.add_argument("--skip-scenarios", action="store_true", help="不执行场景吞吐量测量")
+    parser.add_argument("--pytest-args", default="", help="传给场景子进程的额外 pytest 参数，如 \"-n 4\"")
+    args = parser.parse_args(argv)
+
+    test_config = TestConfig(headless=True)
+    if args.browser:
+        test_config.browser_type = args.browser
+
+    with FakeSearchSite() as site:
+        benchmark = FrameworkBenchmark(test_config, site, args.iterations)
+        with sync_playwright() as playwright:
+            benchmark.run_browser(playwright)
+        if not args.skip_scenarios:
+            benchmark.run_scenarios(args.pytest_args.split())
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "browser": test_config.browser_type,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": benchmark.results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(benchmark.results, baseline["results"], args.threshold)
+        for item in regressions:
+            print(f"性能回退 {item['name']}: {item['baseline']} -> {item['current']} {item['unit']} ({item['change']})")
+        if regressions:
+            return 1
+        print(f"与基线相比无超过 {args.threshold:.0%} 的回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
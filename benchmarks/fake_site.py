@@ -0,0 +1,105 @@
+import json
+import threading
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# 首页：搜索框、搜索按钮，加载时发起一个接口请求，便于区分 DOM 就绪和网络空闲
+HOME_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>百度一下，你就知道</title>
+<link rel="stylesheet" href="/static/app.css">
+</head>
+<body>
+<form id="form" action="/s" method="get">
+  <input id="kw" name="wd" autocomplete="off">
+  <input id="su" type="submit" value="百度一下">
+</form>
+<img src="/static/logo.png" alt="logo">
+<script>fetch("/api/hot").then(r => r.json());</script>
+</body>
+</html>
+"""
+
+RESULT_ITEM = """<div class="result-op c-container" data-rank="{rank}">
+  <h3 class="t"><a href="/link?rank={rank}">{keyword} - 结果 {rank}</a></h3>
+  <div class="c-abstract">关于 {keyword} 的第 {rank} 条模拟搜索结果</div>
+</div>"""
+
+# 1x1 透明 PNG
+PNG_PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """模拟百度首页、搜索结果页和静态资源"""
+
+    server_version = "FakeSearch/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send(200, "text/html; charset=utf-8", HOME_PAGE.encode("utf-8"))
+        elif url.path == "/s":
+            keyword = escape(parse_qs(url.query).get("wd", [""])[0])
+            items = "\n".join(
+                RESULT_ITEM.format(rank=rank, keyword=keyword)
+                for rank in range(1, self.server.result_count + 1)
+            )
+            body = HOME_PAGE.replace("</form>", f"</form>\n<div id=\"content_left\">\n{items}\n</div>")
+            body = body.replace('<input id="kw" name="wd"', f'<input id="kw" name="wd" value="{keyword}"')
+            self._send(200, "text/html; charset=utf-8", body.encode("utf-8"))
+        elif url.path == "/api/hot":
+            self._send(200, "application/json", json.dumps({"hot": ["Playwright", "pytest-bdd"]}).encode())
+        elif url.path == "/static/app.css":
+            self._send(200, "text/css", b"body{font-family:sans-serif}.result-op{margin:8px 0}")
+        elif url.path == "/static/logo.png":
+            self._send(200, "image/png", PNG_PIXEL)
+        else:
+            self._send(404, "text/plain", b"not found")
+
+
+class FakeSearchSite:
+    """
+    本地模拟搜索站点，页面结构与 BaiduPage 的定位器一致（#kw、#su、.result-op）
+    :param result_count: 每个搜索结果页的结果条数
+    """
+
+    def __init__(self, result_count: int = 10):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.result_count = result_count
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-search-site", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeSearchSite":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeSearchSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,36 @@
+"""
+基准测试使用的 pytest 插件：把 BaiduPage 指向本地模拟站点，并在结束时写出场景执行统计
+
+通过 `python -m pytest -p benchmarks.plugin` 加载，环境变量：
+    POBDD_BENCH_URL: 模拟站点地址
+    POBDD_BENCH_RESULT: 统计结果 JSON 文件路径
+"""
+import os
+import json
+import time
+from pages.baidu_page import BaiduPage
+from pages.async_baidu_page import AsyncBaiduPage
+
+_counts = {"passed": 0, "failed": 0, "skipped": 0}
+_start = time.perf_counter()
+
+
+def pytest_configure(config):
+    url = os.environ.get("POBDD_BENCH_URL")
+    if url:
+        BaiduPage.url = url
+        AsyncBaiduPage.url = url
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call" or (report.when == "setup" and report.outcome != "passed"):
+        _counts[report.outcome] = _counts.get(report.outcome, 0) + 1
+
+
+def pytest_sessionfinish(session, exitstatus):
+    path = os.environ.get("POBDD_BENCH_RESULT")
+    if not path or hasattr(session.config, "workerinput"):
+        return
+    result = dict(_counts, duration=time.perf_counter() - _start)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 @dataclass
@@ -12,6 +12,15 @@ class TestConfig:
     
     # 浏览器类型：chromium(谷歌内核), firefox(火狐), webkit(Safari内核)
     browser_type: str = "webkit"
+
+    # 多浏览器矩阵：同一批用例在列出的每个引擎上各运行一次，None 表示只使用 browser_type（可用 --browsers 覆盖）
+    browser_matrix: Optional[List[str]] = None
+
+    # 是否连接本地常驻浏览器服务（python -m utils.browser_server start），服务未运行时自动启动并在测试结束后保留
+    browser_server_enabled: bool = False
+
+    # 浏览器服务状态目录（进程ID、websocket 地址和日志）
+    browser_server_dir: str = ".pytest_cache/pobdd/browser_server"
     
     # 是否使用无头模式（不显示浏览器界面）
     headless: bool = False
@@ -32,6 +41,9 @@ class TestConfig:
     
     # 页面加载超时时间
     navigation_timeout: int = 30000
+
+    # 操作前等待模式：explicit(先等待元素可见再操作), actionability(依赖动作自带的可操作性检查，减少驱动往返)
+    action_mode: str = "explicit"
     
     # ============================
     # 测试报告配置
@@ -40,28 +52,170 @@ class TestConfig:
     # 测试失败时是否自动截图
     screenshot_on_failure: bool = True
     
-    # 测试失败时是否保存录像
+    # 测试失败时是否保存录像（等同于 video_mode="retain-on-failure"）
     video_on_failure: bool = False
+
+    # 录像模式：off(关闭), on(全部保留), retain-on-failure(仅保留失败或重试过的测试)
+    # None 表示根据 video_on_failure 决定
+    video_mode: Optional[str] = None
+
+    # Playwright 追踪模式：off(关闭), on(全部保留), retain-on-failure(仅保留失败或重试过的测试)
+    trace_mode: str = "off"
+
+    # 追踪文件保存目录
+    trace_dir: str = "reports/traces"
     
     # 截图保存目录
     screenshot_dir: str = "reports/screenshots"
     
+    # 截图格式：jpeg 或 png
+    screenshot_type: str = "jpeg"
+
+    # JPEG 截图质量 (0-100)
+    screenshot_quality: int = 70
+
+    # 截图范围：viewport(当前视窗) 或 full_page(整页)
+    screenshot_scope: str = "viewport"
+
+    # 只截取指定元素，None 表示按 screenshot_scope 截图
+    screenshot_clip_selector: Optional[str] = None
+
+    # 是否在后台线程中把截图写入 screenshot_dir（报告附件始终在内存中直接生成）
+    screenshot_save_to_disk: bool = True
+
+    # 截图超时时间（毫秒），避免页面无响应时拖住工作进程
+    screenshot_timeout: int = 5000
+    
     # 视频保存目录
     video_dir: str = "reports/videos"
+
+    # 是否按内容哈希保存报告附件：相同截图/附件只保存一次，Allure 结果和截图目录中为硬链接
+    artifact_store_enabled: bool = False
+
+    # 附件存储目录
+    artifact_store_dir: str = "reports/artifacts"
+
+    # 文本/HTML 附件超过该字符数时以 gzip 压缩后附加（.gz 附件在 Allure 中不能直接查看，只能下载），None 表示不压缩
+    artifact_compress_min_bytes: Optional[int] = None
+
+    # 附件存储总大小上限（字节），超出时淘汰最久未使用的对象（连同其在 Allure 结果和截图目录中的链接）
+    artifact_max_bytes: int = 2 * 1024 ** 3
+
+    # 附件存储对象（及其在 Allure 结果和截图目录中的链接）的保留天数，不清理录像、追踪和存储之外的文件
+    artifact_max_age_days: float = 7.0
+
+    # 页面对象步骤记录模式：full(全部记录), top-level(只记录最外层操作), buffered(缓存，仅失败时写入)
+    step_recording_mode: str = "full"
     
+    # 日志格式：text(文本) 或 json(JSON Lines，便于日志平台解析)
+    log_format: str = "text"
+
+    # 日志目录，每个 xdist 工作进程写入独立文件
+    log_dir: str = "logs"
+
+    # 是否记录页面操作耗时（等待/动作/重试拆分），开启后运行结束时写出 metrics_dir/actions.json 和 actions.prom
+    action_metrics_enabled: bool = False
+
+    # 操作耗时报告目录：actions.json 和 Prometheus 文本文件 actions.prom
+    metrics_dir: str = "reports/metrics"
+
+    # 是否统计每个测试发送给 Playwright 驱动的调用次数（写入 metrics_dir/driver_calls.json），开启时替换 Playwright 内部的消息发送方法
+    count_driver_calls: bool = False
+
     # ============================
     # 重试机制配置
     # ============================
     
-    # 失败重试次数
+    # 失败重试次数（单个操作的最大尝试次数，含首次执行）
     retry_count: int = 3
     
-    # 重试间隔时间（秒）
+    # 重试间隔时间（秒），作为指数退避的基础时间
     retry_delay: float = 1.0
+
+    # 单次退避等待上限（秒）
+    retry_max_delay: float = 10.0
+
+    # 单个测试内所有操作的重试总时间预算（秒），剩余预算不足以完成下一次等待和尝试（按上一次尝试耗时估算）时不再重试，None 表示不限制
+    retry_budget: Optional[float] = 30.0
     
+    # ============================
+    # 并行执行配置
+    # ============================
+
+    # 每个 xdist 工作进程启动的浏览器数量
+    browsers_per_worker: int = 1
+
+    # 是否启用浏览器上下文池（上下文在测试之间复用并重置）
+    context_pool_enabled: bool = False
+
+    # 单个上下文最多复用次数，达到后关闭并重新创建
+    context_max_uses: int = 20
+
+    # 异步模式下单个事件循环内同时执行的场景数
+    async_concurrency: int = 4
+
+    # 是否按历史耗时把最长的测试排在最前并维护耗时历史（--shard i/n 不受此开关影响，总是使用并维护历史）
+    schedule_by_duration: bool = False
+
+    # 每个测试（场景大纲的每个示例）的历史耗时文件，CI 中可缓存该文件供下次运行使用
+    duration_history_path: str = ".pytest_cache/pobdd/durations.json"
+
+    # ============================
+    # 网络录制/回放配置
+    # ============================
+
+    # HAR 模式：off(关闭), record(按 feature 录制), replay(从 HAR 回放)
+    har_mode: str = "off"
+
+    # HAR 文件目录
+    har_dir: str = "data/har"
+
+    # 回放时 HAR 中没有的请求是否访问真实网络（默认中止，适用于离线 CI）
+    har_replay_allow_network: bool = False
+
+    # ============================
+    # 资源拦截配置
+    # ============================
+
+    # 默认资源拦截配置名称，可通过 feature 标签 @blocking:<名称> 覆盖
+    blocking_profile: str = "none"
+
+    # 资源拦截配置，在 __post_init__ 中初始化
+    blocking_profiles: Dict[str, Dict[str, Any]] = None
+
+    # ============================
+    # 测试收集配置
+    # ============================
+
+    # 是否把 feature 文件解析结果缓存到磁盘（按文件内容哈希和 pytest-bdd 版本失效，xdist 工作进程共享）
+    feature_cache_enabled: bool = False
+
+    # feature 解析缓存目录
+    feature_cache_dir: str = ".pytest_cache/pobdd/features"
+
+    # 是否总是记录每个场景实际使用的步骤定义、页面对象方法和选择器（供 --impact-base 变更影响分析使用），
+    # 关闭时只在传入 --impact-base 或 --impact-record 时记录
+    impact_map_enabled: bool = False
+
+    # 变更影响映射文件，CI 中可缓存该文件供后续 PR 运行使用
+    impact_map_path: str = ".pytest_cache/pobdd/impact.json"
+
+    # ============================
+    # 登录状态配置
+    # ============================
+
+    # 登录状态缓存目录，按 <环境>/<角色>.json 保存（包含 cookies，不要提交到代码库）
+    auth_state_dir: str = ".pytest_cache/pobdd/auth"
+
+    # 登录状态有效期（秒），超过后重新登录；cookies 先于该时间过期时以 cookies 为准
+    auth_state_ttl: int = 3600
+
     # ============================
     # 测试环境URL配置
     # ============================
+
+    # 当前测试环境 (test/staging/prod)，用于区分各环境的登录状态
+    env: str = "test"
     
     # 各环境基础URL配置
     base_urls: Dict[str, str] = None
@@ -91,6 +245,36 @@ class TestConfig:
             }
         }
         
+        # 配置资源拦截规则
+        analytics_patterns = [
+            "*://hm.baidu.com/*",
+            "*://*.google-analytics.com/*",
+            "*://*.googletagmanager.com/*",
+        ]
+        self.blocking_profiles = {
+            # 不拦截
+            "none": {},
+            # 不加载图片、音视频和字体
+            "no-media": {
+                "resource_types": ["image", "media", "font"],
+            },
+            # 不加载第三方站点资源
+            "no-third-party": {
+                "block_third_party": True,
+                "url_patterns": analytics_patterns,
+            },
+            # 只保留文档、脚本和接口请求，适用于只校验页面文本的场景
+            "text-only": {
+                "resource_types": ["image", "media", "font", "stylesheet"],
+                "block_third_party": True,
+                "url_patterns": analytics_patterns,
+            },
+        }
+        
+        # 兼容 video_on_failure 配置
+        if self.video_mode is None:
+            self.video_mode = "retain-on-failure" if self.video_on_failure else "off"
+        
         # 创建必要的目录
         os.makedirs(self.screenshot_dir, exist_ok=True)
         os.makedirs(self.video_dir, exist_ok=True)
@@ -112,21 +296,25 @@ class TestConfig:
             ]
         }
     
-    def get_context_options(self) -> Dict[str, Any]:
+    def get_context_options(self, storage_state: Optional[str] = None) -> Dict[str, Any]:
         """
         获取浏览器上下文选项
+        :param storage_state: 登录状态文件路径，None 表示不注入
         :return: 上下文配置字典
         """
-        return {
+        options = {
             "viewport": {
                 "width": self.viewport_width,
                 "height": self.viewport_height,
             },
-            "record_video_dir": self.video_dir if self.video_on_failure else None,
+            "record_video_dir": self.video_dir if self.video_mode != "off" else None,
             "accept_downloads": True,  # 允许下载
             "ignore_https_errors": True,  # 忽略HTTPS错误
             "java_script_enabled": True,  # 启用JavaScript
         }
+        if storage_state:
+            options["storage_state"] = storage_state
+        return options
     
     def get_url(self, env: str, key: str) -> str:
         """
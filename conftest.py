@@ -1,17 +1,90 @@
+import os
+import json
+import time
+import subprocess
 import pytest
+import pytest_asyncio
+from functools import partial
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 import allure
 from config.config import TestConfig
+from pages.base_page import BasePage, ACTION_MODES
 from pages.baidu_page import BaiduPage
+from pages.async_base_page import AsyncBasePage
+from pages.async_baidu_page import AsyncBaiduPage
+from utils.browser_pool import BROWSER_ENGINES, BrowserPools, get_worker_id, matrix_report
+from utils.context_pool import ContextPool
+from utils.har import HarNetwork
+from utils.request_filter import RequestFilter
+from utils.bdd import get_feature_file, get_feature_key, get_scenario_template
+from utils.test_data import data_cache, get_record_index, resolve_data_path
+from utils.async_runner import run_scenarios
+from utils.report import (artifact_store, compact_allure_results, configure_default_screenshot_pipeline,
+                          default_screenshot_pipeline, close_default_screenshot_pipeline)
+from utils.artifacts import ArtifactRecorder
+from utils.logger import Logger
+from utils.readiness import readiness_stats
+from utils.retry import retry_engine
+from utils.step_recorder import step_recorder
+from utils.metrics import action_metrics, write_reports
+from utils.driver_calls import driver_calls, write_report as write_driver_call_report
+from utils.feature_cache import feature_cache
+from utils.scheduling import DurationHistory, lpt_partition, makespan_report, parse_shard
+from utils.auth import auth_states
+from utils.impact import (impact_recorder, function_symbol, changed_lines, load_impact_map,
+                          merge_impact_map, select_tests)
 
 # ============================
 # 基础 Fixtures
 # ============================
 
 @pytest.fixture(scope="session")
-def test_config():
+def test_config(pytestconfig):
     """全局测试配置"""
-    return TestConfig()
+    config = TestConfig()
+    Logger.configure(config.log_format, config.log_dir)
+    retry_engine.configure(config)
+    step_recorder.configure(config.step_recording_mode)
+    action_metrics.enabled = config.action_metrics_enabled
+    if config.action_mode not in ACTION_MODES:
+        raise ValueError(f"未知的操作等待模式: {config.action_mode}，可选值: {', '.join(ACTION_MODES)}")
+    BasePage.action_mode = config.action_mode
+    AsyncBasePage.action_mode = config.action_mode
+    if config.count_driver_calls:
+        driver_calls.install()
+    # 只在使用影响映射（--impact-base）或显式开启时记录，避免每次运行都改写映射文件
+    impact_recorder.enabled = bool(config.impact_map_enabled or pytestconfig.getoption("impact_record")
+                                   or pytestconfig.getoption("impact_base"))
+    auth_states.configure(config)
+    # 截图流水线（及其后台写入线程）在第一次截图时才创建
+    configure_default_screenshot_pipeline(config)
+    return config
+
+@pytest.fixture(autouse=True)
+def action_state(request, test_config):
+    """
+    为每个测试设置日志上下文、开启重试时间预算、步骤缓存、驱动调用计数和变更影响记录，
+    结束时报告各操作的重试次数和耗时
+    """
+    log_token = Logger.set_test_id(request.node.nodeid)
+    retry_engine.start_test(test_config.retry_budget)
+    step_recorder.start_test()
+    driver_calls.start_test()
+    impact_recorder.start_test()
+    yield
+    impact_recorder.finish_test(request.node.nodeid, filter(None, [str(request.node.fspath), get_feature_file(request.node)]))
+    if driver_calls.installed:
+        calls = driver_calls.finish_test(request.node.nodeid)
+        Logger.get_logger().info(f"驱动调用次数: {calls['total']}")
+    retried = retry_engine.finish_test()
+    if retried:
+        allure.attach(
+            json.dumps(retried, ensure_ascii=False, indent=2),
+            name="retry_stats",
+            attachment_type=allure.attachment_type.JSON
+        )
+    Logger.reset_test_id(log_token)
 
 @pytest.fixture(scope="session")
 def playwright():
@@ -20,27 +93,104 @@ def playwright():
         yield playwright
 
 @pytest.fixture(scope="session")
-def browser(playwright, test_config):
-    """浏览器实例"""
-    browser = getattr(playwright, test_config.browser_type).launch(**test_config.get_browser_launch_options())
-    yield browser
-    browser.close()
+def browser_pools(playwright, test_config):
+    """当前工作进程各浏览器引擎的浏览器池"""
+    pools = BrowserPools(playwright, test_config)
+    yield pools
+    pools.close()
+
+@pytest.fixture(scope="session")
+def browser_pool(browser_pools, test_config):
+    """当前工作进程默认浏览器引擎（browser_type）的浏览器池"""
+    return browser_pools.get(test_config.browser_type)
+
+@pytest.fixture
+def browser_name(request, test_config):
+    """当前测试使用的浏览器引擎，多浏览器矩阵模式下由参数化决定，并标记到 Allure 报告"""
+    name = getattr(request, "param", test_config.browser_type)
+    if hasattr(request, "param"):
+        request.node.user_properties.append(("browser", name))
+        allure.dynamic.tag(name)
+        allure.dynamic.parameter("browser", name)
+    return name
 
 @pytest.fixture(scope="function")
-def context(browser, test_config):
-    """浏览器上下文"""
-    context = browser.new_context(**test_config.get_context_options())
-    context.set_default_timeout(test_config.timeout)
-    context.set_default_navigation_timeout(test_config.navigation_timeout)
+def browser(browser_pools, browser_name):
+    """浏览器实例（从对应引擎的浏览器池中轮询获取）"""
+    return browser_pools.get(browser_name).acquire()
+
+@pytest.fixture(scope="session")
+def context_pool(browser_pools, test_config):
+    """浏览器上下文池（仅在 context_pool_enabled 时使用），先于浏览器池关闭"""
+    pool = ContextPool(test_config)
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def har_network(test_config):
+    """HAR 网络录制/回放"""
+    network = HarNetwork(test_config)
+    yield network
+    network.report()
+
+@pytest.fixture(scope="session")
+def request_filter(test_config):
+    """资源拦截"""
+    request_filter = RequestFilter(test_config)
+    yield request_filter
+    logger = Logger.get_logger()
+    for name, stats in request_filter.stats().items():
+        logger.info(f"资源拦截配置 {name}: {stats}")
+
+@pytest.fixture(scope="session")
+def artifact_recorder(test_config):
+    """录像和追踪保留策略"""
+    recorder = ArtifactRecorder(test_config)
+    yield recorder
+    Logger.get_logger().info(f"录像/追踪产物统计: {recorder.stats()}")
+
+@pytest.fixture(scope="function")
+def context(request, browser, test_config, context_pool, har_network, request_filter, artifact_recorder):
+    """浏览器上下文，声明了登录角色（@auth:<角色>）的测试注入缓存的登录状态"""
+    auth = request.node.get_closest_marker("auth")
+    storage_state = auth_states.get_state(browser, auth.args[0]) if auth else None
+    # 上下文池归还时会清空 cookies，带登录状态的上下文不复用
+    pooled = test_config.context_pool_enabled and not har_network.requires_fresh_context and storage_state is None
+    if pooled:
+        context = context_pool.acquire(browser, test_config.get_context_options())
+    else:
+        context = browser.new_context(**test_config.get_context_options(storage_state))
+        context.set_default_timeout(test_config.timeout)
+        context.set_default_navigation_timeout(test_config.navigation_timeout)
+    har_session = har_network.start(context, get_feature_key(request.node))
+    # 拦截路由后注册、先匹配，被拦截的请求不会进入 HAR 回放
+    blocking = request.node.get_closest_marker("blocking")
+    request_filter.apply(context, blocking.args[0] if blocking else None)
+    artifact_recorder.start_trace(context, request.node)
     yield context
-    context.close()
+    artifact_recorder.finish_trace(context, request.node)
+    if pooled:
+        # 失败测试的上下文不再复用，避免残留状态影响后续测试
+        report = getattr(request.node, "rep_call", None)
+        context_pool.release(context, reusable=not (report and report.failed))
+    else:
+        context.close()
+    misses = har_network.finish(har_session)
+    if misses:
+        allure.attach(
+            json.dumps(misses, ensure_ascii=False, indent=2),
+            name="har_unmatched_requests",
+            attachment_type=allure.attachment_type.JSON
+        )
 
 @pytest.fixture(scope="function")
-def page(context):
+def page(request, context, artifact_recorder):
     """页面实例"""
     page = context.new_page()
     yield page
     page.close()
+    # 页面关闭后录像才完整，通过的测试直接删除录像
+    artifact_recorder.finish_video(page, request.node)
 
 # ============================
 # 页面对象 Fixtures
@@ -51,6 +201,234 @@ def baidu_page(page):
     """百度页面对象"""
     return BaiduPage(page)
 
+# ============================
+# 异步 Fixtures
+# 异步测试需标记 @pytest.mark.asyncio(loop_scope="session")，与这些 fixture 共用一个事件循环
+# ============================
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_playwright_instance():
+    """异步 Playwright 实例"""
+    async with async_playwright() as playwright:
+        yield playwright
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser(async_playwright_instance, test_config):
+    """异步浏览器实例"""
+    browser_type = getattr(async_playwright_instance, test_config.browser_type)
+    browser = await browser_type.launch(**test_config.get_browser_launch_options())
+    yield browser
+    await browser.close()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_context(async_browser, test_config):
+    """异步浏览器上下文（普通上下文：不经过上下文池，不应用 HAR 回放、资源拦截、录像/追踪保留策略和登录状态）"""
+    context = await async_browser.new_context(**test_config.get_context_options())
+    context.set_default_timeout(test_config.timeout)
+    context.set_default_navigation_timeout(test_config.navigation_timeout)
+    yield context
+    await context.close()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page(async_context):
+    """异步页面实例"""
+    page = await async_context.new_page()
+    yield page
+    await page.close()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_baidu_page(async_page):
+    """异步百度页面对象"""
+    return AsyncBaiduPage(async_page)
+
+@pytest.fixture
+def async_scenario_runner(async_browser, test_config):
+    """在一个事件循环中并发执行多个独立场景：await async_scenario_runner([scenario, ...])"""
+    return partial(run_scenarios, async_browser, test_config=test_config)
+
+# ============================
+# pytest-bdd 标签
+# ============================
+
+# 支持 @名称:值 写法的标签，对应 pytest.ini 中注册的带参数标记
+_VALUE_TAGS = ("blocking", "auth", "data_source")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_bdd_apply_tag(tag, function):
+    """将 @blocking:text-only 等已知的 @名称:值 标签转换为带参数的标记，其他标签交给 pytest-bdd 默认处理"""
+    name, separator, value = tag.partition(":")
+    if not separator or name not in _VALUE_TAGS:
+        return None
+    return getattr(pytest.mark, name)(value)(function)
+
+# BDD 步骤开始时缓存中已有的页面操作数量在 item.stash 中的键
+step_buffer_mark_key = pytest.StashKey[int]()
+
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    """记录场景实际使用的步骤定义，供变更影响分析使用；记录 buffered 模式下本步骤缓存操作的起始位置"""
+    impact_recorder.use(function_symbol(step_func))
+    request.node.stash[step_buffer_mark_key] = step_recorder.mark()
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception):
+    """buffered 模式下在 allure 关闭失败的 BDD 步骤之前，把该步骤内缓存的页面操作写入该步骤"""
+    step_recorder.flush(start=request.node.stash.get(step_buffer_mark_key, 0))
+
+# ============================
+# 数据驱动
+# ============================
+
+def _browser_matrix(config) -> list:
+    """多浏览器矩阵中的引擎，--browsers 优先于 TestConfig.browser_matrix，未启用时返回空列表"""
+    option = config.getoption("browsers")
+    engines = option.split(",") if option else TestConfig().browser_matrix or []
+    engines = [engine.strip() for engine in engines if engine.strip()]
+    unknown = [engine for engine in engines if engine not in BROWSER_ENGINES]
+    if unknown:
+        raise pytest.UsageError(f"未知的浏览器引擎: {', '.join(unknown)}，可选值: {', '.join(BROWSER_ENGINES)}")
+    return engines
+
+def pytest_generate_tests(metafunc):
+    """
+    多浏览器矩阵模式下，使用浏览器的用例按引擎参数化；不按引擎分组，所有组合由全部工作进程分担，
+    工作进程按需启动各引擎的浏览器池（按引擎分组会让每个引擎只占用一个工作进程，其余进程空闲）；
+    带 data_source 标记的用例按数据集记录数参数化，参数只是记录序号，记录在 data_row 中按需读取
+    """
+    engines = _browser_matrix(metafunc.config)
+    # pytest-bdd 场景函数的步骤 fixture 在运行时才解析，场景一律视为使用浏览器
+    if engines and ("browser" in metafunc.fixturenames or get_scenario_template(metafunc.definition) is not None):
+        if "browser_name" not in metafunc.fixturenames:
+            metafunc.fixturenames.append("browser_name")
+        metafunc.parametrize(
+            "browser_name",
+            [pytest.param(engine, id=engine) for engine in engines],
+            indirect=True,
+        )
+    marker = metafunc.definition.get_closest_marker("data_source")
+    if marker is None:
+        return
+    index = get_record_index(resolve_data_path(marker.args[0]))
+    limit = marker.kwargs.get("limit")
+    count = min(len(index), limit) if limit else len(index)
+    name = os.path.splitext(os.path.basename(index.path))[0]
+    # pytest-bdd 场景函数的步骤 fixture 在运行时才解析，需要显式加入 data_row
+    if "data_row" not in metafunc.fixturenames:
+        metafunc.fixturenames.append("data_row")
+    metafunc.parametrize("data_row", range(count), indirect=True, ids=[f"{name}-{i}" for i in range(count)])
+
+@pytest.fixture
+def data_row(request):
+    """当前用例对应的数据集记录（字典）"""
+    marker = request.node.get_closest_marker("data_source")
+    if marker is None:
+        raise pytest.UsageError("data_row 需要配合 data_source 标记使用")
+    return get_record_index(resolve_data_path(marker.args[0])).read(request.param)
+
+# ============================
+# 按历史耗时调度
+# ============================
+
+# 会话开始时间在 config.stash 中的键
+session_start_key = pytest.StashKey[float]()
+
+# 本次运行各测试的实际耗时 {nodeid: (工作进程ID, 秒)}，由主进程汇总
+_test_durations = {}
+
+# 本次运行中失败或跳过的测试，其耗时不代表正常执行时间，不写入耗时历史
+_unrepresentative = set()
+
+# 多浏览器矩阵中各测试的结果 {nodeid: {"browser": 引擎, "outcome": 结果, "duration": 秒}}
+_matrix_results = {}
+
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=None, metavar="i/n",
+                     help="按历史耗时把测试均衡分成 n 片，只运行第 i 片（i 从 1 开始），用于多台 CI 机器静态分片")
+    parser.addoption("--impact-base", default=None, metavar="REF",
+                     help="只运行受工作区相对 git 引用 REF 的变更影响的测试（依据 impact_map_path 中记录的影响映射）")
+    parser.addoption("--browsers", default=None, metavar="ENGINES",
+                     help="多浏览器矩阵：逗号分隔的引擎列表（chromium,firefox,webkit），同一批用例在各引擎上运行，"
+                          "配合 -n 时所有 用例×引擎 组合由全部工作进程并行执行")
+    parser.addoption("--impact-include-smoke", action="store_true", default=False,
+                     help="变更影响分析时总是包含 smoke 标记的测试")
+    parser.addoption("--impact-record", action="store_true", default=False,
+                     help="记录场景使用的步骤定义、页面对象方法和选择器并更新 impact_map_path（--impact-base 时自动记录）")
+
+def _deselect(config, items, selected) -> None:
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+def _select_impacted(config, items, test_config) -> None:
+    """按变更影响分析结果取消选择不受影响的测试"""
+    logger = Logger.get_logger()
+    base = config.getoption("impact_base")
+    try:
+        changes = changed_lines(base)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"无法获取相对 {base} 的变更，运行全部测试: {e}")
+        return
+    test_ids = [item.nodeid for item in items]
+    selected, reasons = select_tests(test_ids, load_impact_map(test_config.impact_map_path), changes)
+    for reason in reasons:
+        logger.info(f"变更影响 {reason}")
+    if selected is None:
+        return
+    if config.getoption("impact_include_smoke"):
+        selected.update(item.nodeid for item in items if item.get_closest_marker("smoke"))
+    _deselect(config, items, selected)
+    logger.info(f"变更影响分析: 相对 {base} 变更 {len(changes)} 个文件, 选中 {len(items)}/{len(test_ids)} 个测试")
+
+def pytest_collection_modifyitems(session, config, items):
+    """
+    按变更影响分析和历史耗时分片选择测试，
+    并把耗时最长的测试排在最前（xdist 按需分发时即为最长处理时间优先调度）
+    """
+    test_config = TestConfig()
+    if config.getoption("impact_base"):
+        _select_impacted(config, items, test_config)
+    try:
+        shard = parse_shard(config.getoption("shard"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if not test_config.schedule_by_duration and shard is None:
+        return
+    history = DurationHistory(test_config.duration_history_path)
+    estimates = history.estimate(item.nodeid for item in items)
+    if shard is not None:
+        index, count = shard
+        groups, loads = lpt_partition([item.nodeid for item in items], estimates, count)
+        _deselect(config, items, set(groups[index - 1]))
+        Logger.get_logger().info(f"分片 {index}/{count}: {len(items)} 个测试, 预计耗时 {loads[index - 1]:.1f}s")
+    if test_config.schedule_by_duration:
+        # 稳定排序，耗时相同（如都没有历史）时保持收集顺序
+        items.sort(key=lambda item: -estimates[item.nodeid])
+
+def pytest_sessionstart(session):
+    """记录会话开始时间；让 Allure 文件日志器（allure 插件在 pytest_configure 中注册）通过附件存储写入附件"""
+    session.config.stash[session_start_key] = time.monotonic()
+    test_config = TestConfig()
+    artifact_store.configure(test_config)
+    if test_config.artifact_store_enabled:
+        artifact_store.install_allure(session.config)
+
+def pytest_runtest_logreport(report):
+    """主进程累计每个测试 setup/call/teardown 的耗时，xdist 下报告带有执行它的工作进程ID"""
+    if get_worker_id() != "master":
+        return
+    worker_id, seconds = _test_durations.get(report.nodeid, (getattr(report, "worker_id", "master"), 0.0))
+    _test_durations[report.nodeid] = (worker_id, seconds + report.duration)
+    if not report.passed:
+        _unrepresentative.add(report.nodeid)
+    browser = dict(report.user_properties).get("browser")
+    if browser:
+        result = _matrix_results.setdefault(report.nodeid, {"browser": browser, "outcome": "passed", "duration": 0.0})
+        result["duration"] += report.duration
+        if report.failed:
+            result["outcome"] = "failed"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+
 # ============================
 # 错误处理和报告
 # ============================
@@ -60,14 +438,123 @@ def pytest_runtest_makereport(item, call):
     """测试失败时截图"""
     outcome = yield
     report = outcome.get_result()
+    # 记录各阶段结果，供 fixture 清理阶段判断测试是否失败
+    setattr(item, f"rep_{report.when}", report)
+
+    # buffered 模式下只有失败的测试才写入缓存的步骤：失败步骤内的操作已在 pytest_bdd_step_error 中写入该步骤，
+    # 其余（之前已通过的步骤或非 BDD 测试的操作）合并为一个步骤，避免散落在报告末尾
+    if report.failed:
+        step_recorder.flush(title="缓存的页面操作")
     
-    if report.when == "call" and report.failed:
+    # 只有使用页面的失败测试才截图，截图流水线在第一次截图时创建
+    funcargs = getattr(item, "funcargs", {})
+    test_config = funcargs.get("test_config")
+    if (report.when == "call" and report.failed and "page" in funcargs
+            and test_config is not None and test_config.screenshot_on_failure):
         try:
-            page = item.funcargs["page"]
-            allure.attach(
-                page.screenshot(),
-                name='failure_screenshot',
-                attachment_type=allure.attachment_type.PNG
-            )
+            default_screenshot_pipeline().capture(funcargs["page"], "failure_screenshot")
         except Exception as e:
-            print(f"Failed to capture failure evidence: {e}") 
\ No newline at end of file
+            Logger.get_logger().warning(f"Failed to capture failure evidence: {e}")
+
+# ============================
+# 运行统计
+# ============================
+
+def _metrics_raw_dir() -> str:
+    """各工作进程写出操作耗时原始数据的目录"""
+    return os.path.join(TestConfig().metrics_dir, "raw")
+
+def pytest_configure(config):
+    """
+    在收集测试之前启用 feature 解析缓存；
+    主进程在工作进程启动前清理过期的解析缓存和上一次运行的操作耗时原始数据
+    """
+    test_config = TestConfig()
+    if test_config.feature_cache_enabled:
+        feature_cache.install(test_config.feature_cache_dir)
+    if hasattr(config, "workerinput"):
+        return
+    if test_config.feature_cache_enabled:
+        feature_cache.prune()
+    raw_dir = _metrics_raw_dir()
+    if os.path.isdir(raw_dir):
+        for name in os.listdir(raw_dir):
+            os.remove(os.path.join(raw_dir, name))
+
+def pytest_collection_finish(session):
+    """输出 feature 解析缓存节省的收集时间"""
+    if feature_cache.hits or feature_cache.misses:
+        Logger.get_logger().info(f"feature 解析缓存: {feature_cache.stats()}")
+
+def pytest_sessionfinish(session, exitstatus):
+    """输出页面就绪策略等待耗时、操作重试和步骤记录开销统计，汇总操作耗时报告，合并重复附件并执行附件保留策略"""
+    logger = Logger.get_logger()
+    for name, stats in readiness_stats.summary().items():
+        logger.info(f"页面就绪策略 {name}: {stats}")
+    for action, stats in retry_engine.session_stats.retried().items():
+        logger.info(f"操作重试 {action}: {stats}")
+    logger.info(f"步骤记录开销: {step_recorder.stats()}")
+    close_default_screenshot_pipeline()
+    logger.info(f"数据文件缓存: {data_cache.stats()}")
+    auth_stats = auth_states.stats()
+    if any(auth_stats.values()):
+        logger.info(f"登录状态缓存: {auth_stats}")
+    store_stats = artifact_store.stats()
+    if any(store_stats.values()):
+        logger.info(f"附件存储: {store_stats}")
+
+    # 工作进程只写出原始数据，由主进程在所有工作进程结束后汇总
+    raw_dir = _metrics_raw_dir()
+    action_metrics.dump(raw_dir, get_worker_id())
+    driver_calls.dump(raw_dir, get_worker_id())
+    impact_recorder.dump(raw_dir, get_worker_id())
+    if hasattr(session.config, "workerinput"):
+        return
+    # 只在实际执行过测试时整理附件（--collect-only 等不产生结果的运行跳过）
+    if artifact_store.enabled and _test_durations:
+        test_config = TestConfig()
+        allure_dir = getattr(session.config.option, "allure_report_dir", None)
+        compacted = compact_allure_results(allure_dir)
+        if compacted["removed"]:
+            logger.info(f"Allure 附件去重: {compacted}")
+        # 存储对象只链接到 Allure 结果和截图目录，淘汰对象时一并删除这些链接才能释放空间
+        retention = artifact_store.enforce_retention(filter(None, [allure_dir, test_config.screenshot_dir]))
+        logger.info(f"附件存储保留策略: {retention}")
+    if _test_durations:
+        test_config = TestConfig()
+        history = DurationHistory(test_config.duration_history_path)
+        wall_seconds = time.monotonic() - session.config.stash.get(session_start_key, time.monotonic())
+        schedule = makespan_report(_test_durations, history, wall_seconds)
+        # 只在使用按耗时调度或分片时维护历史，且只记录通过的测试
+        if test_config.schedule_by_duration or session.config.getoption("shard"):
+            history.update({test_id: seconds for test_id, (_, seconds) in _test_durations.items()
+                            if test_id not in _unrepresentative})
+        os.makedirs(test_config.metrics_dir, exist_ok=True)
+        with open(os.path.join(test_config.metrics_dir, "schedule.json"), "w", encoding="utf-8") as f:
+            json.dump(schedule, f, ensure_ascii=False, indent=2)
+        logger.info(
+            f"调度: 预计完成时间 {schedule['predicted_makespan']}s, 实际 {schedule['actual_makespan']}s "
+            f"({schedule['workers']} 个工作进程, 各进程负载 {schedule['worker_loads']})"
+        )
+    if _matrix_results:
+        matrix = matrix_report(_matrix_results)
+        os.makedirs(TestConfig().metrics_dir, exist_ok=True)
+        with open(os.path.join(TestConfig().metrics_dir, "browser_matrix.json"), "w", encoding="utf-8") as f:
+            json.dump(matrix, f, ensure_ascii=False, indent=2)
+        for engine, stats in matrix["engines"].items():
+            logger.info(f"浏览器 {engine}: {stats}")
+        for engine, tests in matrix["failed_only_on"].items():
+            logger.info(f"只在 {engine} 上失败的测试 ({len(tests)}): {', '.join(tests[:5])}")
+    if not os.path.isdir(raw_dir):
+        return
+    updated = merge_impact_map(raw_dir, TestConfig().impact_map_path)
+    if updated:
+        logger.info(f"变更影响映射: 更新 {updated} 个测试")
+    if TestConfig().count_driver_calls:
+        calls = write_driver_call_report(raw_dir, os.path.dirname(raw_dir))
+        logger.info(f"驱动调用合计: {calls['total']} 次, {len(calls['tests'])} 个测试")
+    if not TestConfig().action_metrics_enabled:
+        return
+    report = write_reports(raw_dir, os.path.dirname(raw_dir))
+    for entry in report["slowest_selectors"][:5]:
+        logger.info(f"最慢选择器 {entry['page']} {entry['selector']}: p95 {entry['p95_ms']}ms, 共 {entry['count']} 次")
@@ -0,0 +1,68 @@
+from .async_base_page import AsyncBasePage
+from .elements import Element
+from utils.readiness import DOM_READY, SelectorReadiness
+from utils.step_recorder import step
+
+class AsyncBaiduPage(AsyncBasePage):
+    # 首页只需 DOM 就绪，搜索框随文档一起渲染
+    readiness = DOM_READY
+    # 首页地址，基准测试中指向本地模拟站点
+    url = "https://www.baidu.com"
+
+    # 页面元素
+    _search_input = Element("#kw", description="搜索框")
+    _search_button = Element("#su", description="搜索按钮")
+    _search_results = Element(".result-op", description="搜索结果")
+
+    # 搜索结果记录的字段：{字段名: 结果内的子选择器}
+    _result_fields = {
+        "title": "h3",
+        "url": "h3 a@href",
+        "abstract": ".c-abstract",
+    }
+
+    @step("打开百度首页")
+    async def navigate(self):
+        await self.page.goto(self.url)
+        await self.wait_for_loading()
+
+    @step("输入搜索关键词: {keyword}")
+    async def input_search_keyword(self, keyword: str):
+        await self.fill(self._search_input, keyword)
+
+    @step("点击搜索按钮")
+    async def click_search(self):
+        await self.click(self._search_button)
+        await self.wait_for_loading(strategy=SelectorReadiness(self._search_results.expression))
+
+    @step("搜索: {keyword}")
+    async def search(self, keyword: str):
+        """输入关键词并提交，等待搜索结果出现"""
+        await self.fill_and_submit(self._search_input, keyword, submit=self._search_button)
+        await self.wait_for_loading(strategy=SelectorReadiness(self._search_results.expression))
+
+    @step("检查搜索结果是否包含: {expected_text}")
+    async def verify_search_results(self, expected_text: str) -> bool:
+        await self.wait_for_visible(self._search_results, timeout=10000)
+        # 与原先检查整个页面 HTML 的范围保持一致，在整个页面的可见文本中查找（不再匹配标签属性和脚本内容）
+        return await self.has_text(expected_text, container="body")
+
+    @step("获取搜索结果列表")
+    async def get_search_results(self) -> list:
+        return await self.get_elements(self._search_results)
+
+    @step("获取搜索结果记录")
+    async def get_search_result_records(self) -> list:
+        """
+        一次往返提取所有搜索结果
+        :return: [{"title": 标题, "url": 链接, "abstract": 摘要}, ...]
+        """
+        return await self.extract_rows(self._search_results, self._result_fields)
+
+    @step("获取搜索框的值")
+    async def get_search_input_value(self) -> str:
+        return await self.get_attribute(self._search_input, "value")
+
+    @step("清空搜索框")
+    async def clear_search_input(self):
+        await self.clear_input(self._search_input)
@@ -0,0 +1,468 @@
+from playwright.async_api import Page, Locator, expect, TimeoutError as PlaywrightTimeoutError
+import asyncio
+import fnmatch
+from typing import Optional, Any, List, Union, Pattern, Dict, Sequence, Tuple
+from utils.retry import retry
+from utils.step_recorder import step
+from utils.metrics import timed
+from utils.impact import impact_recorder
+from utils.report import default_screenshot_pipeline
+from utils.readiness import ReadinessStrategy, FULL_LOAD, resolve_readiness
+from .elements import Element, LocatorCache, Target
+from .base_page import (
+    ElementNotVisibleException,
+    ElementNotPresentException,
+    ElementActionException,
+    SubmitActionException,
+    PageException,
+    _NOT_RETRYABLE,
+    EXPLICIT,
+    ACTIONABILITY,
+    _TEXT_SEARCH_JS,
+    _ATTRIBUTES_JS,
+    _ROWS_JS,
+    _TABLE_JS,
+    _js_regex,
+    _field_specs,
+)
+
+class AsyncBasePage:
+    """
+    BasePage 的异步版本，方法与 BasePage 一一对应，均需 await 调用
+    一个事件循环内可以同时驱动多个页面对象
+    """
+
+    # 页面就绪策略，子类可覆盖；默认依次等待 load/domcontentloaded/networkidle
+    readiness: ReadinessStrategy = FULL_LOAD
+    # 操作前等待模式，由 conftest 按 TestConfig.action_mode 设置
+    action_mode: str = EXPLICIT
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.timeout = 10000  # 默认超时时间10秒
+        self.readiness.prepare(page)
+        # 元素描述符的定位器缓存，导航后清空
+        self.locators = LocatorCache(page)
+
+    def _locate(self, target: Target) -> Locator:
+        """
+        获取目标的定位器：元素描述符使用缓存的定位器，字符串选择器直接创建
+        :param target: 选择器或元素描述符
+        """
+        impact_recorder.use_selector(target)
+        if isinstance(target, Element):
+            return self.locators.get(target)
+        return self.page.locator(target)
+
+    async def _before_action(self, target: Target) -> None:
+        """自带可操作性检查的动作执行前调用，actionability 模式下不再单独等待"""
+        if self.action_mode != ACTIONABILITY:
+            await self._ensure_ready(target)
+
+    def _action_error(self, target: Target, error: Exception, message: str) -> PageException:
+        """
+        转换动作异常：actionability 模式下动作超时说明元素始终不可操作，与显式等待失败一样不再重试
+        :param target: 选择器或元素描述符
+        :param error: 原始异常
+        :param message: 操作失败的描述
+        """
+        if self.action_mode == ACTIONABILITY and isinstance(error, PlaywrightTimeoutError):
+            return ElementNotVisibleException(f"元素 {target} 在 {self.timeout}ms 内不可操作")
+        return ElementActionException(message)
+
+    async def _ensure_ready(self, target: Target) -> None:
+        """操作前按元素声明的状态等待，字符串选择器等待可见"""
+        state = target.state if isinstance(target, Element) else "visible"
+        if state == "visible":
+            await self.wait_for_visible(target)
+        elif state == "attached":
+            await self.wait_for_present(target)
+
+    @timed("wait")
+    @step("等待元素可见")
+    async def wait_for_visible(self, selector: Target, timeout: Optional[int] = None) -> None:
+        try:
+            await self._locate(selector).first.wait_for(state="visible", timeout=timeout or self.timeout)
+        except Exception as e:
+            error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未变为可见"
+            raise ElementNotVisibleException(error_msg) from e
+
+    @timed("wait")
+    @step("等待元素存在")
+    async def wait_for_present(self, selector: Target, timeout: Optional[int] = None) -> None:
+        try:
+            await self._locate(selector).first.wait_for(state="attached", timeout=timeout or self.timeout)
+        except Exception as e:
+            error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未出现在DOM中"
+            raise ElementNotPresentException(error_msg) from e
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("点击元素")
+    async def click(self, selector: Target, force: bool = False) -> None:
+        try:
+            await self._before_action(selector)
+            await self._locate(selector).first.click(force=force, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"点击元素 {selector} 失败"
+            raise self._action_error(selector, e, error_msg) from e
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("输入文本")
+    async def fill(self, selector: Target, text: str) -> None:
+        try:
+            await self._before_action(selector)
+            await self._locate(selector).first.fill(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"在元素 {selector} 中输入文本失败"
+            raise self._action_error(selector, e, error_msg) from e
+
+    @timed()
+    @step("获取元素文本")
+    async def get_text(self, selector: Target) -> str:
+        await self._ensure_ready(selector)
+        return await self._locate(selector).first.text_content()
+
+    @timed()
+    @step("获取元素的属性值")
+    async def get_attribute(self, selector: Target, attribute: str) -> Optional[str]:
+        await self.wait_for_present(selector)
+        element = self._locate(selector)
+        return await element.get_attribute(attribute)
+
+    @timed("wait")
+    @step("检查元素是否可见")
+    async def is_visible(self, selector: Target, timeout: Optional[int] = None) -> bool:
+        try:
+            await self.wait_for_visible(selector, timeout=timeout or 1000)
+            return True
+        except:
+            return False
+
+    @timed()
+    @step("获取元素列表")
+    async def get_elements(self, selector: Target) -> List[Any]:
+        return await self._locate(selector).all()
+
+    @timed("wait")
+    @step("等待加载状态")
+    async def wait_for_loading(self, timeout: Optional[int] = None, strategy: Optional[Any] = None) -> None:
+        """
+        按就绪策略等待页面加载
+        :param timeout: 超时时间（毫秒）
+        :param strategy: 本次调用使用的策略（策略对象、名称或判断函数），默认使用页面对象的 readiness
+        """
+        readiness = resolve_readiness(strategy) if strategy is not None else self.readiness
+        await readiness.wait_ready_async(self.page, timeout or self.timeout)
+
+    @timed()
+    @step("滚动到元素")
+    async def scroll_into_view(self, selector: Target) -> None:
+        await self._locate(selector).scroll_into_view_if_needed()
+
+    @timed()
+    @step("悬停在元素上")
+    async def hover(self, selector: Target) -> None:
+        await self._before_action(selector)
+        await self._locate(selector).first.hover(timeout=self.timeout)
+
+    @timed()
+    @step("按键输入")
+    async def press_key(self, selector: Target, key: str) -> None:
+        await self._before_action(selector)
+        await self._locate(selector).first.press(key, timeout=self.timeout)
+
+    @timed()
+    @step("清除输入框")
+    async def clear_input(self, selector: Target) -> None:
+        await self._before_action(selector)
+        await self._locate(selector).first.fill("", timeout=self.timeout)
+
+    @timed()
+    @step("双击元素")
+    async def double_click(self, selector: Target) -> None:
+        await self._before_action(selector)
+        await self._locate(selector).first.dblclick(timeout=self.timeout)
+
+    @timed()
+    @step("获取页面标题")
+    async def get_title(self) -> str:
+        return await self.page.title()
+
+    @timed()
+    @step("获取当前URL")
+    async def get_url(self) -> str:
+        return self.page.url
+
+    @timed()
+    @step("刷新页面")
+    async def refresh(self) -> None:
+        await self.page.reload()
+
+    @timed()
+    @step("后退")
+    async def go_back(self) -> None:
+        await self.page.go_back()
+
+    @timed()
+    @step("前进")
+    async def go_forward(self) -> None:
+        await self.page.go_forward()
+
+    @timed()
+    @step("截图")
+    async def take_screenshot(self, name: str = "screenshot") -> None:
+        # 与失败截图使用同一条流水线：按配置的格式、质量和范围截图，落盘在后台完成
+        await default_screenshot_pipeline().capture_async(self.page, name)
+
+    @timed("wait")
+    @step("等待时间")
+    async def wait(self, milliseconds: int) -> None:
+        await asyncio.sleep(milliseconds / 1000)
+
+    @timed()
+    @step("执行JavaScript")
+    async def evaluate(self, expression: str, arg: Optional[Any] = None) -> Any:
+        return await self.page.evaluate(expression, arg)
+
+    @timed()
+    @step("断言元素可见")
+    async def assert_visible(self, selector: Target, timeout: Optional[int] = None) -> None:
+        await expect(self._locate(selector)).to_be_visible(timeout=timeout or self.timeout)
+
+    @timed()
+    @step("断言元素包含文本")
+    async def assert_text(self, selector: Target, text: str, timeout: Optional[int] = None) -> None:
+        await expect(self._locate(selector)).to_contain_text(text, timeout=timeout or self.timeout)
+
+    @timed()
+    @step("断言元素属性")
+    async def assert_attribute(self, selector: Target, attribute: str, value: str, timeout: Optional[int] = None) -> None:
+        await expect(self._locate(selector)).to_have_attribute(attribute, value, timeout=timeout or self.timeout)
+
+    @timed("wait")
+    @step("等待元素消失")
+    async def wait_for_hidden(self, selector: Target, timeout: Optional[int] = None) -> None:
+        try:
+            await self._locate(selector).first.wait_for(state="hidden", timeout=timeout or self.timeout)
+        except Exception as e:
+            error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未消失"
+            raise ElementActionException(error_msg) from e
+
+    @timed("wait")
+    @step("等待URL包含指定文本")
+    async def wait_for_url(self, url_text: str, timeout: Optional[int] = None) -> None:
+        try:
+            await self.page.wait_for_url(f"**/*{url_text}*", timeout=timeout or self.timeout)
+        except Exception as e:
+            error_msg = f"URL在 {timeout or self.timeout}ms 内未包含文本: {url_text}"
+            raise ElementActionException(error_msg) from e
+
+    @timed()
+    @step("选择下拉框选项")
+    async def select_option(self, selector: Target, value: str) -> None:
+        try:
+            await self._before_action(selector)
+            await self._locate(selector).first.select_option(value=value, timeout=self.timeout)
+        except Exception as e:
+            error_msg = f"在下拉框 {selector} 中选择选项 {value} 失败"
+            raise self._action_error(selector, e, error_msg) from e
+
+    @timed()
+    @step("获取元素数量")
+    async def get_count(self, selector: Target) -> int:
+        return await self._locate(selector).count()
+
+    @timed("wait")
+    @step("等待元素数量达到预期")
+    async def wait_for_count(self, selector: Target, count: int, timeout: Optional[int] = None) -> None:
+        try:
+            await self._locate(selector).nth(count - 1).wait_for(timeout=timeout or self.timeout)
+        except Exception as e:
+            error_msg = f"元素 {selector} 数量在 {timeout or self.timeout}ms 内未达到 {count}"
+            raise ElementActionException(error_msg) from e
+
+    @timed()
+    @step("获取元素的CSS属性值")
+    async def get_css_property(self, selector: Target, property_name: str) -> str:
+        element = self._locate(selector)
+        return await element.evaluate(f"element => window.getComputedStyle(element).{property_name}")
+
+    @timed()
+    @step("检查元素是否启用")
+    async def is_enabled(self, selector: Target) -> bool:
+        return await self._locate(selector).is_enabled()
+
+    @timed()
+    @step("检查元素是否被选中")
+    async def is_checked(self, selector: Target) -> bool:
+        return await self._locate(selector).is_checked()
+
+    @timed()
+    @step("拖拽元素")
+    async def drag_and_drop(self, source: Target, target: Target) -> None:
+        try:
+            await self._locate(source).first.drag_to(self._locate(target).first)
+        except Exception as e:
+            error_msg = f"拖拽元素从 {source} 到 {target} 失败"
+            raise ElementActionException(error_msg) from e
+
+    @timed()
+    @step("上传文件")
+    async def upload_file(self, selector: Target, file_path: str) -> None:
+        try:
+            await self._locate(selector).first.set_input_files(file_path)
+        except Exception as e:
+            error_msg = f"上传文件到 {selector} 失败"
+            raise ElementActionException(error_msg) from e
+
+    @timed()
+    @step("切换到iframe")
+    async def switch_to_frame(self, frame_selector: Target) -> None:
+        try:
+            frame = self.page.frame_locator(frame_selector)
+            if not frame:
+                raise ElementNotPresentException(f"未找到iframe: {frame_selector}")
+        except Exception as e:
+            error_msg = f"切换到iframe {frame_selector} 失败"
+            raise ElementActionException(error_msg) from e
+
+    @timed("wait")
+    @step("等待网络请求完成")
+    async def wait_for_request(self, url_pattern: str, timeout: Optional[int] = None) -> None:
+        try:
+            await self.page.wait_for_event(
+                "request", lambda request: fnmatch.fnmatch(request.url, url_pattern), timeout=timeout or self.timeout
+            )
+        except Exception as e:
+            error_msg = f"等待请求 {url_pattern} 超时"
+            raise ElementActionException(error_msg) from e
+
+    @timed("wait")
+    @step("等待网络响应完成")
+    async def wait_for_response(self, url_pattern: str, timeout: Optional[int] = None) -> None:
+        try:
+            await self.page.wait_for_event(
+                "response", lambda response: fnmatch.fnmatch(response.url, url_pattern), timeout=timeout or self.timeout
+            )
+        except Exception as e:
+            error_msg = f"等待响应 {url_pattern} 超时"
+            raise ElementActionException(error_msg) from e
+
+    @timed()
+    @step("查找文本: {text}")
+    async def find_text(self, text: str, container: Target = "body", ignore_case: bool = False,
+                        limit: int = 20, context: int = 40) -> List[str]:
+        flags = "i" if ignore_case else ""
+        return await self._locate(container).evaluate_all(
+            _TEXT_SEARCH_JS, ["text", text, flags, limit, context]
+        )
+
+    @timed()
+    @step("检查文本: {text}")
+    async def has_text(self, text: str, container: Target = "body", ignore_case: bool = False) -> bool:
+        return bool(await self.find_text(text, container, ignore_case=ignore_case, limit=1, context=0))
+
+    @timed()
+    @step("正则匹配文本: {pattern}")
+    async def find_matches(self, pattern: Union[str, Pattern], container: Target = "body", flags: str = "",
+                           limit: int = 20) -> List[str]:
+        source, js_flags = _js_regex(pattern, flags)
+        return await self._locate(container).evaluate_all(
+            _TEXT_SEARCH_JS, ["regex", source, js_flags, limit, 0]
+        )
+
+    @timed()
+    @step("检查正则匹配: {pattern}")
+    async def has_match(self, pattern: Union[str, Pattern], container: Target = "body", flags: str = "") -> bool:
+        return bool(await self.find_matches(pattern, container, flags=flags, limit=1))
+
+    @timed()
+    @step("批量获取元素文本")
+    async def get_texts(self, selector: Target) -> List[str]:
+        return [text.strip() for text in await self._locate(selector).all_inner_texts()]
+
+    @timed()
+    @step("批量获取元素属性")
+    async def get_attributes(self, selector: Target, attributes: Union[str, Sequence[str]]) -> List[Any]:
+        names = [attributes] if isinstance(attributes, str) else list(attributes)
+        values = await self._locate(selector).evaluate_all(_ATTRIBUTES_JS, names)
+        if isinstance(attributes, str):
+            return [value[0] for value in values]
+        return [tuple(value) for value in values]
+
+    @timed()
+    @step("批量提取行数据")
+    async def extract_rows(self, selector: Target, fields: Dict[str, Union[str, Tuple[str, Optional[str]]]]) -> List[Dict[str, Optional[str]]]:
+        return await self._locate(selector).evaluate_all(_ROWS_JS, _field_specs(fields))
+
+    @timed()
+    @step("提取表格数据")
+    async def extract_table(self, selector: Target = "table") -> List[Dict[str, str]]:
+        return await self._locate(selector).evaluate_all(_TABLE_JS)
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("输入并提交")
+    async def fill_and_submit(self, selector: Target, text: str, submit: Optional[Target] = None) -> None:
+        try:
+            await self._before_action(selector)
+            locator = self._locate(selector).first
+            await locator.fill(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"在元素 {selector} 中输入失败"
+            raise self._action_error(selector, e, error_msg) from e
+        target = selector if submit is None else submit
+        try:
+            if submit is None:
+                await locator.press("Enter", timeout=self.timeout)
+            else:
+                await self._before_action(submit)
+                await self._locate(submit).first.click(timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            raise self._submit_error(target, e) from e
+
+    def _submit_error(self, target: Target, error: Exception) -> PageException:
+        """转换提交异常：元素不可操作时与其他动作相同，其余失败转换为不重试的 SubmitActionException"""
+        converted = self._action_error(target, error, f"提交 {target} 失败")
+        if isinstance(converted, ElementNotVisibleException):
+            return converted
+        return SubmitActionException(f"提交 {target} 失败，提交可能已部分生效，不自动重试")
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("清空、输入并校验")
+    async def clear_fill_verify(self, selector: Target, text: str) -> None:
+        try:
+            await self._before_action(selector)
+            locator = self._locate(selector).first
+            await locator.fill(text, timeout=self.timeout)
+            await expect(locator).to_have_value(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"在元素 {selector} 中输入并校验文本失败"
+            raise self._action_error(selector, e, error_msg) from e
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("点击并等待元素")
+    async def click_and_wait(self, selector: Target, expected: Target, timeout: Optional[int] = None) -> None:
+        try:
+            await self._before_action(selector)
+            await self._locate(selector).first.click(timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"点击元素 {selector} 失败"
+            raise self._action_error(selector, e, error_msg) from e
+        await self.wait_for_visible(expected, timeout=timeout)
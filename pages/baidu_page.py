@@ -1,42 +1,68 @@
 from .base_page import BasePage
-import allure
+from .elements import Element
+from utils.readiness import DOM_READY, SelectorReadiness
+from utils.step_recorder import step
 
 class BaiduPage(BasePage):
-    def __init__(self, page):
-        super().__init__(page)
-        # 页面元素定位器
-        self._search_input = "#kw"
-        self._search_button = "#su"
-        self._search_results = ".result-op"
-
-    @allure.step("打开百度首页")
+    # 首页只需 DOM 就绪，搜索框随文档一起渲染
+    readiness = DOM_READY
+    # 首页地址，基准测试中指向本地模拟站点
+    url = "https://www.baidu.com"
+
+    # 页面元素
+    _search_input = Element("#kw", description="搜索框")
+    _search_button = Element("#su", description="搜索按钮")
+    _search_results = Element(".result-op", description="搜索结果")
+
+    # 搜索结果记录的字段：{字段名: 结果内的子选择器}
+    _result_fields = {
+        "title": "h3",
+        "url": "h3 a@href",
+        "abstract": ".c-abstract",
+    }
+
+    @step("打开百度首页")
     def navigate(self):
-        self.page.goto("https://www.baidu.com")
+        self.page.goto(self.url)
         self.wait_for_loading()
 
-    @allure.step("输入搜索关键词: {keyword}")
+    @step("输入搜索关键词: {keyword}")
     def input_search_keyword(self, keyword: str):
         self.fill(self._search_input, keyword)
 
-    @allure.step("点击搜索按钮")
+    @step("点击搜索按钮")
     def click_search(self):
         self.click(self._search_button)
-        self.wait_for_loading()
+        self.wait_for_loading(strategy=SelectorReadiness(self._search_results.expression))
+
+    @step("搜索: {keyword}")
+    def search(self, keyword: str):
+        """输入关键词并提交，等待搜索结果出现"""
+        self.fill_and_submit(self._search_input, keyword, submit=self._search_button)
+        self.wait_for_loading(strategy=SelectorReadiness(self._search_results.expression))
 
-    @allure.step("检查搜索结果是否包含: {expected_text}")
+    @step("检查搜索结果是否包含: {expected_text}")
     def verify_search_results(self, expected_text: str) -> bool:
         self.wait_for_visible(self._search_results, timeout=10000)
-        page_content = self.page.content()
-        return expected_text in page_content
+        # 与原先检查整个页面 HTML 的范围保持一致，在整个页面的可见文本中查找（不再匹配标签属性和脚本内容）
+        return self.has_text(expected_text, container="body")
 
-    @allure.step("获取搜索结果列表")
+    @step("获取搜索结果列表")
     def get_search_results(self) -> list:
         return self.get_elements(self._search_results)
 
-    @allure.step("获取搜索框的值")
+    @step("获取搜索结果记录")
+    def get_search_result_records(self) -> list:
+        """
+        一次往返提取所有搜索结果
+        :return: [{"title": 标题, "url": 链接, "abstract": 摘要}, ...]
+        """
+        return self.extract_rows(self._search_results, self._result_fields)
+
+    @step("获取搜索框的值")
     def get_search_input_value(self) -> str:
         return self.get_attribute(self._search_input, "value")
 
-    @allure.step("清空搜索框")
+    @step("清空搜索框")
     def clear_search_input(self):
         self.clear_input(self._search_input) 
\ No newline at end of file
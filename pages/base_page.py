@@ -1,9 +1,15 @@
-from playwright.sync_api import Page, expect
-import allure
+from playwright.sync_api import Page, Locator, expect, TimeoutError as PlaywrightTimeoutError
 import time
-from typing import Optional, Any, List, Callable
+import re
+from typing import Optional, Any, List, Callable, Union, Pattern, Tuple, Dict, Sequence
 import logging
-from functools import wraps
+from utils.retry import retry
+from utils.step_recorder import step
+from utils.metrics import timed
+from utils.impact import impact_recorder
+from utils.report import default_screenshot_pipeline
+from utils.readiness import ReadinessStrategy, FULL_LOAD, resolve_readiness
+from .elements import Element, LocatorCache, Target
 
 class PageException(Exception):
     """基础页面异常类"""
@@ -21,178 +27,346 @@ class ElementActionException(PageException):
     """元素操作异常"""
     pass
 
-def retry(retries: int = 3, delay: float = 1.0):
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            last_exception = None
-            for attempt in range(retries):
-                try:
-                    return func(self, *args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    print(f"WARNING: {func.__name__} 第 {attempt + 1} 次尝试失败: {str(e)}")
-                    if attempt < retries - 1:
-                        time.sleep(delay)
-                    continue
-            print(f"ERROR: {func.__name__} 在 {retries} 次尝试后仍然失败")
-            raise last_exception
-        return wrapper
-    return decorator
+class SubmitActionException(ElementActionException):
+    """提交操作异常：提交可能已部分生效（如请求已发出），重新输入并提交不安全，不自动重试"""
+    pass
+
+# 操作前等待模式：explicit 先单独等待元素可见再执行动作；
+# actionability 依赖动作自带的可操作性检查（可见、稳定、可接收事件），每个动作少一次驱动往返
+EXPLICIT = "explicit"
+ACTIONABILITY = "actionability"
+ACTION_MODES = (EXPLICIT, ACTIONABILITY)
+
+# 完整等待后仍失败的元素异常不再重试，避免一个缺失的元素消耗数倍超时
+_NOT_RETRYABLE = (ElementNotVisibleException, ElementNotPresentException, SubmitActionException)
+
+# 在浏览器中匹配容器的可见文本（innerText，不含脚本和属性），只把匹配片段传回 Python
+# mode: text(子串) / regex(正则)；limit 为 1 时找到第一处即返回
+_TEXT_SEARCH_JS = """
+(elements, [mode, needle, flags, limit, context]) => {
+    const found = [];
+    const re = mode === "regex" ? new RegExp(needle, flags.includes("g") ? flags : flags + "g") : null;
+    const ignoreCase = flags.includes("i");
+    const target = ignoreCase ? needle.toLowerCase() : needle;
+    for (const element of elements) {
+        const text = element.innerText ?? element.textContent ?? "";
+        if (re) {
+            for (const match of text.matchAll(re)) {
+                found.push(match[0]);
+                if (found.length >= limit) return found;
+            }
+            continue;
+        }
+        const haystack = ignoreCase ? text.toLowerCase() : text;
+        let index = haystack.indexOf(target);
+        while (index !== -1) {
+            found.push(text.slice(Math.max(0, index - context), index + target.length + context));
+            if (found.length >= limit) return found;
+            index = haystack.indexOf(target, index + Math.max(1, target.length));
+        }
+    }
+    return found;
+}
+"""
+
+# 批量读取元素属性，attributes 为属性名列表
+_ATTRIBUTES_JS = """
+(elements, attributes) => elements.map(element => attributes.map(name => element.getAttribute(name)))
+"""
+
+# 按字段映射提取每一行，字段为 [名称, 子选择器, 属性]；子选择器为空表示行元素本身，属性为空表示取文本
+_ROWS_JS = """
+(rows, fields) => rows.map(row => {
+    const record = {};
+    for (const [name, selector, attribute] of fields) {
+        const element = selector ? row.querySelector(selector) : row;
+        if (!element) {
+            record[name] = null;
+        } else if (attribute) {
+            record[name] = element.getAttribute(attribute);
+        } else {
+            record[name] = (element.innerText ?? element.textContent ?? "").trim();
+        }
+    }
+    return record;
+})
+"""
+
+# 提取表格：表头取 thead 的最后一行，没有 thead 时取第一行
+_TABLE_JS = """
+(tables) => {
+    const table = tables[0];
+    if (!table) return [];
+    const text = cell => (cell.innerText ?? cell.textContent ?? "").trim();
+    let rows = Array.from(table.tBodies).flatMap(body => Array.from(body.rows));
+    let header = table.tHead && table.tHead.rows.length ? table.tHead.rows[table.tHead.rows.length - 1] : null;
+    if (!header) {
+        header = rows[0];
+        rows = rows.slice(1);
+    }
+    const names = header ? Array.from(header.cells).map(text) : [];
+    return rows.map(row => Object.fromEntries(
+        Array.from(row.cells).map((cell, index) => [names[index] || String(index), text(cell)])
+    ));
+}
+"""
+
+def _field_specs(fields: Dict[str, Union[str, Tuple[str, Optional[str]]]]) -> List[List[Optional[str]]]:
+    """
+    规范化字段映射：值可以是子选择器、"子选择器@属性" 或 (子选择器, 属性)
+    :return: [[名称, 子选择器, 属性], ...]
+    """
+    specs = []
+    for name, spec in fields.items():
+        if isinstance(spec, tuple):
+            selector, attribute = spec
+        else:
+            # 只把最后一个 ] 之后的 @ 视为属性分隔符，属性选择器中的 @ 保持不变
+            at = spec.rfind("@")
+            if at > spec.rfind("]"):
+                selector, attribute = spec[:at], spec[at + 1:]
+            else:
+                selector, attribute = spec, None
+        specs.append([name, selector.strip(), attribute])
+    return specs
+
+_JS_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+def _js_regex(pattern: Union[str, Pattern], flags: str = "") -> Tuple[str, str]:
+    """
+    将正则转换为 JavaScript RegExp 的源码和标志，re.Pattern 的 I/M/S 标志会一并转换
+    :return: (源码, 标志)
+    """
+    if isinstance(pattern, str):
+        return pattern, flags
+    js_flags = flags + "".join(flag for py_flag, flag in _JS_FLAGS if pattern.flags & py_flag and flag not in flags)
+    return pattern.pattern, js_flags
 
 class BasePage:
+    # 页面就绪策略，子类可覆盖；默认依次等待 load/domcontentloaded/networkidle
+    readiness: ReadinessStrategy = FULL_LOAD
+    # 操作前等待模式，由 conftest 按 TestConfig.action_mode 设置
+    action_mode: str = EXPLICIT
+
     def __init__(self, page: Page):
         self.page = page
         self.timeout = 10000  # 默认超时时间10秒
-
-    @allure.step("等待元素可见")
-    def wait_for_visible(self, selector: str, timeout: Optional[int] = None) -> None:
+        self.readiness.prepare(page)
+        # 元素描述符的定位器缓存，导航后清空
+        self.locators = LocatorCache(page)
+
+    def _locate(self, target: Target) -> Locator:
+        """
+        获取目标的定位器：元素描述符使用缓存的定位器，字符串选择器直接创建
+        :param target: 选择器或元素描述符
+        """
+        impact_recorder.use_selector(target)
+        if isinstance(target, Element):
+            return self.locators.get(target)
+        return self.page.locator(target)
+
+    def _before_action(self, target: Target) -> None:
+        """自带可操作性检查的动作执行前调用，actionability 模式下不再单独等待"""
+        if self.action_mode != ACTIONABILITY:
+            self._ensure_ready(target)
+
+    def _action_error(self, target: Target, error: Exception, message: str) -> PageException:
+        """
+        转换动作异常：actionability 模式下动作超时说明元素始终不可操作，与显式等待失败一样不再重试
+        :param target: 选择器或元素描述符
+        :param error: 原始异常
+        :param message: 操作失败的描述
+        """
+        if self.action_mode == ACTIONABILITY and isinstance(error, PlaywrightTimeoutError):
+            return ElementNotVisibleException(f"元素 {target} 在 {self.timeout}ms 内不可操作")
+        return ElementActionException(message)
+
+    def _ensure_ready(self, target: Target) -> None:
+        """操作前按元素声明的状态等待，字符串选择器等待可见"""
+        state = target.state if isinstance(target, Element) else "visible"
+        if state == "visible":
+            self.wait_for_visible(target)
+        elif state == "attached":
+            self.wait_for_present(target)
+
+    @timed("wait")
+    @step("等待元素可见")
+    def wait_for_visible(self, selector: Target, timeout: Optional[int] = None) -> None:
         try:
-            self.page.wait_for_selector(selector, state="visible", timeout=timeout or self.timeout)
+            self._locate(selector).first.wait_for(state="visible", timeout=timeout or self.timeout)
         except Exception as e:
             error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未变为可见"
             raise ElementNotVisibleException(error_msg) from e
 
-    @allure.step("等待元素存在")
-    def wait_for_present(self, selector: str, timeout: Optional[int] = None) -> None:
+    @timed("wait")
+    @step("等待元素存在")
+    def wait_for_present(self, selector: Target, timeout: Optional[int] = None) -> None:
         try:
-            self.page.wait_for_selector(selector, state="attached", timeout=timeout or self.timeout)
+            self._locate(selector).first.wait_for(state="attached", timeout=timeout or self.timeout)
         except Exception as e:
             error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未出现在DOM中"
             raise ElementNotPresentException(error_msg) from e
 
-    @retry(retries=3)
-    @allure.step("点击元素")
-    def click(self, selector: str, force: bool = False) -> None:
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("点击元素")
+    def click(self, selector: Target, force: bool = False) -> None:
         try:
-            self.wait_for_visible(selector)
-            self.page.click(selector, force=force)
+            self._before_action(selector)
+            self._locate(selector).first.click(force=force, timeout=self.timeout)
         except ElementNotVisibleException:
             raise
         except Exception as e:
             error_msg = f"点击元素 {selector} 失败"
-            raise ElementActionException(error_msg) from e
+            raise self._action_error(selector, e, error_msg) from e
 
-    @retry(retries=3)
-    @allure.step("输入文本")
-    def fill(self, selector: str, text: str) -> None:
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("输入文本")
+    def fill(self, selector: Target, text: str) -> None:
         try:
-            self.wait_for_visible(selector)
-            self.page.fill(selector, text)
+            self._before_action(selector)
+            self._locate(selector).first.fill(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
         except Exception as e:
             error_msg = f"在元素 {selector} 中输入文本失败"
-            raise ElementActionException(error_msg) from e
+            raise self._action_error(selector, e, error_msg) from e
 
-    @allure.step("获取元素文本")
-    def get_text(self, selector: str) -> str:
-        self.wait_for_visible(selector)
-        return self.page.text_content(selector)
+    @timed()
+    @step("获取元素文本")
+    def get_text(self, selector: Target) -> str:
+        self._ensure_ready(selector)
+        return self._locate(selector).first.text_content()
 
-    @allure.step("获取元素的属性值")
-    def get_attribute(self, selector: str, attribute: str) -> Optional[str]:
+    @timed()
+    @step("获取元素的属性值")
+    def get_attribute(self, selector: Target, attribute: str) -> Optional[str]:
         self.wait_for_present(selector)
-        element = self.page.locator(selector)
+        element = self._locate(selector)
         return element.get_attribute(attribute)
 
-    @allure.step("检查元素是否可见")
-    def is_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
+    @timed("wait")
+    @step("检查元素是否可见")
+    def is_visible(self, selector: Target, timeout: Optional[int] = None) -> bool:
         try:
             self.wait_for_visible(selector, timeout=timeout or 1000)
             return True
         except:
             return False
 
-    @allure.step("获取元素列表")
-    def get_elements(self, selector: str) -> List[Any]:
-        return self.page.locator(selector).all()
-
-    @allure.step("等待加载状态")
-    def wait_for_loading(self, timeout: Optional[int] = None) -> None:
-        self.page.wait_for_load_state("load", timeout=timeout or self.timeout)
-        self.page.wait_for_load_state("domcontentloaded", timeout=timeout or self.timeout)
-        self.page.wait_for_load_state("networkidle", timeout=timeout or self.timeout)
-
-    @allure.step("滚动到元素")
-    def scroll_into_view(self, selector: str) -> None:
-        self.page.locator(selector).scroll_into_view_if_needed()
-
-    @allure.step("悬停在元素上")
-    def hover(self, selector: str) -> None:
-        self.wait_for_visible(selector)
-        self.page.hover(selector)
-
-    @allure.step("按键输入")
-    def press_key(self, selector: str, key: str) -> None:
-        self.wait_for_visible(selector)
-        self.page.press(selector, key)
-
-    @allure.step("清除输入框")
-    def clear_input(self, selector: str) -> None:
-        self.wait_for_visible(selector)
-        self.page.fill(selector, "")
-
-    @allure.step("双击元素")
-    def double_click(self, selector: str) -> None:
-        self.wait_for_visible(selector)
-        self.page.dblclick(selector)
-
-    @allure.step("获取页面标题")
+    @timed()
+    @step("获取元素列表")
+    def get_elements(self, selector: Target) -> List[Any]:
+        return self._locate(selector).all()
+
+    @timed("wait")
+    @step("等待加载状态")
+    def wait_for_loading(self, timeout: Optional[int] = None, strategy: Optional[Any] = None) -> None:
+        """
+        按就绪策略等待页面加载
+        :param timeout: 超时时间（毫秒）
+        :param strategy: 本次调用使用的策略（策略对象、名称或判断函数），默认使用页面对象的 readiness
+        """
+        readiness = resolve_readiness(strategy) if strategy is not None else self.readiness
+        readiness.wait_ready(self.page, timeout or self.timeout)
+
+    @timed()
+    @step("滚动到元素")
+    def scroll_into_view(self, selector: Target) -> None:
+        self._locate(selector).scroll_into_view_if_needed()
+
+    @timed()
+    @step("悬停在元素上")
+    def hover(self, selector: Target) -> None:
+        self._before_action(selector)
+        self._locate(selector).first.hover(timeout=self.timeout)
+
+    @timed()
+    @step("按键输入")
+    def press_key(self, selector: Target, key: str) -> None:
+        self._before_action(selector)
+        self._locate(selector).first.press(key, timeout=self.timeout)
+
+    @timed()
+    @step("清除输入框")
+    def clear_input(self, selector: Target) -> None:
+        self._before_action(selector)
+        self._locate(selector).first.fill("", timeout=self.timeout)
+
+    @timed()
+    @step("双击元素")
+    def double_click(self, selector: Target) -> None:
+        self._before_action(selector)
+        self._locate(selector).first.dblclick(timeout=self.timeout)
+
+    @timed()
+    @step("获取页面标题")
     def get_title(self) -> str:
         return self.page.title()
 
-    @allure.step("获取当前URL")
+    @timed()
+    @step("获取当前URL")
     def get_url(self) -> str:
         return self.page.url
 
-    @allure.step("刷新页面")
+    @timed()
+    @step("刷新页面")
     def refresh(self) -> None:
         self.page.reload()
 
-    @allure.step("后退")
+    @timed()
+    @step("后退")
     def go_back(self) -> None:
         self.page.go_back()
 
-    @allure.step("前进")
+    @timed()
+    @step("前进")
     def go_forward(self) -> None:
         self.page.go_forward()
 
-    @allure.step("截图")
+    @timed()
+    @step("截图")
     def take_screenshot(self, name: str = "screenshot") -> None:
-        allure.attach(
-            self.page.screenshot(),
-            name=name,
-            attachment_type=allure.attachment_type.PNG
-        )
+        # 与失败截图使用同一条流水线：按配置的格式、质量和范围截图，落盘在后台完成
+        default_screenshot_pipeline().capture(self.page, name)
 
-    @allure.step("等待时间")
+    @timed("wait")
+    @step("等待时间")
     def wait(self, milliseconds: int) -> None:
         time.sleep(milliseconds / 1000)
 
-    @allure.step("执行JavaScript")
+    @timed()
+    @step("执行JavaScript")
     def evaluate(self, expression: str, arg: Optional[Any] = None) -> Any:
         return self.page.evaluate(expression, arg)
 
-    @allure.step("断言元素可见")
-    def assert_visible(self, selector: str, timeout: Optional[int] = None) -> None:
-        expect(self.page.locator(selector)).to_be_visible(timeout=timeout or self.timeout)
+    @timed()
+    @step("断言元素可见")
+    def assert_visible(self, selector: Target, timeout: Optional[int] = None) -> None:
+        expect(self._locate(selector)).to_be_visible(timeout=timeout or self.timeout)
 
-    @allure.step("断言元素包含文本")
-    def assert_text(self, selector: str, text: str, timeout: Optional[int] = None) -> None:
-        expect(self.page.locator(selector)).to_contain_text(text, timeout=timeout or self.timeout)
+    @timed()
+    @step("断言元素包含文本")
+    def assert_text(self, selector: Target, text: str, timeout: Optional[int] = None) -> None:
+        expect(self._locate(selector)).to_contain_text(text, timeout=timeout or self.timeout)
 
-    @allure.step("断言元素属性")
-    def assert_attribute(self, selector: str, attribute: str, value: str, timeout: Optional[int] = None) -> None:
-        expect(self.page.locator(selector)).to_have_attribute(attribute, value, timeout=timeout or self.timeout)
+    @timed()
+    @step("断言元素属性")
+    def assert_attribute(self, selector: Target, attribute: str, value: str, timeout: Optional[int] = None) -> None:
+        expect(self._locate(selector)).to_have_attribute(attribute, value, timeout=timeout or self.timeout)
 
-    @allure.step("等待元素消失")
-    def wait_for_hidden(self, selector: str, timeout: Optional[int] = None) -> None:
+    @timed("wait")
+    @step("等待元素消失")
+    def wait_for_hidden(self, selector: Target, timeout: Optional[int] = None) -> None:
         try:
-            self.page.wait_for_selector(selector, state="hidden", timeout=timeout or self.timeout)
+            self._locate(selector).first.wait_for(state="hidden", timeout=timeout or self.timeout)
         except Exception as e:
             error_msg = f"元素 {selector} 在 {timeout or self.timeout}ms 内未消失"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("等待URL包含指定文本")
+    @timed("wait")
+    @step("等待URL包含指定文本")
     def wait_for_url(self, url_text: str, timeout: Optional[int] = None) -> None:
         try:
             self.page.wait_for_url(f"**/*{url_text}*", timeout=timeout or self.timeout)
@@ -200,58 +374,67 @@ class BasePage:
             error_msg = f"URL在 {timeout or self.timeout}ms 内未包含文本: {url_text}"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("选择下拉框选项")
-    def select_option(self, selector: str, value: str) -> None:
+    @timed()
+    @step("选择下拉框选项")
+    def select_option(self, selector: Target, value: str) -> None:
         try:
-            self.wait_for_visible(selector)
-            self.page.select_option(selector, value=value)
+            self._before_action(selector)
+            self._locate(selector).first.select_option(value=value, timeout=self.timeout)
         except Exception as e:
             error_msg = f"在下拉框 {selector} 中选择选项 {value} 失败"
-            raise ElementActionException(error_msg) from e
+            raise self._action_error(selector, e, error_msg) from e
 
-    @allure.step("获取元素数量")
-    def get_count(self, selector: str) -> int:
-        return len(self.page.locator(selector).all())
+    @timed()
+    @step("获取元素数量")
+    def get_count(self, selector: Target) -> int:
+        return self._locate(selector).count()
 
-    @allure.step("等待元素数量达到预期")
-    def wait_for_count(self, selector: str, count: int, timeout: Optional[int] = None) -> None:
+    @timed("wait")
+    @step("等待元素数量达到预期")
+    def wait_for_count(self, selector: Target, count: int, timeout: Optional[int] = None) -> None:
         try:
-            self.page.locator(selector).nth(count - 1).wait_for(timeout=timeout or self.timeout)
+            self._locate(selector).nth(count - 1).wait_for(timeout=timeout or self.timeout)
         except Exception as e:
             error_msg = f"元素 {selector} 数量在 {timeout or self.timeout}ms 内未达到 {count}"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("获取元素的CSS属性值")
-    def get_css_property(self, selector: str, property_name: str) -> str:
-        element = self.page.locator(selector)
+    @timed()
+    @step("获取元素的CSS属性值")
+    def get_css_property(self, selector: Target, property_name: str) -> str:
+        element = self._locate(selector)
         return element.evaluate(f"element => window.getComputedStyle(element).{property_name}")
 
-    @allure.step("检查元素是否启用")
-    def is_enabled(self, selector: str) -> bool:
-        return self.page.locator(selector).is_enabled()
+    @timed()
+    @step("检查元素是否启用")
+    def is_enabled(self, selector: Target) -> bool:
+        return self._locate(selector).is_enabled()
 
-    @allure.step("检查元素是否被选中")
-    def is_checked(self, selector: str) -> bool:
-        return self.page.locator(selector).is_checked()
+    @timed()
+    @step("检查元素是否被选中")
+    def is_checked(self, selector: Target) -> bool:
+        return self._locate(selector).is_checked()
 
-    @allure.step("拖拽元素")
-    def drag_and_drop(self, source: str, target: str) -> None:
+    @timed()
+    @step("拖拽元素")
+    def drag_and_drop(self, source: Target, target: Target) -> None:
         try:
-            self.page.drag_and_drop(source, target)
+            self._locate(source).first.drag_to(self._locate(target).first)
         except Exception as e:
             error_msg = f"拖拽元素从 {source} 到 {target} 失败"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("上传文件")
-    def upload_file(self, selector: str, file_path: str) -> None:
+    @timed()
+    @step("上传文件")
+    def upload_file(self, selector: Target, file_path: str) -> None:
         try:
-            self.page.set_input_files(selector, file_path)
+            self._locate(selector).first.set_input_files(file_path)
         except Exception as e:
             error_msg = f"上传文件到 {selector} 失败"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("切换到iframe")
-    def switch_to_frame(self, frame_selector: str) -> None:
+    @timed()
+    @step("切换到iframe")
+    def switch_to_frame(self, frame_selector: Target) -> None:
         try:
             frame = self.page.frame_locator(frame_selector)
             if not frame:
@@ -260,7 +443,8 @@ class BasePage:
             error_msg = f"切换到iframe {frame_selector} 失败"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("等待网络请求完成")
+    @timed("wait")
+    @step("等待网络请求完成")
     def wait_for_request(self, url_pattern: str, timeout: Optional[int] = None) -> None:
         try:
             self.page.wait_for_request(url_pattern, timeout=timeout or self.timeout)
@@ -268,10 +452,193 @@ class BasePage:
             error_msg = f"等待请求 {url_pattern} 超时"
             raise ElementActionException(error_msg) from e
 
-    @allure.step("等待网络响应完成")
+    @timed("wait")
+    @step("等待网络响应完成")
     def wait_for_response(self, url_pattern: str, timeout: Optional[int] = None) -> None:
         try:
             self.page.wait_for_response(url_pattern, timeout=timeout or self.timeout)
         except Exception as e:
             error_msg = f"等待响应 {url_pattern} 超时"
-            raise ElementActionException(error_msg) from e 
\ No newline at end of file
+            raise ElementActionException(error_msg) from e 
+
+    @timed()
+    @step("查找文本: {text}")
+    def find_text(self, text: str, container: Target = "body", ignore_case: bool = False,
+                  limit: int = 20, context: int = 40) -> List[str]:
+        """
+        在浏览器中查找容器可见文本中的子串
+        :param text: 要查找的文本
+        :param container: 容器选择器，匹配多个元素时依次查找
+        :param ignore_case: 是否忽略大小写
+        :param limit: 最多返回的片段数
+        :param context: 片段中匹配文本前后保留的字符数
+        :return: 包含匹配文本的片段
+        """
+        flags = "i" if ignore_case else ""
+        return self._locate(container).evaluate_all(
+            _TEXT_SEARCH_JS, ["text", text, flags, limit, context]
+        )
+
+    @timed()
+    @step("检查文本: {text}")
+    def has_text(self, text: str, container: Target = "body", ignore_case: bool = False) -> bool:
+        """
+        容器的可见文本中是否包含指定文本，找到第一处即返回
+        :param text: 要查找的文本
+        :param container: 容器选择器
+        :param ignore_case: 是否忽略大小写
+        """
+        return bool(self.find_text(text, container, ignore_case=ignore_case, limit=1, context=0))
+
+    @timed()
+    @step("正则匹配文本: {pattern}")
+    def find_matches(self, pattern: Union[str, Pattern], container: Target = "body", flags: str = "",
+                     limit: int = 20) -> List[str]:
+        """
+        在浏览器中用正则匹配容器的可见文本
+        :param pattern: JavaScript 正则源码或 re.Pattern（转换 I/M/S 标志）
+        :param container: 容器选择器
+        :param flags: JavaScript 正则标志，如 "i"
+        :param limit: 最多返回的匹配数
+        :return: 匹配到的文本
+        """
+        source, js_flags = _js_regex(pattern, flags)
+        return self._locate(container).evaluate_all(
+            _TEXT_SEARCH_JS, ["regex", source, js_flags, limit, 0]
+        )
+
+    @timed()
+    @step("检查正则匹配: {pattern}")
+    def has_match(self, pattern: Union[str, Pattern], container: Target = "body", flags: str = "") -> bool:
+        """
+        容器的可见文本中是否存在正则匹配，找到第一处即返回
+        :param pattern: JavaScript 正则源码或 re.Pattern
+        :param container: 容器选择器
+        :param flags: JavaScript 正则标志
+        """
+        return bool(self.find_matches(pattern, container, flags=flags, limit=1))
+
+    @timed()
+    @step("批量获取元素文本")
+    def get_texts(self, selector: Target) -> List[str]:
+        """
+        一次往返读取所有匹配元素的可见文本
+        :param selector: 元素选择器
+        :return: 去除首尾空白的文本列表
+        """
+        return [text.strip() for text in self._locate(selector).all_inner_texts()]
+
+    @timed()
+    @step("批量获取元素属性")
+    def get_attributes(self, selector: Target, attributes: Union[str, Sequence[str]]) -> List[Any]:
+        """
+        一次往返读取所有匹配元素的属性
+        :param selector: 元素选择器
+        :param attributes: 属性名；传入多个属性名时每个元素返回一个元组
+        :return: 属性值列表，缺失的属性为 None
+        """
+        names = [attributes] if isinstance(attributes, str) else list(attributes)
+        values = self._locate(selector).evaluate_all(_ATTRIBUTES_JS, names)
+        if isinstance(attributes, str):
+            return [value[0] for value in values]
+        return [tuple(value) for value in values]
+
+    @timed()
+    @step("批量提取行数据")
+    def extract_rows(self, selector: Target, fields: Dict[str, Union[str, Tuple[str, Optional[str]]]]) -> List[Dict[str, Optional[str]]]:
+        """
+        一次往返把匹配的每个元素按字段映射提取为字典
+        :param selector: 行元素选择器
+        :param fields: {字段名: 子选择器}，子选择器为 CSS，可写作 "a@href" 读取属性，"" 表示行元素本身
+        :return: 记录列表，子元素不存在的字段为 None
+        """
+        return self._locate(selector).evaluate_all(_ROWS_JS, _field_specs(fields))
+
+    @timed()
+    @step("提取表格数据")
+    def extract_table(self, selector: Target = "table") -> List[Dict[str, str]]:
+        """
+        一次往返把表格提取为以表头为键的记录列表
+        :param selector: 表格选择器，匹配多个时使用第一个
+        :return: 记录列表，没有表头的列以列序号为键
+        """
+        return self._locate(selector).evaluate_all(_TABLE_JS)
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("输入并提交")
+    def fill_and_submit(self, selector: Target, text: str, submit: Optional[Target] = None) -> None:
+        """
+        输入文本后提交，合并为一个步骤；输入失败时按重试策略重试，
+        提交（回车或点击）失败时抛出 SubmitActionException 不再重试，避免重复提交
+        :param selector: 输入框
+        :param text: 输入的文本
+        :param submit: 提交按钮，为空时在输入框中按回车
+        """
+        try:
+            self._before_action(selector)
+            locator = self._locate(selector).first
+            locator.fill(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"在元素 {selector} 中输入失败"
+            raise self._action_error(selector, e, error_msg) from e
+        target = selector if submit is None else submit
+        try:
+            if submit is None:
+                locator.press("Enter", timeout=self.timeout)
+            else:
+                self._before_action(submit)
+                self._locate(submit).first.click(timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            raise self._submit_error(target, e) from e
+
+    def _submit_error(self, target: Target, error: Exception) -> PageException:
+        """转换提交异常：元素不可操作时与其他动作相同，其余失败转换为不重试的 SubmitActionException"""
+        converted = self._action_error(target, error, f"提交 {target} 失败")
+        if isinstance(converted, ElementNotVisibleException):
+            return converted
+        return SubmitActionException(f"提交 {target} 失败，提交可能已部分生效，不自动重试")
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("清空、输入并校验")
+    def clear_fill_verify(self, selector: Target, text: str) -> None:
+        """
+        清空输入框、输入文本并在浏览器内校验输入框的值，合并为一个步骤（fill 本身会先清空）
+        :param selector: 输入框
+        :param text: 输入的文本
+        """
+        try:
+            self._before_action(selector)
+            locator = self._locate(selector).first
+            locator.fill(text, timeout=self.timeout)
+            expect(locator).to_have_value(text, timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"在元素 {selector} 中输入并校验文本失败"
+            raise self._action_error(selector, e, error_msg) from e
+
+    @timed()
+    @retry(give_up_on=_NOT_RETRYABLE)
+    @step("点击并等待元素")
+    def click_and_wait(self, selector: Target, expected: Target, timeout: Optional[int] = None) -> None:
+        """
+        点击元素后等待另一个元素可见，合并为一个步骤
+        :param selector: 点击的元素
+        :param expected: 点击后应出现的元素
+        :param timeout: 等待 expected 的超时时间（毫秒）
+        """
+        try:
+            self._before_action(selector)
+            self._locate(selector).first.click(timeout=self.timeout)
+        except ElementNotVisibleException:
+            raise
+        except Exception as e:
+            error_msg = f"点击元素 {selector} 失败"
+            raise self._action_error(selector, e, error_msg) from e
+        self.wait_for_visible(expected, timeout=timeout)
@@ -0,0 +1,248 @@
+"""
+页面元素描述符和元素注册表
+
+列出所有页面对象声明的选择器:
+    python -m pages.elements [--module pages.baidu_page]
+"""
+import os
+import sys
+import json
+import glob
+import weakref
+import argparse
+import importlib
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+# 元素定位方式：css/xpath/text 直接转换为 Playwright 选择器，test_id/role/label/placeholder 使用 get_by_* 方法
+_SELECTOR_PREFIXES = {"css": "", "xpath": "xpath=", "text": "text="}
+_GET_BY = {"test_id": "get_by_test_id", "role": "get_by_role", "label": "get_by_label", "placeholder": "get_by_placeholder"}
+
+# 元素就绪状态：操作前等待的状态，None 表示不预先等待
+_STATES = ("visible", "attached", None)
+
+
+def _get_by_selector(by: str, selector: str, options: Dict[str, Any]) -> str:
+    """
+    get_by_* 方法生成的 Playwright 选择器（internal:testid=、internal:role= 等），可直接用于 page.locator
+    使用 Playwright 内部接口，在需要时才导入，css/xpath/text 元素不受其变化影响；支持的版本范围见 requirements.txt
+    """
+    from playwright._impl._locator import (
+        get_by_label_selector,
+        get_by_placeholder_selector,
+        get_by_role_selector,
+        get_by_test_id_selector,
+        test_id_attribute_name,
+    )
+
+    if by == "test_id":
+        return get_by_test_id_selector(test_id_attribute_name(), selector)
+    if by == "label":
+        return get_by_label_selector(selector, exact=options.get("exact"))
+    if by == "placeholder":
+        return get_by_placeholder_selector(selector, exact=options.get("exact"))
+    role_options = dict(options)
+    if "include_hidden" in role_options:
+        role_options["includeHidden"] = role_options.pop("include_hidden")
+    return get_by_role_selector(selector, **role_options)
+
+
+class Element:
+    """
+    页面元素描述符，在页面对象类中声明，定位器按页面对象实例延迟创建并缓存
+
+    :param selector: 选择器，含义由 by 决定
+    :param by: 定位方式：css(默认)、xpath、text、test_id、role、label、placeholder
+    :param frame: 所在 iframe 的选择器
+    :param parent: 父元素（组件根节点），在其范围内定位；优先于 frame
+    :param nth: 匹配多个元素时使用的序号
+    :param state: 操作前等待的状态：visible(默认)、attached 或 None
+    :param description: 元素说明
+    :param options: 传给 get_by_* 的额外参数，如 role 的 name
+    """
+
+    def __init__(self, selector: str, by: str = "css", frame: Optional[str] = None,
+                 parent: Optional["Element"] = None, nth: Optional[int] = None,
+                 state: Optional[str] = "visible", description: str = "", **options):
+        if by not in _SELECTOR_PREFIXES and by not in _GET_BY:
+            raise ValueError(f"未知的定位方式: {by}，可选值: {', '.join([*_SELECTOR_PREFIXES, *_GET_BY])}")
+        if state not in _STATES:
+            raise ValueError(f"未知的元素状态: {state}，可选值: visible, attached, None")
+        self.selector = selector
+        self.by = by
+        self.frame = frame
+        self.parent = parent
+        self.nth = nth
+        self.state = state
+        self.description = description
+        self.options = options
+        self.name = ""
+        self.owner = ""
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        self.owner = f"{owner.__module__}.{owner.__qualname__}"
+        element_registry.register(owner, name, self)
+
+    @property
+    def expression(self) -> str:
+        """完整的 Playwright 选择器，可传给接受字符串选择器的接口，也用于日志、统计和工具输出"""
+        if self.by in _SELECTOR_PREFIXES:
+            expression = _SELECTOR_PREFIXES[self.by] + self.selector
+        else:
+            expression = _get_by_selector(self.by, self.selector, self.options)
+        if self.nth is not None:
+            expression += f" >> nth={self.nth}"
+        if self.parent is not None:
+            return f"{self.parent.expression} >> {expression}"
+        if self.frame:
+            return f"{self.frame} >> internal:control=enter-frame >> {expression}"
+        return expression
+
+    def build(self, root: Any) -> Any:
+        """
+        在 root（页面、FrameLocator 或父元素的 Locator）上创建定位器
+        :param root: 定位起点
+        :return: playwright Locator
+        """
+        if self.by in _SELECTOR_PREFIXES:
+            locator = root.locator(_SELECTOR_PREFIXES[self.by] + self.selector)
+        else:
+            locator = getattr(root, _GET_BY[self.by])(self.selector, **self.options)
+        if self.nth is not None:
+            locator = locator.nth(self.nth)
+        return locator
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "expression": self.expression,
+            "by": self.by,
+            "selector": self.selector,
+            "state": self.state,
+            "description": self.description,
+        }
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def __repr__(self) -> str:
+        return f"<Element {self.owner}.{self.name} {self.expression}>"
+
+
+Target = Union[str, Element]
+
+
+class LocatorCache:
+    """
+    单个页面对象的定位器缓存，主框架导航后清空
+    :param page: playwright页面对象（同步或异步）
+    """
+
+    def __init__(self, page: Any):
+        self.page = page
+        self._locators: Dict[int, Any] = {}
+        self._listening = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, element: Element) -> Any:
+        """
+        获取元素的定位器，未缓存时创建
+        :param element: 元素描述符
+        :return: playwright Locator
+        """
+        locator = self._locators.get(id(element))
+        if locator is not None:
+            self.hits += 1
+            return locator
+        self.misses += 1
+        if element.parent is not None:
+            root = self.get(element.parent)
+        elif element.frame:
+            root = self.page.frame_locator(element.frame)
+        else:
+            root = self.page
+        locator = element.build(root)
+        self._locators[id(element)] = locator
+        if not self._listening:
+            self.page.on("framenavigated", self._on_navigated)
+            self._listening = True
+        return locator
+
+    def _on_navigated(self, frame) -> None:
+        if frame == self.page.main_frame:
+            self._locators.clear()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._locators.clear()
+
+
+class ElementRegistry:
+    """记录每个页面对象类声明的元素，供工具列出选择器和做选择器开销分析"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes: "weakref.WeakValueDictionary[str, type]" = weakref.WeakValueDictionary()
+        self._elements: Dict[str, Dict[str, Element]] = {}
+
+    def register(self, owner: type, name: str, element: Element) -> None:
+        key = f"{owner.__module__}.{owner.__qualname__}"
+        with self._lock:
+            self._classes[key] = owner
+            self._elements.setdefault(key, {})[name] = element
+
+    def elements(self, page_class: type) -> Dict[str, Element]:
+        """
+        获取页面对象类的全部元素，包括继承的元素
+        :param page_class: 页面对象类
+        :return: {属性名: 元素描述符}
+        """
+        result: Dict[str, Element] = {}
+        for cls in reversed(page_class.__mro__):
+            result.update(self._elements.get(f"{cls.__module__}.{cls.__qualname__}", {}))
+        return result
+
+    def page_classes(self) -> List[type]:
+        """已注册元素的页面对象类"""
+        with self._lock:
+            return list(self._classes.values())
+
+    def describe(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        列出所有页面对象使用的选择器
+        :return: {模块.页面对象类: {属性名: 元素信息}}
+        """
+        return {
+            f"{cls.__module__}.{cls.__qualname__}": {
+                name: element.describe() for name, element in self.elements(cls).items()
+            }
+            for cls in sorted(self.page_classes(), key=lambda cls: (cls.__module__, cls.__qualname__))
+        }
+
+
+# 全局元素注册表
+element_registry = ElementRegistry()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="列出页面对象声明的元素选择器")
+    parser.add_argument("--module", action="append", default=None,
+                        help="要导入的页面对象模块，默认导入 pages 目录下的全部模块，可重复指定")
+    args = parser.parse_args()
+
+    modules = args.module or [
+        f"pages.{os.path.splitext(os.path.basename(path))[0]}"
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py")))
+    ]
+    for module in modules:
+        importlib.import_module(module)
+    # 以 python -m 运行时本模块为 __main__，元素注册在 pages.elements 导入的注册表中
+    registry = importlib.import_module("pages.elements").element_registry
+    json.dump(registry.describe(), sys.stdout, ensure_ascii=False, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import pytest
+from types import SimpleNamespace
+from config import config
+from utils import artifacts
+from utils.artifacts import ArtifactRecorder, artifact_name, needs_evidence
+from utils.retry import retry_engine
+
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **options):
+        self.calls.append("start")
+
+    def start_chunk(self, title=None):
+        self.calls.append("start_chunk")
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+class FakeVideo:
+    def __init__(self):
+        self.calls = []
+
+    def save_as(self, path):
+        self.calls.append(("save_as", path))
+
+    def delete(self):
+        self.calls.append("delete")
+
+
+def _item(failed_when=None, execution_count=1):
+    item = SimpleNamespace(nodeid="tests/test_search.py::test_search[chromium]", execution_count=execution_count)
+    for when in ("setup", "call", "teardown"):
+        setattr(item, f"rep_{when}", SimpleNamespace(failed=when == failed_when))
+    return item
+
+
+@pytest.fixture(autouse=True)
+def no_attach(monkeypatch):
+    retry_engine.start_test(None)
+    monkeypatch.setattr(artifacts.allure.attach, "file", lambda *args, **kwargs: None)
+
+
+def test_artifact_name():
+    assert artifact_name(_item()) == "tests_test_search.py_test_search_chromium_"
+
+
+@pytest.mark.parametrize("item, expected", [
+    (_item(), False),
+    (_item(failed_when="call"), True),
+    (_item(failed_when="teardown"), True),
+    (_item(execution_count=2), True),
+])
+def test_needs_evidence(item, expected):
+    """任一阶段失败或被重新执行的测试需要保留证据"""
+    assert needs_evidence(item) is expected
+
+
+def test_needs_evidence_after_retried_action():
+    retry_engine.test_stats.record("click", retries=1, retry_seconds=0.5, failed=False)
+    assert needs_evidence(_item())
+
+
+def _recorder(tmp_path, video_mode="retain-on-failure", trace_mode="retain-on-failure"):
+    return ArtifactRecorder(config.TestConfig(video_mode=video_mode, trace_mode=trace_mode,
+                                              trace_dir=str(tmp_path / "traces"), video_dir=str(tmp_path / "videos")))
+
+
+def test_trace_chunks_kept_only_on_failure(tmp_path):
+    """追踪只在上下文首次使用时开启，通过的测试丢弃追踪块，失败的测试保存"""
+    recorder, context = _recorder(tmp_path), FakeContext()
+    recorder.start_trace(context, _item())
+    assert recorder.finish_trace(context, _item()) is None
+    recorder.start_trace(context, _item())
+    path = recorder.finish_trace(context, _item(failed_when="call"))
+    assert path.endswith("tests_test_search.py_test_search_chromium_.zip")
+    assert context.tracing.calls == ["start", "start_chunk", ("stop_chunk", None), "start_chunk", ("stop_chunk", path)]
+    assert recorder.stats() == {"traces_discarded": 1, "traces_kept": 1}
+
+
+def test_video_kept_only_on_failure(tmp_path):
+    """通过的测试删除录像，失败的测试通过 save_as 保存后删除原文件"""
+    recorder = _recorder(tmp_path)
+    passed, failed = FakeVideo(), FakeVideo()
+    assert recorder.finish_video(SimpleNamespace(video=passed), _item()) is None
+    path = recorder.finish_video(SimpleNamespace(video=failed), _item(failed_when="call"))
+    assert passed.calls == ["delete"]
+    assert failed.calls == [("save_as", path), "delete"]
+    assert recorder.stats() == {"videos_discarded": 1, "videos_kept": 1}
+
+
+def test_off_and_unknown_modes(tmp_path):
+    recorder = _recorder(tmp_path, video_mode="off", trace_mode="off")
+    context = FakeContext()
+    recorder.start_trace(context, _item())
+    assert recorder.finish_trace(context, _item(failed_when="call")) is None
+    assert context.tracing.calls == []
+    with pytest.raises(ValueError, match="未知的产物保留模式"):
+        _recorder(tmp_path, trace_mode="always")
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from config import config
+from utils import step_recorder as step_module
+from utils.async_runner import run_scenarios
+from utils.retry import retry_engine
+from utils.step_recorder import step, step_recorder
+
+
+class FakePage:
+    pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+class FakeStepContext:
+    events = []
+
+    def __init__(self, title, params):
+        self.title = title.split(" (")[0]
+
+    def __enter__(self):
+        FakeStepContext.events.append(self.title)
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setattr(step_module, "StepContext", FakeStepContext)
+    FakeStepContext.events = []
+    step_recorder.start_test()
+    retry_engine.start_test(None)
+    return FakeStepContext.events
+
+
+@step("打开 {name}")
+async def _open(name):
+    # 让出事件循环，使两个场景的步骤交错执行
+    await asyncio.sleep(0)
+
+
+async def scenario_a(page):
+    await _open("a1")
+    await _open("a2")
+    return "a"
+
+
+async def scenario_b(page):
+    await _open("b1")
+    raise RuntimeError("b failed")
+
+
+def test_run_scenarios_isolates_steps(events):
+    """各场景在独立上下文中执行，结果顺序与场景一致，步骤按场景分组写入"""
+    browser = FakeBrowser()
+    results = asyncio.run(run_scenarios(browser, [scenario_a, scenario_b], config.TestConfig(), concurrency=2))
+    assert [(r.name, r.passed, r.result) for r in results] == [("scenario_a", True, "a"), ("scenario_b", False, None)]
+    assert isinstance(results[1].error, RuntimeError)
+    assert all(context.closed for context in browser.contexts)
+    assert events == ["scenario_a", "打开 'a1'", "打开 'a2'", "scenario_b", "打开 'b1'"]
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+import pytest
+from types import SimpleNamespace
+from utils.auth import AuthStateCache
+
+
+class FakeContext:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+
+    def new_page(self):
+        return SimpleNamespace(context=self)
+
+    def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.browser.state, f)
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    """创建上下文时记录选项，保存的存储状态为预设的 state"""
+
+    def __init__(self, state):
+        self.state = state
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AuthStateCache()
+    cache.state_dir = str(tmp_path)
+    cache.logins_by_role = []
+    cache.role("admin")(lambda page, env: cache.logins_by_role.append(env))
+    return cache
+
+
+def _write_state(path, cookies, age=0.0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"cookies": cookies, "origins": []}, f)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_expires_at_uses_ttl_and_earliest_cookie(cache):
+    """失效时间取保存时间加 TTL 与 cookie 过期时间（留出余量）中较早的一个，会话 cookie 不参与"""
+    path = cache.state_path("admin")
+    assert cache._expires_at(path) is None
+
+    _write_state(path, [{"name": "sid", "expires": -1}])
+    assert cache._expires_at(path) == pytest.approx(os.path.getmtime(path) + 3600)
+
+    cookie_expiry = time.time() + 600
+    _write_state(path, [{"name": "sid", "expires": cookie_expiry}, {"name": "lang", "expires": -1}])
+    assert cache._expires_at(path) == pytest.approx(cookie_expiry - 60)
+
+
+def test_reuses_valid_state_without_login(cache):
+    path = cache.state_path("admin")
+    _write_state(path, [])
+    browser = FakeBrowser({})
+    assert cache.get_state(browser, "admin") == path
+    assert cache.get_state(browser, "admin") == path
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["memory_hits"] == 1
+    assert browser.contexts == [] and cache.logins_by_role == []
+
+
+@pytest.mark.parametrize("age, cookies", [
+    (4000, []),
+    (0, [{"name": "sid", "expires": time.time() + 30}]),
+])
+def test_logs_in_again_when_state_expired(cache, age, cookies):
+    """超过 TTL 或 cookie 即将过期时重新登录并写入新的状态文件"""
+    path = cache.state_path("admin")
+    _write_state(path, cookies, age=age)
+    browser = FakeBrowser({"cookies": [{"name": "sid", "expires": -1}], "origins": []})
+    assert cache.get_state(browser, "admin") == path
+    assert cache.logins_by_role == ["test"]
+    assert cache.stats()["invalidated"] == 1 and cache.stats()["logins"] == 1
+    assert browser.contexts[0].options == {}
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["cookies"][0]["expires"] == -1
+
+
+def test_validate_failure_and_invalidate(cache):
+    path = cache.state_path("admin")
+    _write_state(path, [])
+    cache.role("admin", validate=lambda context: False)(lambda page, env: None)
+    browser = FakeBrowser({"cookies": [], "origins": []})
+    cache.get_state(browser, "admin")
+    assert cache.stats()["logins"] == 1 and cache.stats()["invalidated"] == 1
+
+    cache.invalidate("admin")
+    assert not os.path.exists(path)
+
+
+def test_unknown_role(cache):
+    with pytest.raises(ValueError, match="未注册的登录角色"):
+        cache.get_state(FakeBrowser({}), "guest")
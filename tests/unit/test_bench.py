@@ -0,0 +1,44 @@
+import urllib.request
+from benchmarks.bench import compare, measure
+from benchmarks.fake_site import FakeSearchSite
+
+
+def test_measure_skips_warmup_and_setup():
+    """预热次数不计入样本，setup 在每次执行前调用"""
+    calls = []
+    result = measure(lambda: calls.append("run"), iterations=3, setup=lambda: calls.append("setup"), warmup=2)
+    assert calls == ["setup", "run"] * 5
+    assert result["samples"] == 3
+    assert result["unit"] == "ms"
+    assert result["min"] <= result["median"] <= result["p95"]
+
+
+def test_compare():
+    """耗时类指标按中位数变慢、吞吐量类指标按数值变小判断回退，超过阈值才算回退"""
+    baseline = {
+        "browser.launch": {"unit": "ms", "median": 100.0},
+        "page.click": {"unit": "ms", "median": 10.0},
+        "scenarios.throughput": {"unit": "scenarios/s", "value": 10.0, "higher_is_better": True},
+    }
+    current = {
+        "browser.launch": {"unit": "ms", "median": 125.0},
+        "page.click": {"unit": "ms", "median": 11.0},
+        "scenarios.throughput": {"unit": "scenarios/s", "value": 7.0, "higher_is_better": True},
+        "page.new": {"unit": "ms", "median": 50.0},
+    }
+    assert compare(current, baseline, 0.2) == [
+        {"name": "browser.launch", "baseline": 100.0, "current": 125.0, "change": "+25%", "unit": "ms"},
+        {"name": "scenarios.throughput", "baseline": 10.0, "current": 7.0, "change": "+30%", "unit": "scenarios/s"},
+    ]
+    assert compare(current, baseline, 0.5) == []
+
+
+def test_fake_site_serves_search_results():
+    """模拟站点的首页和搜索结果页"""
+    with FakeSearchSite(result_count=3) as site:
+        with urllib.request.urlopen(site.url) as response:
+            assert 'id="kw"' in response.read().decode("utf-8")
+        with urllib.request.urlopen(f"{site.url}/s?wd=playwright") as response:
+            body = response.read().decode("utf-8")
+    assert body.count('class="result-op c-container"') == 3
+    assert "playwright - 结果 3" in body
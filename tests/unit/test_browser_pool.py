@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+from config import config
+from utils.browser_pool import BrowserPool, BrowserPools, get_worker_id, matrix_report
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowserType:
+    def __init__(self):
+        self.launched = []
+
+    def launch(self, **options):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+def _pool(browsers_per_worker=2):
+    playwright = SimpleNamespace(chromium=FakeBrowserType())
+    test_config = config.TestConfig(browser_type="chromium", browsers_per_worker=browsers_per_worker)
+    return BrowserPool(playwright, test_config), playwright.chromium
+
+
+def test_get_worker_id(monkeypatch):
+    """xdist 工作进程返回 gw<n>，非并行运行返回 master"""
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert get_worker_id() == "master"
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert get_worker_id() == "gw3"
+
+
+def test_acquire_round_robin():
+    """首次获取时启动整个池，之后按轮询分配"""
+    pool, browser_type = _pool()
+    acquired = [pool.acquire() for _ in range(4)]
+    assert len(browser_type.launched) == 2
+    assert acquired == browser_type.launched * 2
+
+
+def test_acquire_relaunches_disconnected_browser():
+    """已断开的浏览器在下次分配到时重新启动"""
+    pool, browser_type = _pool(browsers_per_worker=1)
+    first = pool.acquire()
+    first.connected = False
+    second = pool.acquire()
+    assert second is not first
+    assert browser_type.launched == [first, second]
+    assert pool.stats()["launches"] == 2
+
+
+def test_close():
+    """关闭池内所有浏览器并记录关闭耗时"""
+    pool, browser_type = _pool()
+    pool.start()
+    pool.close()
+    assert all(browser.closed for browser in browser_type.launched)
+    assert pool.stats()["size"] == 2
+    assert len(pool.teardown_times) == 2
+
+
+def test_browser_pools_launch_each_engine_once():
+    """多浏览器矩阵按引擎各维护一个池，首次使用时启动"""
+    playwright = SimpleNamespace(chromium=FakeBrowserType(), firefox=FakeBrowserType())
+    pools = BrowserPools(playwright, config.TestConfig(browsers_per_worker=1))
+    assert pools.get("firefox") is pools.get("firefox")
+    pools.get("chromium").acquire()
+    assert (len(playwright.chromium.launched), len(playwright.firefox.launched)) == (1, 1)
+    pools.close()
+    assert playwright.firefox.launched[0].closed and playwright.chromium.launched[0].closed
+
+
+def test_matrix_report():
+    """按引擎汇总结果，并找出只在部分引擎上失败的测试"""
+    results = {
+        "tests/test_search.py::test_search[chromium]": {"browser": "chromium", "outcome": "passed", "duration": 1.0},
+        "tests/test_search.py::test_search[firefox]": {"browser": "firefox", "outcome": "failed", "duration": 2.0},
+        "tests/test_search.py::test_data[chromium-row1]": {"browser": "chromium", "outcome": "failed", "duration": 0.5},
+        "tests/test_search.py::test_data[firefox-row1]": {"browser": "firefox", "outcome": "failed", "duration": 0.25},
+        "tests/test_search.py::test_skip[firefox]": {"browser": "firefox", "outcome": "skipped", "duration": 0.0},
+    }
+    report = matrix_report(results)
+    assert report["engines"] == {
+        "chromium": {"tests": 2, "passed": 1, "failed": 1, "skipped": 0, "duration": 1.5},
+        "firefox": {"tests": 3, "passed": 0, "failed": 2, "skipped": 1, "duration": 2.25},
+    }
+    # test_data 在所有引擎上都失败，不属于引擎差异
+    assert report["failed_only_on"] == {"firefox": ["tests/test_search.py::test_search"]}
+
+
+def test_matrix_report_strips_loadgroup_suffix():
+    """--dist loadgroup 追加的 @分组 后缀不影响跨引擎匹配"""
+    results = {
+        "tests/test_search.py::test_search[row1-chromium]@chromium": {"browser": "chromium", "outcome": "failed", "duration": 1.0},
+        "tests/test_search.py::test_search[row1-webkit]@webkit": {"browser": "webkit", "outcome": "passed", "duration": 1.0},
+    }
+    assert matrix_report(results)["failed_only_on"] == {"chromium": ["tests/test_search.py::test_search[row1]"]}
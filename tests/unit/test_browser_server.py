@@ -0,0 +1,95 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import pytest
+from config import config
+from utils.browser_server import BrowserServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    test_config = config.TestConfig(browser_type="chromium", browser_server_dir=str(tmp_path))
+    return BrowserServer(test_config, worker_id="gw0")
+
+
+@pytest.fixture
+def listening_endpoint():
+    """本地监听中的端口，作为健康服务的 websocket 地址"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        yield f"ws://127.0.0.1:{sock.getsockname()[1]}/abc"
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _write_state(server, **state):
+    with open(server.state_path, "w", encoding="utf-8") as f:
+        json.dump({"browser": server.browser_type, "digest": server.options_digest(), "started_at": 0, **state}, f)
+
+
+def test_worker_ids_ignore_launch_config(server, tmp_path):
+    """按引擎列出已有状态文件的工作进程，不包括 launch-server 配置和锁文件"""
+    for name in ("chromium-gw0.json", "chromium-gw1.json", "chromium-gw0.config.json",
+                 "chromium-gw0.json.lock", "firefox-gw0.json"):
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+    assert BrowserServer.worker_ids(server.test_config, "chromium") == ["gw0", "gw1"]
+
+
+def test_read_state(server):
+    assert server.read_state() is None
+    with open(server.state_path, "w", encoding="utf-8") as f:
+        f.write("{")
+    assert server.read_state() is None
+    _write_state(server, pid=1, ws_endpoint="ws://127.0.0.1:1/")
+    assert server.read_state()["pid"] == 1
+
+
+def test_status_healthy(server, listening_endpoint):
+    _write_state(server, pid=os.getpid(), ws_endpoint=listening_endpoint)
+    assert server.status()["ws_endpoint"] == listening_endpoint
+
+
+def test_status_unhealthy(server, listening_endpoint):
+    """进程已退出、端口不可连接或启动选项变化时不健康"""
+    _write_state(server, pid=_dead_pid(), ws_endpoint=listening_endpoint)
+    assert server.status() is None
+    _write_state(server, pid=os.getpid(), ws_endpoint=listening_endpoint, digest="changed")
+    assert server.status() is None
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_endpoint = f"ws://127.0.0.1:{sock.getsockname()[1]}/abc"
+    _write_state(server, pid=os.getpid(), ws_endpoint=closed_endpoint)
+    assert server.status() is None
+
+
+def test_stop_with_stale_pid_removes_state(server):
+    _write_state(server, pid=_dead_pid(), ws_endpoint="ws://127.0.0.1:1/")
+    assert server.stop() is False
+    assert not os.path.exists(server.state_path)
+
+
+def test_ensure_reuses_healthy_server(server, listening_endpoint, monkeypatch):
+    _write_state(server, pid=os.getpid(), ws_endpoint=listening_endpoint)
+    monkeypatch.setattr(server, "start", lambda: pytest.fail("健康的服务不应重新启动"))
+    assert server.ensure() == listening_endpoint
+
+
+def test_ensure_restarts_crashed_server(server, monkeypatch):
+    """服务进程已退出时删除旧状态并重新启动"""
+    _write_state(server, pid=_dead_pid(), ws_endpoint="ws://127.0.0.1:1/")
+    started = []
+
+    def start():
+        started.append(server.read_state())
+        return {"ws_endpoint": "ws://127.0.0.1:2/new"}
+
+    monkeypatch.setattr(server, "start", start)
+    assert server.ensure() == "ws://127.0.0.1:2/new"
+    assert started == [None]
@@ -0,0 +1,66 @@
+import pytest
+from pages.base_page import BasePage, _ATTRIBUTES_JS, _ROWS_JS, _TABLE_JS, _field_specs
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def evaluate_all(self, expression, arg=None):
+        self.page.calls.append((self.selector, expression, arg))
+        return self.page.result
+
+    def all_inner_texts(self):
+        self.page.calls.append((self.selector, "all_inner_texts", None))
+        return self.page.result
+
+
+class FakePage:
+    """记录每次往返的页面，返回预设结果"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ({"title": "h3"}, [["title", "h3", None]]),
+    ({"url": "h3 a@href"}, [["url", "h3 a", "href"]]),
+    ({"row": ""}, [["row", "", None]]),
+    ({"link": ("a", "data-url")}, [["link", "a", "data-url"]]),
+    # 属性选择器中的 @ 不是属性分隔符
+    ({"mail": 'a[href^="mailto:x@y"]'}, [["mail", 'a[href^="mailto:x@y"]', None]]),
+    ({"mail": 'a[title="@"]@href'}, [["mail", 'a[title="@"]', "href"]]),
+])
+def test_field_specs(fields, expected):
+    assert _field_specs(fields) == expected
+
+
+def test_get_texts_strips_whitespace():
+    page = FakePage([" 结果 1 \n", "结果 2"])
+    assert BasePage(page).get_texts(".result") == ["结果 1", "结果 2"]
+    assert len(page.calls) == 1
+
+
+def test_get_attributes_single_and_multiple():
+    """单个属性名返回值列表，多个属性名每个元素返回一个元组，均为一次往返"""
+    page = FakePage([["/a", "_blank"], ["/b", None]])
+    assert BasePage(page).get_attributes("a", ["href", "target"]) == [("/a", "_blank"), ("/b", None)]
+    page.result = [["/a"], [None]]
+    assert BasePage(page).get_attributes("a", "href") == ["/a", None]
+    assert [call[1:] for call in page.calls] == [(_ATTRIBUTES_JS, ["href", "target"]), (_ATTRIBUTES_JS, ["href"])]
+
+
+def test_extract_rows_and_table():
+    page = FakePage([{"title": "结果 1", "url": "/a"}])
+    base_page = BasePage(page)
+    assert base_page.extract_rows(".result", {"title": "h3", "url": "a@href"}) == [{"title": "结果 1", "url": "/a"}]
+    base_page.extract_table()
+    assert page.calls == [
+        (".result", _ROWS_JS, [["title", "h3", None], ["url", "a", "href"]]),
+        ("table", _TABLE_JS, None),
+    ]
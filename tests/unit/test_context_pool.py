@@ -0,0 +1,114 @@
+from config import config
+from utils.context_pool import ContextPool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, fail_reset=False):
+        self.pages = []
+        self.calls = []
+        self.closed = False
+        self.fail_reset = fail_reset
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    def unroute_all(self, behavior=None):
+        self.calls.append("unroute_all")
+
+    def set_storage_state(self, state):
+        if self.fail_reset:
+            raise RuntimeError("context closed")
+        self.calls.append(("set_storage_state", state))
+
+    def clear_permissions(self):
+        self.calls.append("clear_permissions")
+
+    def set_extra_http_headers(self, headers):
+        self.calls.append(("set_extra_http_headers", headers))
+
+    def set_offline(self, offline):
+        self.calls.append(("set_offline", offline))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, fail_reset=False):
+        self.contexts = []
+        self.fail_reset = fail_reset
+
+    def new_context(self, **options):
+        context = FakeContext(self.fail_reset)
+        self.contexts.append(context)
+        return context
+
+
+def _pool(context_max_uses=20):
+    return ContextPool(config.TestConfig(context_max_uses=context_max_uses))
+
+
+def test_release_resets_and_reuses_context():
+    """归还的上下文关闭页面、清理状态后复用"""
+    pool, browser = _pool(), FakeBrowser()
+    context = pool.acquire(browser, {"viewport": None})
+    context.new_page()
+    pool.release(context)
+    assert pool.acquire(browser, {"viewport": None}) is context
+    assert context.pages == []
+    assert context.calls == [
+        "unroute_all",
+        ("set_storage_state", {"cookies": [], "origins": []}),
+        "clear_permissions",
+        ("set_extra_http_headers", {}),
+        ("set_offline", False),
+    ]
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["reused"] == 1
+
+
+def test_contexts_are_pooled_by_options():
+    """选项不同的上下文不共用"""
+    pool, browser = _pool(), FakeBrowser()
+    context = pool.acquire(browser, {"locale": "zh-CN"})
+    pool.release(context)
+    assert pool.acquire(browser, {"locale": "en-US"}) is not context
+
+
+def test_retire_after_max_uses():
+    """使用次数达到上限后关闭并重新创建"""
+    pool, browser = _pool(context_max_uses=2), FakeBrowser()
+    for _ in range(3):
+        pool.release(pool.acquire(browser, {}))
+    assert [context.closed for context in browser.contexts] == [True, False]
+    assert pool.stats()["retired"] == 1
+
+
+def test_not_reusable_or_failed_reset_closes_context():
+    """不可复用或重置失败的上下文被关闭，不放回池中"""
+    pool, browser = _pool(), FakeBrowser()
+    context = pool.acquire(browser, {})
+    pool.release(context, reusable=False)
+    assert context.closed
+
+    pool, browser = _pool(), FakeBrowser(fail_reset=True)
+    context = pool.acquire(browser, {})
+    pool.release(context)
+    assert context.closed
+    assert pool.acquire(browser, {}) is not context
@@ -0,0 +1,59 @@
+import json
+from types import SimpleNamespace
+from playwright._impl._connection import Connection
+from utils.driver_calls import DriverCallCounter, write_report
+
+
+def _install(monkeypatch):
+    """把 Connection 的消息发送方法替换为记录参数的假实现后安装计数钩子，测试结束时恢复"""
+    sent = []
+
+    def fake_send(connection, *args, **kwargs):
+        sent.append((args, kwargs))
+        return "callback"
+
+    monkeypatch.setattr(Connection, "_send_message_to_server", fake_send)
+    counter = DriverCallCounter()
+    assert counter.install() and counter.install()
+    return counter, sent
+
+
+def test_counts_positional_and_keyword_calls(monkeypatch):
+    """位置参数和关键字参数都能计数，参数原样转发，不需要回复的消息不计入"""
+    counter, sent = _install(monkeypatch)
+    page = SimpleNamespace(_type="Page")
+    connection = object.__new__(Connection)
+
+    counter.start_test()
+    assert connection._send_message_to_server(page, "click", {}, 1000) == "callback"
+    connection._send_message_to_server(page, "click", {}, 1000, no_reply=False)
+    connection._send_message_to_server(object=page, method="fill", params={}, timeout=1000)
+    connection._send_message_to_server(page, "waitForEventInfo", {}, 1000, True)
+    # 未来版本新增的参数同样转发
+    connection._send_message_to_server(page, "goto", {}, 1000, False, "extra", title="导航")
+
+    assert sent[-1] == ((page, "goto", {}, 1000, False, "extra"), {"title": "导航"})
+    assert counter.finish_test("t1") == {
+        "total": 4, "by_method": {"Page.click": 2, "Page.fill": 1, "Page.goto": 1},
+    }
+
+
+def test_unreadable_arguments_are_not_counted(monkeypatch):
+    counter, sent = _install(monkeypatch)
+    object.__new__(Connection)._send_message_to_server()
+    assert sent == [((), {})]
+    assert counter.finish_test("t1")["total"] == 0
+
+
+def test_write_report_merges_workers(tmp_path):
+    raw_dir = tmp_path / "raw"
+    for worker, tests in {"gw0": {"a": 3}, "gw1": {"b": 1}}.items():
+        counter = DriverCallCounter()
+        for test_id, count in tests.items():
+            counter.test_calls = {"Page.click": count}
+            counter.finish_test(test_id)
+        counter.dump(str(raw_dir), worker)
+
+    report = write_report(str(raw_dir), str(tmp_path))
+    assert report == {"total": 4, "by_method": {"Page.click": 4}, "tests": {"a": 3, "b": 1}}
+    assert json.loads((tmp_path / "driver_calls.json").read_text(encoding="utf-8")) == report
@@ -0,0 +1,98 @@
+import pytest
+from pages.elements import Element, ElementRegistry, LocatorCache
+
+
+class FakeLocator:
+    def __init__(self, chain):
+        self.chain = chain
+
+    def locator(self, selector):
+        return FakeLocator(self.chain + [("locator", selector)])
+
+    def nth(self, index):
+        return FakeLocator(self.chain + [("nth", index)])
+
+    def get_by_role(self, role, **options):
+        return FakeLocator(self.chain + [("get_by_role", role, options)])
+
+
+class FakePage(FakeLocator):
+    """记录定位器创建过程和事件监听的页面"""
+
+    def __init__(self):
+        super().__init__([])
+        self.main_frame = object()
+        self.handlers = {}
+
+    def frame_locator(self, selector):
+        return FakeLocator([("frame_locator", selector)])
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+@pytest.mark.parametrize("element, expected", [
+    (Element("#kw"), "#kw"),
+    (Element("//input", by="xpath"), "xpath=//input"),
+    (Element("百度一下", by="text"), "text=百度一下"),
+    (Element("submit", by="test_id"), 'internal:testid=[data-testid="submit"s]'),
+    (Element("button", by="role", name="搜索", exact=True), 'internal:role=button[name="搜索"s]'),
+    (Element(".result", nth=2), ".result >> nth=2"),
+    (Element("#kw", frame="#login"), "#login >> internal:control=enter-frame >> #kw"),
+    (Element("h3", parent=Element(".result", nth=0)), ".result >> nth=0 >> h3"),
+])
+def test_expression(element, expected):
+    assert element.expression == expected
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="未知的定位方式"):
+        Element("#kw", by="id")
+    with pytest.raises(ValueError, match="未知的元素状态"):
+        Element("#kw", state="hidden")
+
+
+def test_build_from_root():
+    page = FakePage()
+    assert Element(".result", nth=1).build(page).chain == [("locator", ".result"), ("nth", 1)]
+    assert Element("button", by="role", name="搜索").build(page).chain == [("get_by_role", "button", {"name": "搜索"})]
+
+
+def test_locator_cache_hits_and_navigation():
+    """定位器按元素缓存，父元素和 iframe 作为定位起点，主框架导航后清空"""
+    page = FakePage()
+    cache = LocatorCache(page)
+    parent = Element(".result")
+    child = Element("h3", parent=parent)
+    framed = Element("#kw", frame="#login")
+
+    assert cache.get(child).chain == [("locator", ".result"), ("locator", "h3")]
+    assert cache.get(framed).chain == [("frame_locator", "#login"), ("locator", "#kw")]
+    assert cache.get(child) is cache.get(child)
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    page.handlers["framenavigated"](object())
+    cache.get(child)
+    assert cache.hits == 3
+    page.handlers["framenavigated"](page.main_frame)
+    cache.get(child)
+    assert cache.misses == 5
+
+
+def test_registry_includes_inherited_elements(monkeypatch):
+    registry = ElementRegistry()
+    monkeypatch.setattr("pages.elements.element_registry", registry)
+
+    class BaseForm:
+        submit = Element("button[type=submit]")
+
+    class LoginForm(BaseForm):
+        username = Element("#username", description="用户名")
+
+    assert BaseForm.submit.name == "submit"
+    assert list(registry.elements(LoginForm)) == ["submit", "username"]
+    described = registry.describe()[f"{__name__}.{LoginForm.__qualname__}"]
+    assert described["username"] == {
+        "expression": "#username", "by": "css", "selector": "#username",
+        "state": "visible", "description": "用户名",
+    }
@@ -0,0 +1,55 @@
+import pytest
+from pytest_bdd import feature as feature_module
+from utils import feature_cache as feature_cache_module
+from utils.feature_cache import FeatureCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """使用临时缓存目录的 FeatureCache，不影响 pytest-bdd 的进程内缓存"""
+    monkeypatch.setattr(feature_module, "features", {})
+    cache = FeatureCache()
+    cache.cache_dir = str(tmp_path / "cache")
+    (tmp_path / "cache").mkdir()
+    (tmp_path / "search.feature").write_text(
+        "Feature: 搜索\n  Scenario: 搜索关键词\n    Given 打开首页\n", encoding="utf-8")
+    return cache
+
+
+def _parse(cache, base_path):
+    """清空进程内缓存后读取，模拟新的测试进程"""
+    feature_module.features.clear()
+    return cache.get_feature(str(base_path), "search.feature")
+
+
+def test_cache_hit_and_invalidation_by_content(cache, tmp_path):
+    feature = _parse(cache, tmp_path)
+    assert feature.name == "搜索"
+    assert _parse(cache, tmp_path).name == "搜索"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    (tmp_path / "search.feature").write_text(
+        "Feature: 搜索结果\n  Scenario: 搜索关键词\n    Given 打开首页\n", encoding="utf-8")
+    assert _parse(cache, tmp_path).name == "搜索结果"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_invalidation_by_package_version(cache, tmp_path, monkeypatch):
+    """升级 pytest-bdd 后不读取旧版本 pickle 的对象"""
+    _parse(cache, tmp_path)
+    monkeypatch.setattr(feature_cache_module, "_version_tag", lambda: "1/pytest-bdd==99.0/gherkin-official==1.0/3")
+    _parse(cache, tmp_path)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_corrupted_entry_is_reparsed(cache, tmp_path):
+    _parse(cache, tmp_path)
+    for path in (tmp_path / "cache").iterdir():
+        path.write_bytes(b"broken")
+    assert _parse(cache, tmp_path).name == "搜索"
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_version_tag_lists_pickled_packages():
+    tag = feature_cache_module._version_tag()
+    assert "pytest-bdd==" in tag and "gherkin-official==" in tag
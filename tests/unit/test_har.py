@@ -0,0 +1,63 @@
+import json
+import pytest
+from types import SimpleNamespace
+from config import config
+from utils.har import HarNetwork, HarSession, merge_har
+
+
+def _entry(url, body=None, status=200):
+    request = {"method": "POST" if body else "GET", "url": url}
+    if body:
+        request["postData"] = {"text": body}
+    return {"request": request, "response": {"status": status}}
+
+
+def _write_har(path, entries):
+    path.write_text(json.dumps({"log": {"version": "1.2", "entries": entries}}), encoding="utf-8")
+
+
+def _statuses(path):
+    return [entry["response"]["status"] for entry in json.loads(path.read_text(encoding="utf-8"))["log"]["entries"]]
+
+
+def test_merge_har(tmp_path):
+    """相同方法、URL 和请求体的条目以新录制的为准，请求体不同的条目分别保留"""
+    source, target = tmp_path / "partial.har", tmp_path / "search.har"
+    _write_har(source, [_entry("https://example.com/s"), _entry("https://example.com/api", "q=1")])
+    assert merge_har(str(source), str(target)) == 2
+
+    _write_har(source, [_entry("https://example.com/s", status=304), _entry("https://example.com/api", "q=2")])
+    assert merge_har(str(source), str(target)) == 3
+    assert _statuses(target) == [304, 200, 200]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="未知的 HAR 模式"):
+        HarNetwork(config.TestConfig(har_mode="live"))
+
+
+def test_finish_merges_recorded_har(tmp_path):
+    """录制模式结束时把临时 HAR 合并进 feature 级 HAR 并删除临时文件"""
+    network = HarNetwork(config.TestConfig(har_mode="record", har_dir=str(tmp_path)))
+    partial = tmp_path / "partial.har"
+    _write_har(partial, [_entry("https://example.com/s")])
+    session = HarSession("search", network.har_path("search"), str(partial))
+    assert network.finish(session) == []
+    assert not partial.exists()
+    assert _statuses(tmp_path / "search.har") == [200]
+
+
+@pytest.mark.parametrize("allow_network, expected", [(False, "abort"), (True, "continue")])
+def test_replay_miss(tmp_path, allow_network, expected):
+    """回放未命中的请求被记录，默认中止"""
+    network = HarNetwork(config.TestConfig(har_mode="replay", har_dir=str(tmp_path),
+                                           har_replay_allow_network=allow_network))
+    session = HarSession("search", network.har_path("search"))
+    handled = []
+    route = SimpleNamespace(request=SimpleNamespace(method="GET", url="https://example.com/miss"),
+                            abort=lambda reason: handled.append("abort"),
+                            continue_=lambda: handled.append("continue"))
+    network._on_miss(session, route)
+    assert handled == [expected]
+    assert network.finish(session) == [{"method": "GET", "url": "https://example.com/miss"}]
+    assert network.misses == {"search": 1}
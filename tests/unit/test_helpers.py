@@ -0,0 +1,65 @@
+import os
+import sys
+import subprocess
+import threading
+import pytest
+from utils.helpers import file_lock
+
+_HOLD_LOCK = """
+import sys, time
+from utils.helpers import file_lock
+with file_lock(sys.argv[1]):
+    print("locked", flush=True)
+    time.sleep(60)
+"""
+
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    """锁被持有时其他获取方等待直到超时，释放后可以获取"""
+    lock_path = str(tmp_path / "state.json.lock")
+    with file_lock(lock_path):
+        with open(lock_path, encoding="utf-8") as f:
+            assert f.read() == str(os.getpid())
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1):
+                pass
+    with file_lock(lock_path, timeout=0.1):
+        pass
+
+
+def test_file_lock_serializes_threads(tmp_path):
+    lock_path = str(tmp_path / "counter.lock")
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+
+    def increment():
+        for _ in range(20):
+            with file_lock(lock_path):
+                counter.write_text(str(int(counter.read_text()) + 1))
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.read_text() == "80"
+
+
+def test_file_lock_released_when_holder_dies(tmp_path):
+    """持有锁的进程退出后锁由操作系统释放，残留的锁文件不阻塞后续获取"""
+    lock_path = str(tmp_path / "state.json.lock")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    holder = subprocess.Popen([sys.executable, "-c", _HOLD_LOCK, lock_path], cwd=root,
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1):
+                pass
+    finally:
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
+    assert os.path.exists(lock_path)
+    with file_lock(lock_path, timeout=5):
+        pass
@@ -0,0 +1,135 @@
+import subprocess
+import pytest
+from utils import impact
+from utils.impact import changed_lines, changed_symbols, select_tests
+
+_MODULE = '''import os
+
+TIMEOUT = 10
+
+
+def helper():
+    return 1
+
+
+class SearchPage:
+    button = "#su"
+
+    @property
+    def title(self):
+        return "百度"
+
+    def search(self, keyword):
+        return keyword
+'''
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """在临时目录中创建只有一次提交的 git 仓库，并作为项目根目录"""
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                       cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "search_page.py").write_text(_MODULE, encoding="utf-8")
+    (tmp_path / "removed.py").write_text("x = 1\n", encoding="utf-8")
+    git("add", "-A")
+    git("commit", "-q", "-m", "init")
+    monkeypatch.setattr(impact, "_PROJECT_ROOT", str(tmp_path))
+    return tmp_path
+
+
+def test_changed_lines_modified_deleted_and_untracked(git_repo):
+    """修改的文件返回新文件中的行号，删除和未跟踪的文件返回空列表"""
+    page = git_repo / "pages" / "search_page.py"
+    page.write_text(_MODULE.replace('return keyword', 'return keyword.strip()'), encoding="utf-8")
+    (git_repo / "removed.py").unlink()
+    (git_repo / "new_page.py").write_text("y = 2\n", encoding="utf-8")
+
+    assert changed_lines("HEAD") == {
+        "pages/search_page.py": [18],
+        "removed.py": [],
+        "new_page.py": [],
+    }
+
+
+def test_changed_lines_pure_deletion(git_repo):
+    """只删除行时记录删除位置之后的一行"""
+    page = git_repo / "pages" / "search_page.py"
+    page.write_text(_MODULE.replace('    button = "#su"\n', ''), encoding="utf-8")
+
+    assert changed_lines("HEAD") == {"pages/search_page.py": [10]}
+
+
+@pytest.mark.parametrize("lines, expected", [
+    ([7], {"helper"}),
+    ([11], {"SearchPage"}),
+    ([13], {"SearchPage.title"}),
+    ([17, 18], {"SearchPage.search"}),
+    ([3], {""}),
+    ([], {""}),
+])
+def test_changed_symbols(git_repo, lines, expected):
+    """变更行映射为函数、类.方法、类或模块级符号，装饰器行属于被装饰的方法"""
+    assert changed_symbols("pages/search_page.py", lines) == expected
+
+
+def test_changed_symbols_non_python_file(git_repo):
+    """非 Python 文件按整个文件处理"""
+    assert changed_symbols("tests/features/search.feature", [1]) == {""}
+
+
+_IMPACT_MAP = {
+    "test_search": {"files": ["pages/search_page.py"],
+                    "symbols": ["pages/search_page.py::SearchPage.search"]},
+    "test_title": {"files": ["pages/search_page.py"],
+                   "symbols": ["pages/search_page.py::SearchPage.title"]},
+    "test_login": {"files": ["pages/login_page.py"],
+                   "symbols": ["pages/login_page.py::LoginPage.login"]},
+}
+_TEST_IDS = ["test_search", "test_title", "test_login", "test_new"]
+
+
+@pytest.mark.parametrize("changes, expected", [
+    # 记录过的方法：只选使用过它的测试，没有映射的新测试总是选中
+    ({"pages/search_page.py": [17]}, {"test_search", "test_new"}),
+    # 类级别变更：选中使用过该类的测试
+    ({"pages/search_page.py": [11]}, {"test_search", "test_title", "test_new"}),
+    # 模块级变更：选中依赖该文件的测试
+    ({"pages/search_page.py": [3]}, {"test_search", "test_title", "test_new"}),
+    # 文档和 tests 目录下的新文件不影响选择
+    ({"README.md": [], "tests/unit/test_new.py": []}, {"test_new"}),
+])
+def test_select_tests(git_repo, changes, expected):
+    """按变更的符号选择受影响的测试"""
+    selected, reasons = select_tests(_TEST_IDS, _IMPACT_MAP, changes)
+    assert selected == expected
+
+
+def test_select_tests_unmapped_file_selects_all(git_repo):
+    """没有测试依赖的文件变更时选择全部测试"""
+    selected, reasons = select_tests(_TEST_IDS, _IMPACT_MAP, {"conftest.py": [10]})
+    assert selected is None
+    assert reasons == ["conftest.py: 没有测试记录依赖该文件，运行全部测试"]
+
+
+def test_recorder_is_disabled_by_default():
+    """默认不记录，开启后按测试保存使用的文件、符号和选择器"""
+    recorder = impact.ImpactRecorder()
+    recorder.start_test()
+    recorder.use("pages/base_page.py::BasePage.click")
+    recorder.finish_test("tests/test_a.py::test_a", [])
+    assert recorder.tests == {}
+
+    recorder.enabled = True
+    recorder.start_test()
+    recorder.use("pages/base_page.py::BasePage.click")
+    recorder.use_selector("#kw")
+    recorder.finish_test("tests/test_a.py::test_a", [])
+    assert recorder.tests == {"tests/test_a.py::test_a": {
+        "files": ["pages/base_page.py"],
+        "symbols": ["pages/base_page.py::BasePage.click"],
+        "selectors": ["#kw"],
+    }}
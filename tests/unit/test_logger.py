@@ -0,0 +1,70 @@
+import json
+import queue
+import logging
+import pytest
+from utils.logger import ContextQueueHandler, JsonLinesFormatter, LogContextFilter, Logger, current_step
+
+
+@pytest.fixture
+def queued():
+    """只写入队列的独立日志器，返回 (日志器, 队列)"""
+    records = queue.SimpleQueue()
+    handler = ContextQueueHandler(records)
+    handler.addFilter(LogContextFilter())
+    logger = logging.getLogger("test_logger.queued")
+    logger.propagate = False
+    logger.addHandler(handler)
+    yield logger, records
+    logger.removeHandler(handler)
+
+
+def test_queue_handler_keeps_exception_text(queued):
+    """入队的记录保留格式化后的异常文本，消息不拼接堆栈，也不传递 traceback 对象"""
+    logger, records = queued
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("点击 %s 失败", "#su")
+    record = records.get_nowait()
+    assert record.getMessage() == "点击 #su 失败"
+    assert record.exc_info is None
+    assert "ValueError: boom" in record.exc_text
+
+
+def test_json_lines_formatter(queued, monkeypatch):
+    """JSON 日志带有测试ID、步骤、工作进程和异常字段"""
+    logger, records = queued
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    test_token, step_token = Logger.set_test_id("tests/test_search.py::test_search"), current_step.set("点击 '#su'")
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.error("失败", exc_info=True)
+        logger.info("完成")
+    finally:
+        current_step.reset(step_token)
+        Logger.reset_test_id(test_token)
+    failed, done = (json.loads(JsonLinesFormatter().format(records.get_nowait())) for _ in range(2))
+    assert failed["message"] == "失败"
+    assert failed["test_id"] == "tests/test_search.py::test_search"
+    assert failed["step"] == "点击 '#su'"
+    assert failed["worker"] == "gw1"
+    assert "ValueError: boom" in failed["exc_info"]
+    assert "exc_info" not in done
+
+
+def test_text_formatter_still_shows_exception(queued):
+    """文本格式照常在消息后输出异常堆栈"""
+    logger, records = queued
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("失败")
+    text = logging.Formatter("%(message)s").format(records.get_nowait())
+    assert text.startswith("失败\nTraceback") and text.endswith("ValueError: boom")
+
+
+def test_configure_rejects_unknown_format():
+    with pytest.raises(ValueError, match="未知的日志格式"):
+        Logger.configure("xml")
@@ -0,0 +1,78 @@
+import pytest
+from utils import metrics as metrics_module
+from utils.metrics import ActionMetrics, _percentile, aggregate, timed, to_prometheus, write_reports
+
+
+class SearchPage:
+    @timed("wait")
+    def wait_for_visible(self, selector):
+        pass
+
+    @timed()
+    def click(self, selector):
+        self.wait_for_visible(selector)
+
+    @timed()
+    def fill(self, selector, value):
+        raise RuntimeError("not editable")
+
+
+@pytest.fixture
+def collected(monkeypatch):
+    """开启统计的独立实例"""
+    metrics = ActionMetrics()
+    metrics.enabled = True
+    monkeypatch.setattr(metrics_module, "action_metrics", metrics)
+    return metrics
+
+
+def test_disabled_by_default():
+    assert ActionMetrics().enabled is False
+
+
+def test_disabled_records_nothing(monkeypatch):
+    metrics = ActionMetrics()
+    monkeypatch.setattr(metrics_module, "action_metrics", metrics)
+    SearchPage().click("#su")
+    assert metrics.samples == []
+
+
+def test_timed_records_outermost_action(collected):
+    """嵌套的等待计入外层操作的等待时间，只记录外层操作，失败的操作也会记录"""
+    page = SearchPage()
+    page.click("#su")
+    with pytest.raises(RuntimeError):
+        page.fill(selector="#kw", value="playwright")
+    click, fill = collected.samples
+    assert (click["page"], click["action"], click["selector"], click["failed"]) == ("SearchPage", "click", "#su", False)
+    assert 0 <= click["wait"] <= click["total"]
+    assert click["action_time"] == pytest.approx(click["total"] - click["wait"])
+    assert (fill["action"], fill["selector"], fill["failed"]) == ("fill", "#kw", True)
+
+
+def test_percentile():
+    ordered = [float(value) for value in range(1, 101)]
+    assert _percentile([], 0.95) == 0.0
+    assert _percentile(ordered, 0.5) == 51.0
+    assert _percentile(ordered, 0.99) == 99.0
+    assert _percentile(ordered, 1.0) == 100.0
+
+
+def test_aggregate_and_reports(tmp_path, collected):
+    """汇总各工作进程的原始数据并写出 JSON 和 Prometheus 报告"""
+    for worker, total in (("gw0", 0.1), ("gw1", 0.3)):
+        collected.samples = [{"page": "SearchPage", "action": "click", "selector": "#su", "step": "点击搜索",
+                              "test_id": f"test_{worker}", "total": total, "wait": 0.05, "action_time": total - 0.05,
+                              "retry": 0.0, "failed": worker == "gw1"}]
+        collected.dump(str(tmp_path / "raw"), worker)
+    report = aggregate(str(tmp_path / "raw"))
+    assert report["samples"] == 2
+    action = report["actions"][0]
+    assert (action["count"], action["failures"], action["max_ms"], action["wait_total_ms"]) == (2, 1, 300.0, 100.0)
+    assert report["slowest_selectors"][0]["selector"] == "#su"
+    assert set(report["tests"]) == {"test_gw0", "test_gw1"}
+
+    prometheus = to_prometheus(report)
+    assert 'pobdd_action_duration_seconds_count{page="SearchPage",action="click"} 2' in prometheus
+    write_reports(str(tmp_path / "raw"), str(tmp_path))
+    assert (tmp_path / "actions.json").exists() and (tmp_path / "actions.prom").exists()
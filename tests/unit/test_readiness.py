@@ -0,0 +1,62 @@
+import re
+import pytest
+from utils.exceptions import TimeoutException
+from utils.readiness import (DOM_READY, LoadStateReadiness, NetworkSettledReadiness, PredicateReadiness,
+                             ReadinessStats, resolve_readiness)
+
+
+class FakePage:
+    def __init__(self):
+        self.load_states = []
+        self.waited_ms = 0
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.load_states.append(state)
+
+    def wait_for_timeout(self, ms):
+        self.waited_ms += ms
+
+
+def test_resolve_readiness():
+    """名称、策略对象和判断函数统一转换为策略对象"""
+    assert resolve_readiness("dom") is DOM_READY
+    strategy = LoadStateReadiness("load")
+    assert resolve_readiness(strategy) is strategy
+    assert isinstance(resolve_readiness(lambda page: True), PredicateReadiness)
+    with pytest.raises(ValueError, match="未知的页面就绪策略"):
+        resolve_readiness("idle")
+    with pytest.raises(TypeError):
+        resolve_readiness(42)
+
+
+def test_load_state_readiness_waits_each_state():
+    """依次等待每个加载状态"""
+    page = FakePage()
+    LoadStateReadiness("load", "networkidle").wait(page, 1000)
+    assert page.load_states == ["load", "networkidle"]
+
+
+def test_predicate_readiness_polls_until_true():
+    """判断函数成立前按间隔轮询，超时后抛出 TimeoutException"""
+    page, results = FakePage(), iter([False, False, True])
+    PredicateReadiness(lambda p: next(results), poll_ms=10).wait(page, 1000)
+    assert page.waited_ms == 20
+    with pytest.raises(TimeoutException, match="never"):
+        PredicateReadiness(lambda p: False, name="never", poll_ms=10).wait(FakePage(), 0)
+
+
+def test_network_settled_matches_patterns():
+    """只关注匹配的请求，支持通配符和正则"""
+    strategy = NetworkSettledReadiness(["*/api/*", re.compile(r"\.json$")])
+    assert strategy._matches("https://example.com/api/search")
+    assert strategy._matches("https://example.com/data.json")
+    assert not strategy._matches("https://example.com/hm.gif")
+
+
+def test_readiness_stats_summary():
+    """按策略汇总等待次数、耗时和超时次数"""
+    stats = ReadinessStats()
+    stats.record("dom", 0.1)
+    stats.record("dom", 0.3, timed_out=True)
+    assert stats.summary() == {"dom": {"count": 2, "total_ms": 400.0, "avg_ms": 200.0,
+                                       "p95_ms": 100.0, "max_ms": 300.0, "timeouts": 1}}
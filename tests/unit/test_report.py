@@ -0,0 +1,134 @@
+import os
+import gzip
+import json
+import time
+import pytest
+from utils.report import ArtifactStore, compact_allure_results
+
+
+def _write_result(results_dir, name, data):
+    with open(os.path.join(results_dir, name), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _read_result(results_dir, name):
+    with open(os.path.join(results_dir, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_compact_allure_results(tmp_path):
+    """同一存储对象的硬链接只保留一个文件名，结果和容器（含嵌套步骤）中的引用随之替换"""
+    results_dir = str(tmp_path)
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"screenshot")
+    for name in ("a-attachment.png", "b-attachment.png", "c-attachment.png"):
+        os.link(blob, tmp_path / name)
+    blob.unlink()
+    (tmp_path / "d-attachment.txt").write_bytes(b"screenshot")
+    _write_result(results_dir, "1-result.json", {
+        "attachments": [{"source": "a-attachment.png"}],
+        "steps": [{"attachments": [{"source": "b-attachment.png"}, {"source": "d-attachment.txt"}]}],
+    })
+    _write_result(results_dir, "2-container.json", {"afters": [{"attachments": [{"source": "c-attachment.png"}]}]})
+
+    stats = compact_allure_results(results_dir)
+
+    # 内容相同但不是硬链接的附件不合并
+    assert stats == {"attachments": 4, "removed": 2, "saved_bytes": 20}
+    assert sorted(os.listdir(results_dir)) == ["1-result.json", "2-container.json", "a-attachment.png", "d-attachment.txt"]
+    assert _read_result(results_dir, "1-result.json") == {
+        "attachments": [{"source": "a-attachment.png"}],
+        "steps": [{"attachments": [{"source": "a-attachment.png"}, {"source": "d-attachment.txt"}]}],
+    }
+    assert _read_result(results_dir, "2-container.json") == {"afters": [{"attachments": [{"source": "a-attachment.png"}]}]}
+
+
+def test_compact_allure_results_without_duplicates(tmp_path):
+    """没有重复附件或目录不存在时不做修改"""
+    (tmp_path / "a-attachment.png").write_bytes(b"screenshot")
+    assert compact_allure_results(str(tmp_path)) == {"attachments": 1, "removed": 0, "saved_bytes": 0}
+    assert compact_allure_results(str(tmp_path / "missing")) == {"attachments": 0, "removed": 0, "saved_bytes": 0}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArtifactStore()
+    store.enabled = True
+    store.store_dir = str(tmp_path / "artifacts")
+    return store
+
+
+def _age(path, days):
+    mtime = time.time() - days * 86400
+    os.utime(path, (mtime, mtime))
+
+
+def test_store_deduplicates_content(store, tmp_path):
+    """相同内容只保存一次，目标位置为指向存储对象的硬链接"""
+    first = store.put_bytes(b"screenshot", "png")
+    source = tmp_path / "shot.png"
+    source.write_bytes(b"screenshot")
+    assert store.put_file(str(source), "png") == first
+    assert store.put_file(first, "png") == first
+    store.link(first, str(tmp_path / "a-attachment.png"))
+    assert os.stat(first).st_nlink == 2
+    assert store.stats()["stored"] == 1 and store.stats()["deduplicated"] == 1
+
+
+def test_store_gzip_is_deterministic(store):
+    text = "日志" * 1000
+    path = store.put_gzip(text, "txt.gz")
+    assert store.put_gzip(text, "txt.gz") == path
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert f.read() == text
+
+
+def test_retention_removes_expired_blobs_with_links(store, tmp_path):
+    """过期对象连同结果目录中的链接一起删除并释放空间，不是存储对象链接的文件不受影响"""
+    results_dir = tmp_path / "allure-results"
+    results_dir.mkdir()
+    old = store.put_bytes(b"old" * 100, "png")
+    new = store.put_bytes(b"new", "png")
+    store.link(old, str(results_dir / "a-attachment.png"))
+    store.link(new, str(results_dir / "b-attachment.png"))
+    (results_dir / "c-attachment.png").write_bytes(b"own")
+    _age(old, 8)
+    _age(results_dir / "c-attachment.png", 30)
+
+    assert store.enforce_retention([str(results_dir)]) == {
+        "removed": 1, "unlinked": 1, "blobs": 1, "bytes": 3, "unreclaimed_bytes": 0,
+    }
+    assert sorted(os.listdir(results_dir)) == ["b-attachment.png", "c-attachment.png"]
+    assert os.path.exists(new)
+
+
+def test_retention_evicts_least_recently_used_to_size_limit(store, tmp_path):
+    screenshots = tmp_path / "screenshots"
+    screenshots.mkdir()
+    blobs = [store.put_bytes(bytes([i]) * 100, "png") for i in range(3)]
+    for days, blob in zip((3, 1, 2), blobs):
+        _age(blob, days)
+        store.link(blob, str(screenshots / os.path.basename(blob)))
+    store.max_bytes = 150
+
+    assert store.enforce_retention([str(screenshots)]) == {
+        "removed": 2, "unlinked": 2, "blobs": 1, "bytes": 100, "unreclaimed_bytes": 0,
+    }
+    assert os.path.exists(blobs[1])
+    assert os.listdir(screenshots) == [os.path.basename(blobs[1])]
+
+
+def test_retention_does_not_count_blobs_linked_elsewhere(store, tmp_path):
+    """存储对象在 linked_dirs 之外仍有链接时删除它不释放空间，继续淘汰直到大小真正低于上限"""
+    elsewhere = tmp_path / "copy.png"
+    first = store.put_bytes(b"a" * 100, "png")
+    second = store.put_bytes(b"b" * 100, "png")
+    os.link(first, elsewhere)
+    _age(first, 2)
+    _age(second, 1)
+    store.max_bytes = 150
+
+    assert store.enforce_retention() == {
+        "removed": 2, "unlinked": 0, "blobs": 0, "bytes": 0, "unreclaimed_bytes": 100,
+    }
+    assert elsewhere.read_bytes() == b"a" * 100
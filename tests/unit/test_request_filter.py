@@ -0,0 +1,55 @@
+import pytest
+from types import SimpleNamespace
+from config import config
+from utils.request_filter import BlockingProfile, RequestFilter, _site
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.baidu.com/s?wd=1", "baidu.com"),
+    ("https://hm.baidu.com/hm.js", "baidu.com"),
+    ("https://www.example.com.cn/", "example.com.cn"),
+    ("https://static.example.co.uk/a.css", "example.co.uk"),
+    ("https://other.co.uk/", "other.co.uk"),
+    ("http://127.0.0.1:8000/api", "127.0.0.1"),
+    ("http://[::1]:8000/", "::1"),
+    ("http://localhost:8000/", "localhost"),
+])
+def test_site(url, expected):
+    """一般取最后两段，常见多段公共后缀下取最后三段，IP 地址取完整地址"""
+    assert _site(url) == expected
+
+
+def test_site_distinguishes_sites_under_multi_label_suffix():
+    assert _site("https://a.com.cn/") != _site("https://b.com.cn/")
+
+
+def _request(url, resource_type="script", page_url="https://www.baidu.com/", navigation=False):
+    return SimpleNamespace(url=url, resource_type=resource_type,
+                           is_navigation_request=lambda: navigation,
+                           frame=SimpleNamespace(page=SimpleNamespace(url=page_url)))
+
+
+def test_block_reason():
+    """按资源类型、URL 通配符和第三方站点判断拦截原因"""
+    profile = BlockingProfile("text-only", resource_types=["image"], block_third_party=True,
+                              url_patterns=["*://hm.baidu.com/*"])
+    assert profile.block_reason(_request("https://www.baidu.com/logo.png", "image")) == "image"
+    assert profile.block_reason(_request("https://hm.baidu.com/hm.js")) == "url_pattern"
+    assert profile.block_reason(_request("https://cdn.example.com/a.js")) == "third_party"
+    assert profile.block_reason(_request("https://ss1.baidu.com/a.js")) is None
+    assert profile.block_reason(_request("https://cdn.example.com/", navigation=True)) is None
+
+
+def test_handle_counts_blocked_and_allowed():
+    request_filter = RequestFilter(config.TestConfig())
+    profile = request_filter.get_profile("no-media")
+    handled = []
+    for url, resource_type in [("https://a.com/a.png", "image"), ("https://a.com/", "document")]:
+        route = SimpleNamespace(request=_request(url, resource_type),
+                                abort=lambda reason: handled.append("abort"),
+                                fallback=lambda: handled.append("fallback"))
+        request_filter._handle(profile, route)
+    assert handled == ["abort", "fallback"]
+    assert request_filter.stats() == {"no-media": {"blocked": 1, "allowed": 1, "by_reason": {"image": 1}}}
+    with pytest.raises(ValueError, match="未知的资源拦截配置"):
+        request_filter.get_profile("everything")
@@ -0,0 +1,115 @@
+import contextvars
+import pytest
+from utils import retry as retry_module
+from utils.retry import RetryBudget, RetryEngine, RetryPolicy
+
+
+class Flaky:
+    """前 failures 次调用抛出异常"""
+
+    def __init__(self, failures, error=RuntimeError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("flaky")
+        return "ok"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """记录退避等待时间，不实际等待"""
+    recorded = []
+    monkeypatch.setattr(retry_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_backoff_is_exponential_and_capped():
+    """不抖动时按倍数增长，不超过 max_delay"""
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, multiplier=2.0, jitter=0)
+    assert [policy.backoff(i) for i in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_backoff_jitter_range(monkeypatch):
+    """抖动在 [delay * (1 - jitter), delay] 范围内"""
+    policy = RetryPolicy(base_delay=2.0, jitter=0.5)
+    monkeypatch.setattr(retry_module.random, "random", lambda: 1.0)
+    assert policy.backoff(0) == 1.0
+    monkeypatch.setattr(retry_module.random, "random", lambda: 0.0)
+    assert policy.backoff(0) == 2.0
+
+
+def test_is_retryable():
+    """give_up_on 优先于 retry_on"""
+    policy = RetryPolicy(retry_on=(RuntimeError,), give_up_on=(ValueError,))
+    assert policy.is_retryable(RuntimeError())
+    assert not policy.is_retryable(KeyError())
+    assert not policy.is_retryable(ValueError())
+
+
+def test_budget():
+    """预算为 None 时不限制，否则已花费加本次不能超过上限"""
+    budget = RetryBudget()
+    budget.start(None)
+    assert budget.allows(1e9)
+    budget.start(3.0)
+    budget.charge(2.0)
+    assert budget.allows(1.0)
+    assert not budget.allows(1.5)
+
+
+def test_call_retries_until_success(sleeps):
+    """失败后按退避时间等待并重试，统计重试次数和耗时"""
+    engine = RetryEngine()
+    engine.start_test(None)
+    func = Flaky(failures=2)
+    assert engine.call("click", func, RetryPolicy(attempts=3, base_delay=1.0, jitter=0)) == "ok"
+    assert sleeps == [1.0, 2.0]
+    stats = engine.test_stats.retried()["click"]
+    assert (stats["calls"], stats["retries"], stats["failures"]) == (1, 2, 0)
+    assert engine.budget.spent >= 3.0
+
+
+def test_call_gives_up_on_non_retryable_error(sleeps):
+    """不可重试的异常直接抛出"""
+    engine = RetryEngine()
+    engine.start_test(None)
+    func = Flaky(failures=1, error=ValueError)
+    with pytest.raises(ValueError):
+        engine.call("fill", func, RetryPolicy(give_up_on=(ValueError,)))
+    assert func.calls == 1
+    assert sleeps == []
+
+
+def test_call_stops_when_budget_exhausted(sleeps):
+    """剩余预算不足以完成下一次等待时不再重试，并计为失败"""
+    engine = RetryEngine()
+    engine.start_test(2.5)
+    func = Flaky(failures=5)
+    with pytest.raises(RuntimeError):
+        engine.call("click", func, RetryPolicy(attempts=5, base_delay=1.0, jitter=0))
+    # 第一次等待 1s，第二次等待 2s 会超出 2.5s 预算
+    assert sleeps == [1.0]
+    assert func.calls == 2
+    assert engine.test_stats.actions["click"]["failures"] == 1
+
+
+def test_isolate_uses_separate_budget(sleeps):
+    """isolate 后当前上下文使用独立的预算和统计，额度与当前测试相同"""
+    engine = RetryEngine()
+    engine.start_test(10.0)
+    engine._budget.charge(9.0)
+
+    def scenario():
+        stats = engine.isolate()
+        assert engine.budget is not engine._budget
+        assert engine.budget.limit == 10.0
+        assert engine.budget.allows(5.0)
+        return stats
+
+    stats = contextvars.copy_context().run(scenario)
+    assert stats is not engine.test_stats
+    assert engine.budget is engine._budget
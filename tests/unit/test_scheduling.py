@@ -0,0 +1,98 @@
+import pytest
+from utils.scheduling import DurationHistory, lpt_order, lpt_partition, makespan_report, parse_shard
+
+
+def test_lpt_partition_balances_groups():
+    """最长的测试先分配，每个测试分给当前负载最小的组"""
+    estimates = {"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+    groups, loads = lpt_partition(list(estimates), estimates, 2)
+    assert groups == [["a", "d"], ["b", "c", "e"]]
+    assert loads == [10.0, 10.0]
+
+
+def test_lpt_partition_keeps_order_for_equal_estimates():
+    """耗时相同的测试保持原有顺序"""
+    estimates = {"a": 1.0, "b": 1.0, "c": 1.0}
+    groups, loads = lpt_partition(["c", "a", "b"], estimates, 2)
+    assert groups == [["c", "b"], ["a"]]
+    assert loads == [2.0, 1.0]
+
+
+def test_lpt_partition_more_groups_than_tests():
+    """分组数多于测试数时多出的组为空"""
+    groups, loads = lpt_partition(["a"], {"a": 2.0}, 3)
+    assert groups == [["a"], [], []]
+    assert loads == [2.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("1/1", (1, 1)),
+    ("2/3", (2, 3)),
+])
+def test_parse_shard(value, expected):
+    """解析 i/n 格式的分片参数"""
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value, message", [
+    ("2", "分片参数格式应为 i/n"),
+    ("a/b", "分片参数格式应为 i/n"),
+    ("1/2/3", "分片参数格式应为 i/n"),
+    ("0/2", "分片序号超出范围"),
+    ("3/2", "分片序号超出范围"),
+    ("1/0", "分片序号超出范围"),
+])
+def test_parse_shard_invalid(value, message):
+    """格式错误或序号超出范围时抛出 ValueError"""
+    with pytest.raises(ValueError, match=message):
+        parse_shard(value)
+
+
+def test_duration_history_update_and_estimate(tmp_path):
+    """首次记录实际耗时，之后按指数移动平均更新；没有历史的测试按已知耗时的中位数估计"""
+    path = str(tmp_path / "durations.json")
+    DurationHistory(path).update({"a": 10.0, "b": 2.0, "c": 4.0})
+    DurationHistory(path).update({"a": 20.0})
+
+    history = DurationHistory(path)
+    assert history.entries["a"] == {"seconds": 13.0, "runs": 2}
+    assert history.estimate(["a", "new"]) == {"a": 13.0, "new": 4.0}
+
+
+def test_duration_history_merges_concurrent_writers(tmp_path):
+    """写入前重新读取文件，保留其他进程写入的记录"""
+    path = str(tmp_path / "durations.json")
+    first, second = DurationHistory(path), DurationHistory(path)
+    first.update({"a": 1.0})
+    second.update({"b": 2.0})
+    assert set(DurationHistory(path).entries) == {"a", "b"}
+
+
+def test_duration_history_unreadable_file(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text("{", encoding="utf-8")
+    history = DurationHistory(str(path))
+    assert history.entries == {}
+    assert history.estimate(["a"]) == {"a": 1.0}
+
+
+def test_lpt_order():
+    assert lpt_order(["a", "b", "c"], {"a": 1.0, "b": 3.0, "c": 1.0}) == ["b", "a", "c"]
+
+
+def test_makespan_report(tmp_path):
+    """按历史耗时预计完成时间，与各工作进程的实际负载比较"""
+    history = DurationHistory(str(tmp_path / "durations.json"))
+    history.update({"a": 4.0, "b": 2.0})
+    report = makespan_report({"a": ("gw0", 5.0), "b": ("gw1", 1.0), "c": ("gw1", 2.0)}, history, 6.5)
+    assert report == {
+        "tests": 3,
+        "workers": 2,
+        "predicted_makespan": 5.0,
+        "actual_makespan": 5.0,
+        "wall_seconds": 6.5,
+        "worker_loads": {"gw0": 5.0, "gw1": 3.0},
+        "unknown_tests": 1,
+    }
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import pytest
+from config import config
+from utils import report
+from utils.report import ScreenshotPipeline
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    def screenshot(self, **options):
+        self.page.calls.append((self.selector, options))
+        return b"element"
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def screenshot(self, full_page=False, **options):
+        self.calls.append(("page", dict(options, full_page=full_page)))
+        return b"page"
+
+
+class FakeAsyncPage(FakePage):
+    async def screenshot(self, full_page=False, **options):
+        return super().screenshot(full_page=full_page, **options)
+
+
+@pytest.fixture
+def attached(monkeypatch):
+    """记录附加到 Allure 的截图"""
+    recorded = []
+    monkeypatch.setattr(report.allure, "attach", lambda data, name, attachment_type: recorded.append((name, data)))
+    return recorded
+
+
+def test_capture_uses_configured_options(tmp_path, attached):
+    """按配置的格式、质量和范围截图，附加到 Allure 并在后台写入磁盘"""
+    pipeline = ScreenshotPipeline(str(tmp_path), image_type="jpeg", quality=50, scope="full_page")
+    page = FakePage()
+    assert pipeline.capture(page, "failure") == b"page"
+    pipeline.close()
+    options = page.calls[0][1]
+    assert (options["type"], options["quality"], options["full_page"]) == ("jpeg", 50, True)
+    assert attached == [("failure", b"page")]
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("failure_") and files[0].endswith(".jpg")
+    assert pipeline.stats()["written"] == 1
+
+
+def test_capture_clip_selector_and_png(tmp_path, attached):
+    """指定元素时只截取该元素，PNG 不带质量参数"""
+    pipeline = ScreenshotPipeline(str(tmp_path), image_type="png", save_to_disk=False, clip_selector="#main")
+    page = FakePage()
+    assert pipeline.capture(page, "main") == b"element"
+    assert page.calls[0][0] == "#main"
+    assert "quality" not in page.calls[0][1]
+    assert pipeline.writer is None
+
+
+def test_capture_async(tmp_path, attached):
+    pipeline = ScreenshotPipeline(str(tmp_path), save_to_disk=False)
+    assert asyncio.run(pipeline.capture_async(FakeAsyncPage(), "async")) == b"page"
+    assert attached == [("async", b"page")]
+
+
+def test_default_pipeline_is_created_lazily_from_config(tmp_path, monkeypatch, attached):
+    """默认流水线在第一次截图时按测试配置创建，关闭后下次使用时重新创建"""
+    monkeypatch.setattr(report, "_default_pipeline", None)
+    monkeypatch.setattr(report, "_default_pipeline_config", None)
+    report.configure_default_screenshot_pipeline(
+        config.TestConfig(screenshot_dir=str(tmp_path), screenshot_type="png", artifact_store_enabled=False))
+    assert report._default_pipeline is None
+    pipeline = report.default_screenshot_pipeline()
+    assert pipeline is report.default_screenshot_pipeline()
+    assert (pipeline.screenshot_dir, pipeline.image_type) == (str(tmp_path), "png")
+    report.close_default_screenshot_pipeline()
+    assert report._default_pipeline is None
+    assert not pipeline.writer._thread.is_alive()
@@ -0,0 +1,115 @@
+import contextvars
+import pytest
+from utils import step_recorder as step_module
+from utils.step_recorder import BUFFERED, FULL, TOP_LEVEL, StepRecorder
+
+
+class FakeStepContext:
+    """记录写入 Allure 的步骤，嵌套关系以缩进表示"""
+    events = []
+    depth = 0
+
+    def __init__(self, title, params):
+        self.title = title
+
+    def __enter__(self):
+        self.index = len(FakeStepContext.events)
+        FakeStepContext.events.append("  " * FakeStepContext.depth + self.title.split(" (")[0])
+        FakeStepContext.depth += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        FakeStepContext.depth -= 1
+        if exc_type is not None:
+            FakeStepContext.events[self.index] += " !"
+
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setattr(step_module, "StepContext", FakeStepContext)
+    FakeStepContext.events = []
+    FakeStepContext.depth = 0
+    return FakeStepContext.events
+
+
+def _recorder(mode):
+    recorder = StepRecorder()
+    recorder.configure(mode)
+    recorder.start_test()
+    return recorder
+
+
+def _search(recorder, fail=False):
+    """外层操作调用两个内部辅助步骤"""
+    def helper(name):
+        if fail and name == "click":
+            raise RuntimeError("not clickable")
+
+    def search(keyword):
+        recorder.run("fill {keyword}", lambda keyword: helper("fill"), (keyword,), {})
+        recorder.run("click", lambda: helper("click"), (), {})
+
+    recorder.run("search {keyword}", search, ("playwright",), {})
+
+
+def test_full_mode_records_every_step(events):
+    recorder = _recorder(FULL)
+    _search(recorder)
+    assert events == ["search 'playwright'", "  fill 'playwright'", "  click"]
+    assert recorder.stats()["steps"] == recorder.stats()["emitted"] == 3
+
+
+def test_top_level_mode_records_outermost_step(events):
+    recorder = _recorder(TOP_LEVEL)
+    _search(recorder)
+    assert events == ["search 'playwright'"]
+    assert recorder.stats()["emitted"] == 1
+
+
+def test_buffered_mode_writes_only_on_flush(events):
+    """buffered 模式下步骤先缓存，flush 时带着嵌套关系和异常写入"""
+    recorder = _recorder(BUFFERED)
+    with pytest.raises(RuntimeError):
+        _search(recorder, fail=True)
+    assert events == []
+    assert recorder.flush() == 1
+    assert events == ["search 'playwright' !", "  fill 'playwright'", "  click !"]
+    assert recorder.flush() == 0
+
+
+def test_flush_from_mark_with_title(events):
+    """从 mark 位置开始写入，指定标题时合并为一个步骤，之前的步骤保留在缓存中"""
+    recorder = _recorder(BUFFERED)
+    recorder.run("open", lambda: None, (), {})
+    mark = recorder.mark()
+    recorder.run("click", lambda: None, (), {})
+    assert recorder.flush(start=mark) == 1
+    assert events == ["click"]
+    assert recorder.flush(title="缓存的页面操作") == 1
+    assert events == ["click", "缓存的页面操作", "  open"]
+
+
+def test_start_test_discards_buffer(events):
+    recorder = _recorder(BUFFERED)
+    recorder.run("open", lambda: None, (), {})
+    recorder.start_test()
+    assert recorder.flush() == 0
+
+
+def test_isolate_and_replay(events):
+    """隔离的上下文只缓存步骤，由 replay 作为一个父步骤写入"""
+    recorder = _recorder(FULL)
+
+    def scenario():
+        steps = recorder.isolate()
+        recorder.run("open", lambda: None, (), {})
+        return steps
+
+    steps = contextvars.copy_context().run(scenario)
+    assert events == []
+    recorder.replay("scenario_a", steps, 0.1)
+    assert events == ["scenario_a", "  open"]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="未知的步骤记录模式"):
+        StepRecorder().configure("sampled")
@@ -0,0 +1,70 @@
+import os
+import pytest
+from utils.helpers import load_json_file
+from utils.test_data import DataCache, RecordIndex
+
+
+def test_data_cache_hits_and_invalidation(tmp_path):
+    """未修改的文件返回同一对象，文件改写后重新解析"""
+    path = tmp_path / "users.json"
+    path.write_text('{"name": "张三"}', encoding="utf-8")
+    cache = DataCache()
+    first = cache.load(str(path))
+    assert cache.load(str(path)) is first
+
+    path.write_text('{"name": "李四四"}', encoding="utf-8")
+    assert cache.load(str(path)) == {"name": "李四四"}
+    assert cache.stats() == {"files": 1, "bytes": path.stat().st_size, "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_data_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        path.write_text('{"v": 1}', encoding="utf-8")
+        paths.append(str(path))
+    cache = DataCache(max_bytes=os.path.getsize(paths[0]) * 2)
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert cache.stats()["evictions"] == 1
+    cache.load(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_load_json_file_returns_copy(tmp_path):
+    """load_json_file 返回副本，修改不影响缓存"""
+    path = tmp_path / "config.json"
+    path.write_text('{"items": [1]}', encoding="utf-8")
+    load_json_file(str(path))["items"].append(2)
+    assert load_json_file(str(path)) == {"items": [1]}
+
+
+def test_record_index_jsonl(tmp_path):
+    """JSONL 按序号随机读取，跳过空行"""
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"name": "张三"}\n\n{"name": "李四"}\n{"name": "王五"}', encoding="utf-8")
+    index = RecordIndex(str(path))
+    assert len(index) == 3
+    assert index.read(2) == {"name": "王五"}
+    assert index.read(0) == {"name": "张三"}
+    assert index.read(1) == {"name": "李四"}
+
+
+def test_record_index_csv(tmp_path):
+    """CSV 使用表头作为字段名，支持 BOM 和带引号的字段"""
+    path = tmp_path / "keywords.csv"
+    path.write_text('﻿keyword,expected\nplaywright,"Playwright, 测试"\n\npytest,pytest\n', encoding="utf-8")
+    index = RecordIndex(str(path))
+    assert len(index) == 2
+    assert index.read(1) == {"keyword": "pytest", "expected": "pytest"}
+    assert index.read(0) == {"keyword": "playwright", "expected": "Playwright, 测试"}
+
+
+def test_record_index_unsupported_format(tmp_path):
+    """只支持 JSONL/CSV"""
+    path = tmp_path / "users.json"
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError, match="只支持索引 JSONL/CSV 数据集"):
+        RecordIndex(str(path))
@@ -0,0 +1,51 @@
+import re
+from pages.base_page import BasePage, _TEXT_SEARCH_JS, _js_regex
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def evaluate_all(self, expression, arg=None):
+        self.page.evaluated.append((self.selector, expression, arg))
+        return self.page.found
+
+
+class FakePage:
+    """只记录 evaluate_all 调用的页面，返回预设的匹配结果"""
+
+    def __init__(self, found):
+        self.found = found
+        self.evaluated = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+def test_js_regex():
+    """re.Pattern 的 I/M/S 标志转换为 JavaScript 标志，不重复已指定的标志"""
+    assert _js_regex(r"\d+") == (r"\d+", "")
+    assert _js_regex(r"\d+", "g") == (r"\d+", "g")
+    assert _js_regex(re.compile("a.b", re.IGNORECASE | re.DOTALL)) == ("a.b", "is")
+    assert _js_regex(re.compile("^a", re.I | re.M), "i") == ("^a", "im")
+
+
+def test_find_text_runs_in_browser():
+    """查找在浏览器内执行，只传回匹配片段"""
+    page = FakePage(["... Playwright ..."])
+    assert BasePage(page).find_text("playwright", "#content", ignore_case=True, limit=5, context=10) == ["... Playwright ..."]
+    assert page.evaluated == [("#content", _TEXT_SEARCH_JS, ["text", "playwright", "i", 5, 10])]
+
+
+def test_has_text_stops_at_first_match():
+    """has_text 找到第一处即返回，不传回上下文"""
+    page = FakePage([])
+    assert BasePage(page).has_text("不存在") is False
+    assert page.evaluated == [("body", _TEXT_SEARCH_JS, ["text", "不存在", "", 1, 0])]
+
+
+def test_has_match_converts_pattern():
+    page = FakePage(["2024"])
+    assert BasePage(page).has_match(re.compile(r"\d{4}", re.I), ".result") is True
+    assert page.evaluated == [(".result", _TEXT_SEARCH_JS, ["regex", r"\d{4}", "i", 1, 0])]
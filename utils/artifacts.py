@@ -0,0 +1,129 @@
+import os
+import re
+import weakref
+import threading
+from typing import Dict, Any, Optional
+import allure
+from playwright.sync_api import BrowserContext, Page
+from .logger import Logger
+from .retry import retry_engine
+
+
+# 录像/追踪模式
+OFF = "off"
+ON = "on"
+RETAIN_ON_FAILURE = "retain-on-failure"
+
+_MODES = (OFF, ON, RETAIN_ON_FAILURE)
+
+
+def artifact_name(item) -> str:
+    """
+    根据测试 nodeid 生成可作为文件名的产物名称
+    :param item: pytest 测试项
+    """
+    return re.sub(r"[^\w.-]+", "_", item.nodeid)[-150:]
+
+
+def needs_evidence(item) -> bool:
+    """
+    判断测试是否需要保留失败证据：任一阶段失败、发生过操作重试或被重新执行
+    :param item: pytest 测试项
+    """
+    for when in ("setup", "call", "teardown"):
+        report = getattr(item, f"rep_{when}", None)
+        if report is not None and report.failed:
+            return True
+    if retry_engine.test_stats.retried():
+        return True
+    return getattr(item, "execution_count", 1) > 1
+
+
+class ArtifactRecorder:
+    """
+    录像和 Playwright 追踪的保留策略
+
+    retain-on-failure 模式下追踪按测试分块录制，只有失败或重试过的测试保存产物并附加到 Allure，
+    其余测试的录像在页面关闭后删除、追踪块直接丢弃。
+    """
+
+    def __init__(self, test_config):
+        for mode in (test_config.video_mode, test_config.trace_mode):
+            if mode not in _MODES:
+                raise ValueError(f"未知的产物保留模式: {mode}，可选值: {', '.join(_MODES)}")
+        self.video_mode = test_config.video_mode
+        self.trace_mode = test_config.trace_mode
+        self.trace_dir = test_config.trace_dir
+        self.video_dir = test_config.video_dir
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self._traced: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+        self.counts: Dict[str, int] = {}
+        if self.trace_mode != OFF:
+            os.makedirs(self.trace_dir, exist_ok=True)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _keep(self, mode: str, item) -> bool:
+        return mode == ON or (mode == RETAIN_ON_FAILURE and needs_evidence(item))
+
+    def start_trace(self, context: BrowserContext, item) -> None:
+        """
+        为当前测试开始一个追踪块，上下文首次使用时开启追踪
+        :param context: 浏览器上下文
+        :param item: pytest 测试项
+        """
+        if self.trace_mode == OFF:
+            return
+        if context not in self._traced:
+            context.tracing.start(screenshots=True, snapshots=True, sources=True)
+            self._traced.add(context)
+        context.tracing.start_chunk(title=item.nodeid)
+
+    def finish_trace(self, context: BrowserContext, item) -> Optional[str]:
+        """
+        结束追踪块，需要保留时写入 trace_dir 并附加到 Allure；必须在上下文关闭前调用
+        :param context: 浏览器上下文
+        :param item: pytest 测试项
+        :return: 保存的追踪文件路径
+        """
+        if self.trace_mode == OFF or context not in self._traced:
+            return None
+        if not self._keep(self.trace_mode, item):
+            context.tracing.stop_chunk()
+            self._count("traces_discarded")
+            return None
+        path = os.path.join(self.trace_dir, f"{artifact_name(item)}.zip")
+        context.tracing.stop_chunk(path=path)
+        allure.attach.file(path, name="trace", extension="zip")
+        self._count("traces_kept")
+        return path
+
+    def finish_video(self, page: Page, item) -> Optional[str]:
+        """
+        处理已关闭页面的录像：需要保留时附加到 Allure，否则删除
+        :param page: 已关闭的页面
+        :param item: pytest 测试项
+        :return: 保留的录像文件路径
+        """
+        if self.video_mode == OFF or page.video is None:
+            return None
+        if not self._keep(self.video_mode, item):
+            page.video.delete()
+            self._count("videos_discarded")
+            return None
+        # 连接浏览器服务时 video.path() 不可用，save_as 在本地和远程连接下都会把录像写到本地
+        path = os.path.join(self.video_dir, f"{artifact_name(item)}.webm")
+        os.makedirs(self.video_dir, exist_ok=True)
+        page.video.save_as(path)
+        page.video.delete()
+        allure.attach.file(path, name="video", attachment_type=allure.attachment_type.WEBM)
+        self._count("videos_kept")
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        """获取产物保留/丢弃统计"""
+        with self._lock:
+            return dict(self.counts)
@@ -0,0 +1,80 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+from playwright.async_api import Browser, Page
+from .logger import Logger
+from .retry import RetryStats, retry_engine
+from .step_recorder import BUFFERED, BufferedStep, step_recorder
+
+
+class ScenarioResult:
+    """单个异步场景的执行结果"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.passed = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.duration = 0.0
+        self.steps: List[BufferedStep] = []
+        self.retry_stats = RetryStats()
+
+    def __repr__(self) -> str:
+        status = "passed" if self.passed else f"failed: {self.error!r}"
+        return f"<ScenarioResult {self.name} {status} {self.duration:.2f}s>"
+
+
+async def _run_one(browser: Browser, scenario: Callable[[Page], Awaitable[Any]], test_config,
+                   semaphore: asyncio.Semaphore) -> ScenarioResult:
+    """
+    在独立的浏览器上下文中执行一个场景；gather 为每个场景创建独立的任务（复制执行上下文），
+    步骤记录和重试预算在任务内隔离，不会与其他场景交错
+    """
+    result = ScenarioResult(getattr(scenario, "__name__", repr(scenario)))
+    result.steps = step_recorder.isolate()
+    result.retry_stats = retry_engine.isolate()
+    async with semaphore:
+        start = time.perf_counter()
+        context = await browser.new_context(**test_config.get_context_options())
+        context.set_default_timeout(test_config.timeout)
+        context.set_default_navigation_timeout(test_config.navigation_timeout)
+        try:
+            page = await context.new_page()
+            result.result = await scenario(page)
+            result.passed = True
+        except Exception as e:
+            result.error = e
+        finally:
+            await context.close()
+            result.duration = time.perf_counter() - start
+    return result
+
+
+async def run_scenarios(browser: Browser, scenarios: Sequence[Callable[[Page], Awaitable[Any]]],
+                        test_config, concurrency: Optional[int] = None) -> List[ScenarioResult]:
+    """
+    在同一个事件循环中并发执行多个相互独立的场景，每个场景拥有独立的上下文和页面。
+    各场景的步骤在全部完成后按场景顺序写入 Allure，重试统计合并到当前测试。
+    场景使用普通的浏览器上下文：不经过上下文池，也不应用 HAR 回放、资源拦截、录像/追踪保留策略和登录状态缓存
+    :param browser: 异步浏览器实例
+    :param scenarios: 以页面为参数的异步场景函数列表
+    :param test_config: TestConfig 实例
+    :param concurrency: 最大并发数，默认使用 TestConfig.async_concurrency
+    :return: 与 scenarios 顺序一致的执行结果
+    """
+    semaphore = asyncio.Semaphore(concurrency or test_config.async_concurrency)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run_one(browser, scenario, test_config, semaphore) for scenario in scenarios)
+    )
+    for result in results:
+        # buffered 模式下只写入失败场景的步骤
+        if step_recorder.mode != BUFFERED or not result.passed:
+            step_recorder.replay(result.name, result.steps, result.duration, result.error)
+        retry_engine.test_stats.merge(result.retry_stats)
+    failed = sum(1 for result in results if not result.passed)
+    Logger.get_logger().info(
+        f"并发执行 {len(results)} 个场景, 失败 {failed} 个, 总耗时 {time.perf_counter() - start:.2f}s, "
+        f"串行耗时合计 {sum(result.duration for result in results):.2f}s"
+    )
+    return list(results)
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+from playwright.sync_api import Browser, BrowserContext, Page
+from .helpers import file_lock
+from .logger import Logger
+
+# Cookie 剩余有效期不足该时间（秒）时视为已过期，避免测试执行到一半登录失效
+_EXPIRY_MARGIN = 60
+
+
+def _mtime(path: str) -> Optional[int]:
+    """状态文件的修改时间（纳秒），文件不存在时返回 None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class AuthRole:
+    """
+    登录角色
+    :param name: 角色名称
+    :param login: 登录函数 login(page, env)，在新页面中完成登录
+    :param validate: 校验函数 validate(context) -> bool，在带有缓存登录状态的上下文中检查登录是否仍然有效，None 表示只检查过期时间
+    """
+
+    def __init__(self, name: str, login: Callable[[Page, str], None],
+                 validate: Optional[Callable[[BrowserContext], bool]] = None):
+        self.name = name
+        self.login = login
+        self.validate = validate
+
+
+class AuthStateCache:
+    """
+    按角色和环境缓存登录后的存储状态（cookies 和 localStorage）
+
+    每个角色在每个环境只登录一次，状态文件在 TTL 内、cookies 未过期且通过校验时直接注入新上下文；
+    刷新时持有按角色的文件锁，多个 xdist 工作进程同时需要同一角色时只有一个进程登录，其余进程等待后读取。
+    """
+
+    def __init__(self):
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self._roles: Dict[str, AuthRole] = {}
+        # 当前进程已确认有效的状态文件：{路径: 失效时间}
+        self._valid: Dict[str, float] = {}
+        self.state_dir = ".pytest_cache/pobdd/auth"
+        self.ttl = 3600
+        self.env = "test"
+        self.context_options: Dict[str, Any] = {}
+        self.logins = 0
+        self.disk_hits = 0
+        self.memory_hits = 0
+        self.invalidated = 0
+        self.login_seconds = 0.0
+
+    def configure(self, test_config) -> None:
+        """
+        从测试配置读取状态目录、有效期、环境和登录时使用的上下文选项
+        :param test_config: 测试配置
+        """
+        self.state_dir = test_config.auth_state_dir
+        self.ttl = test_config.auth_state_ttl
+        self.env = test_config.env
+        self.context_options = test_config.get_context_options()
+        # 登录上下文不需要录像
+        self.context_options["record_video_dir"] = None
+
+    def role(self, name: str, validate: Optional[Callable[[BrowserContext], bool]] = None):
+        """
+        注册角色登录函数的装饰器
+        :param name: 角色名称，测试通过 @auth:<名称> 标签或 pytest.mark.auth(名称) 声明
+        :param validate: 登录状态校验函数
+        """
+        def decorator(login: Callable[[Page, str], None]):
+            self._roles[name] = AuthRole(name, login, validate)
+            return login
+        return decorator
+
+    def state_path(self, role: str) -> str:
+        """角色在当前环境的状态文件路径"""
+        return os.path.join(self.state_dir, self.env, f"{role}.json")
+
+    def get_state(self, browser: Browser, role: str) -> str:
+        """
+        获取角色的有效登录状态文件，必要时登录并保存
+        :param browser: 用于登录和校验的浏览器
+        :param role: 角色名称
+        :return: 状态文件路径，可作为上下文选项 storage_state
+        """
+        if role not in self._roles:
+            raise ValueError(f"未注册的登录角色: {role}，已注册: {', '.join(self._roles) or '无'}")
+        path = self.state_path(role)
+        with self._lock:
+            if self._valid.get(path, 0) > time.time():
+                self.memory_hits += 1
+                return path
+        checked = _mtime(path)
+        if self._usable(browser, role, path):
+            self.disk_hits += 1
+            return path
+        with file_lock(f"{path}.lock", timeout=300):
+            # 等待锁期间其他进程可能已完成登录；文件未变化时不再重复检查和校验
+            if _mtime(path) != checked and self._usable(browser, role, path):
+                self.disk_hits += 1
+                return path
+            self._login(browser, role, path)
+        return path
+
+    def _expires_at(self, path: str) -> Optional[float]:
+        """
+        状态文件的失效时间：保存时间加 TTL 与各 cookie 过期时间（留出余量）中最早的一个
+        :return: 失效时间戳，文件不存在或无法解析时返回 None
+        """
+        try:
+            expires_at = os.path.getmtime(path) + self.ttl
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        for cookie in state.get("cookies", []):
+            if cookie.get("expires", -1) > 0:
+                expires_at = min(expires_at, cookie["expires"] - _EXPIRY_MARGIN)
+        return expires_at
+
+    def _usable(self, browser: Browser, role: str, path: str) -> bool:
+        """状态文件是否存在、未超过有效期、cookies 未过期且通过角色校验"""
+        expires_at = self._expires_at(path)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self.invalidated += 1
+            return False
+        validate = self._roles[role].validate
+        if validate is not None:
+            context = browser.new_context(**self.context_options, storage_state=path)
+            try:
+                valid = validate(context)
+            finally:
+                context.close()
+            if not valid:
+                self.invalidated += 1
+                self.logger.info(f"角色 {role} 的登录状态已失效，重新登录")
+                return False
+        with self._lock:
+            self._valid[path] = expires_at
+        return True
+
+    def _login(self, browser: Browser, role: str, path: str) -> None:
+        """登录并原子写入状态文件"""
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        context = browser.new_context(**self.context_options)
+        try:
+            page = context.new_page()
+            self._roles[role].login(page, self.env)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.logins += 1
+            self.login_seconds += elapsed
+            self._valid[path] = self._expires_at(path) or 0
+        self.logger.info(f"角色 {role} 已登录（{self.env} 环境），耗时 {elapsed:.2f}s，状态保存到 {path}")
+
+    def invalidate(self, role: str) -> None:
+        """
+        删除角色的登录状态，例如测试发现登录已被服务端注销时调用
+        :param role: 角色名称
+        """
+        path = self.state_path(role)
+        with self._lock:
+            self._valid.pop(path, None)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """获取登录次数和状态复用统计"""
+        with self._lock:
+            return {
+                "logins": self.logins,
+                "disk_hits": self.disk_hits,
+                "memory_hits": self.memory_hits,
+                "invalidated": self.invalidated,
+                "login_seconds": round(self.login_seconds, 3),
+            }
+
+
+# 全局登录状态缓存
+auth_states = AuthStateCache()
@@ -0,0 +1,40 @@
+import os
+from typing import Any, Optional
+
+
+def get_scenario_template(item) -> Optional[Any]:
+    """
+    获取 pytest-bdd 测试项对应的场景模板
+    :param item: pytest 测试项
+    :return: 场景模板，非 BDD 测试返回 None
+    """
+    function = getattr(item, "obj", None)
+    try:
+        from pytest_bdd.scenario import scenario_wrapper_template_registry
+        template = scenario_wrapper_template_registry.get(function)
+        if template is not None:
+            return template
+    except ImportError:
+        pass
+    # 旧版本 pytest-bdd 将场景挂在测试函数上
+    return getattr(function, "__scenario__", None)
+
+
+def get_feature_file(item) -> Optional[str]:
+    """
+    获取测试项所属的 feature 文件路径
+    :param item: pytest 测试项
+    :return: feature 文件绝对路径，非 BDD 测试返回 None
+    """
+    template = get_scenario_template(item)
+    return template.feature.filename if template is not None else None
+
+
+def get_feature_key(item) -> str:
+    """
+    获取测试项所属功能的标识，BDD 测试为 feature 文件名，其他测试为模块名
+    :param item: pytest 测试项
+    :return: 不含扩展名的文件名
+    """
+    path = get_feature_file(item) or str(item.fspath)
+    return os.path.splitext(os.path.basename(path))[0]
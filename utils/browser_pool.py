@@ -0,0 +1,176 @@
+import os
+import re
+import time
+import itertools
+from typing import Dict, Any, List, Optional
+from playwright.sync_api import Playwright, Browser
+from .logger import Logger
+from .browser_server import BrowserServer
+
+# Playwright 支持的浏览器引擎
+BROWSER_ENGINES = ("chromium", "firefox", "webkit")
+
+
+def get_worker_id() -> str:
+    """
+    获取当前 pytest-xdist 工作进程ID
+    :return: 工作进程ID，非并行运行时返回 "master"
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+class BrowserPool:
+    """
+    按工作进程划分的浏览器池
+
+    每个 xdist 工作进程持有自己的浏览器池，池内浏览器数量由
+    TestConfig.browsers_per_worker 决定，按轮询方式分配给各个测试。
+    启用 browser_server_enabled 时连接本工作进程的常驻浏览器服务而不是启动浏览器，连接失败时退回到直接启动；
+    池内的多个浏览器连接同一个服务进程。通过 websocket 连接时产物（录像、追踪、HAR）由客户端保存到本地。
+    :param browser_type: 浏览器引擎，None 表示使用 TestConfig.browser_type
+    """
+
+    def __init__(self, playwright: Playwright, test_config, browser_type: Optional[str] = None):
+        self.playwright = playwright
+        self.test_config = test_config
+        self.browser_type = browser_type or test_config.browser_type
+        self.worker_id = get_worker_id()
+        self.logger = Logger.get_logger()
+        self._browsers: List[Browser] = []
+        self._cycle = None
+        self.server = (BrowserServer(test_config, self.browser_type, self.worker_id)
+                       if test_config.browser_server_enabled else None)
+        self.launch_times: List[float] = []
+        self.teardown_times: List[float] = []
+        self.connected = 0
+
+    def start(self) -> "BrowserPool":
+        """启动池内所有浏览器"""
+        size = max(1, self.test_config.browsers_per_worker)
+        for _ in range(size):
+            self._browsers.append(self._launch())
+        self._cycle = itertools.cycle(range(size))
+        self.logger.info(
+            f"[{self.worker_id}] 浏览器池已启动: {size} 个 {self.browser_type} 实例, "
+            f"启动耗时 {sum(self.launch_times):.2f}s"
+        )
+        return self
+
+    def _launch(self) -> Browser:
+        """启动单个浏览器（或连接浏览器服务）并记录耗时"""
+        browser_type = getattr(self.playwright, self.browser_type)
+        start = time.perf_counter()
+        browser = self._connect(browser_type) if self.server is not None else None
+        if browser is None:
+            browser = browser_type.launch(**self.test_config.get_browser_launch_options())
+        self.launch_times.append(time.perf_counter() - start)
+        return browser
+
+    def _connect(self, browser_type) -> Optional[Browser]:
+        """连接本地浏览器服务，服务不健康时由 BrowserServer 重启；失败时返回 None"""
+        try:
+            endpoint = self.server.ensure()
+            browser = browser_type.connect(endpoint, slow_mo=self.test_config.slow_mo)
+        except Exception as e:
+            self.logger.warning(f"[{self.worker_id}] 连接浏览器服务失败，改为直接启动浏览器: {str(e)}")
+            return None
+        self.connected += 1
+        return browser
+
+    def acquire(self) -> Browser:
+        """
+        按轮询方式获取一个浏览器，已断开的浏览器会被重新启动
+        :return: 浏览器实例
+        """
+        if not self._browsers:
+            self.start()
+        index = next(self._cycle)
+        browser = self._browsers[index]
+        if not browser.is_connected():
+            self.logger.warning(f"[{self.worker_id}] 浏览器 #{index} 已断开，重新启动")
+            browser = self._browsers[index] = self._launch()
+        return browser
+
+    def close(self) -> None:
+        """关闭池内所有浏览器"""
+        for browser in self._browsers:
+            start = time.perf_counter()
+            try:
+                browser.close()
+            except Exception as e:
+                self.logger.warning(f"[{self.worker_id}] 关闭浏览器失败: {str(e)}")
+            self.teardown_times.append(time.perf_counter() - start)
+        self._browsers = []
+        self.logger.info(f"[{self.worker_id}] 浏览器池已关闭: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取浏览器池启动和关闭耗时统计
+        :return: 统计信息字典
+        """
+        return {
+            "worker": self.worker_id,
+            "browser_type": self.browser_type,
+            "size": max(1, self.test_config.browsers_per_worker),
+            "launches": len(self.launch_times),
+            "server_connections": self.connected,
+            "launch_seconds": round(sum(self.launch_times), 3),
+            "max_launch_seconds": round(max(self.launch_times, default=0.0), 3),
+            "teardown_seconds": round(sum(self.teardown_times), 3),
+        }
+
+
+class BrowserPools:
+    """
+    当前工作进程各浏览器引擎的浏览器池，多浏览器矩阵模式下每个引擎一个池，首次使用时启动
+    """
+
+    def __init__(self, playwright: Playwright, test_config):
+        self.playwright = playwright
+        self.test_config = test_config
+        self._pools: Dict[str, BrowserPool] = {}
+
+    def get(self, browser_type: str) -> BrowserPool:
+        """
+        获取引擎的浏览器池，未启动时启动
+        :param browser_type: 浏览器引擎
+        """
+        pool = self._pools.get(browser_type)
+        if pool is None:
+            pool = self._pools[browser_type] = BrowserPool(self.playwright, self.test_config, browser_type).start()
+        return pool
+
+    def close(self) -> None:
+        """关闭所有浏览器池"""
+        for pool in self._pools.values():
+            pool.close()
+        self._pools = {}
+
+
+def matrix_report(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    汇总多浏览器矩阵的运行结果
+    :param results: {nodeid: {"browser": 引擎, "outcome": passed/failed/skipped, "duration": 秒}}
+    :return: 各引擎的测试数、失败数和耗时，以及只在部分引擎上失败的测试
+    """
+    engines: Dict[str, Dict[str, Any]] = {}
+    outcomes: Dict[str, Dict[str, str]] = {}
+    for test_id, result in results.items():
+        browser = result["browser"]
+        stats = engines.setdefault(browser, {"tests": 0, "passed": 0, "failed": 0, "skipped": 0, "duration": 0.0})
+        stats["tests"] += 1
+        stats[result["outcome"]] += 1
+        stats["duration"] += result["duration"]
+        # 去掉 --dist loadgroup 追加的 @分组 后缀和参数 ID 中的引擎部分，得到跨引擎的同一个测试
+        key = re.sub(r"(?<=\])@[^\[\]]*$", "", test_id)
+        key = key.replace(f"[{browser}]", "").replace(f"-{browser}]", "]").replace(f"[{browser}-", "[")
+        outcomes.setdefault(key, {})[browser] = result["outcome"]
+    for stats in engines.values():
+        stats["duration"] = round(stats["duration"], 3)
+    failed_only_on: Dict[str, List[str]] = {}
+    for key, by_browser in sorted(outcomes.items()):
+        failed = [browser for browser, outcome in by_browser.items() if outcome == "failed"]
+        if failed and len(failed) < len(by_browser):
+            for browser in failed:
+                failed_only_on.setdefault(browser, []).append(key)
+    return {"engines": dict(sorted(engines.items())), "failed_only_on": failed_only_on}
@@ -0,0 +1,254 @@
+"""
+本地常驻浏览器服务
+
+用 Playwright 驱动的 launch-server 命令在独立进程组中启动浏览器，pytest 进程通过本地 websocket 连接，
+不再各自启动浏览器。服务在 pytest 退出后继续运行，供后续运行复用。
+每个 xdist 工作进程（gw0、gw1...，非并行运行时为 master）使用自己的服务，服务崩溃只影响该工作进程正在执行的测试，
+下一次获取浏览器时自动重启。
+
+用法:
+    python -m utils.browser_server start [--browser chromium] [--worker master]
+    python -m utils.browser_server status [--worker master]
+    python -m utils.browser_server stop [--worker gw0]   # 不指定 --worker 时停止该引擎的全部服务
+"""
+import os
+import sys
+import json
+import time
+import glob
+import signal
+import socket
+import hashlib
+import argparse
+import subprocess
+from importlib.metadata import version
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+from .helpers import file_lock
+from .logger import Logger
+
+# 服务启动后输出 websocket 地址的超时时间（秒）
+_START_TIMEOUT = 30.0
+
+# 健康检查连接超时时间（秒）
+_HEALTH_TIMEOUT = 1.0
+
+
+def _pid_alive(pid: int) -> bool:
+    # 由当前进程启动后崩溃的服务是僵尸进程，先回收
+    try:
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _port_open(ws_endpoint: str) -> bool:
+    url = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((url.hostname, url.port), timeout=_HEALTH_TIMEOUT):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    """
+    单个工作进程使用的某个浏览器引擎的常驻服务，
+    状态（进程ID、websocket 地址、启动选项摘要）保存在 state_dir/<引擎>-<工作进程ID>.json
+    :param test_config: 测试配置，启动选项来自 get_browser_launch_options
+    :param browser_type: 浏览器引擎，None 表示使用 TestConfig.browser_type
+    :param worker_id: 使用该服务的 xdist 工作进程ID
+    """
+
+    def __init__(self, test_config, browser_type: Optional[str] = None, worker_id: str = "master"):
+        self.test_config = test_config
+        self.browser_type = browser_type or test_config.browser_type
+        self.worker_id = worker_id
+        self.name = f"{self.browser_type}-{worker_id}"
+        self.state_dir = test_config.browser_server_dir
+        self.state_path = os.path.join(self.state_dir, f"{self.name}.json")
+        self.logger = Logger.get_logger()
+
+    @staticmethod
+    def worker_ids(test_config, browser_type: str) -> List[str]:
+        """
+        已有状态文件的工作进程ID
+        :param test_config: 测试配置
+        :param browser_type: 浏览器引擎
+        """
+        prefix = os.path.join(test_config.browser_server_dir, f"{browser_type}-")
+        return sorted(path[len(prefix):-len(".json")] for path in glob.glob(f"{glob.escape(prefix)}*.json")
+                      if not path.endswith(".config.json"))
+
+    def launch_config(self) -> Dict[str, Any]:
+        """launch-server 的配置（camelCase 的 launchServer 选项），slow_mo 由客户端连接时指定"""
+        options = self.test_config.get_browser_launch_options()
+        return {"headless": options["headless"], "args": options["args"], "host": "127.0.0.1", "port": 0}
+
+    def options_digest(self) -> str:
+        """启动选项和 Playwright 版本的摘要，任一变化时需要重启服务"""
+        payload = json.dumps([self.browser_type, version("playwright"), self.launch_config()], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def read_state(self) -> Optional[Dict[str, Any]]:
+        """读取服务状态文件，不存在或无法解析时返回 None"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def status(self) -> Optional[Dict[str, Any]]:
+        """
+        健康检查：进程存活、端口可连接且启动选项未变化
+        :return: 健康时返回服务状态，否则返回 None
+        """
+        state = self.read_state()
+        if state is None:
+            return None
+        if state.get("digest") != self.options_digest():
+            return None
+        if not _pid_alive(state["pid"]) or not _port_open(state["ws_endpoint"]):
+            return None
+        return state
+
+    def start(self) -> Dict[str, Any]:
+        """
+        在新的进程组中启动服务，等待其输出 websocket 地址
+        :return: 服务状态
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        config_path = os.path.join(self.state_dir, f"{self.name}.config.json")
+        log_path = os.path.join(self.state_dir, f"{self.name}.log")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(self.launch_config(), f)
+        start = time.perf_counter()
+        with open(log_path, "w", encoding="utf-8") as log:
+            # 输出写入文件而不是管道，pytest 退出后服务不会因管道关闭而退出；独立进程组不接收终端的中断信号
+            process = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "launch-server",
+                 "--browser", self.browser_type, "--config", config_path],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+            )
+        ws_endpoint = self._wait_for_endpoint(process, log_path)
+        state = {
+            "pid": process.pid,
+            "ws_endpoint": ws_endpoint,
+            "browser": self.browser_type,
+            "digest": self.options_digest(),
+            "started_at": time.time(),
+        }
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        self.logger.info(
+            f"浏览器服务已启动: {self.name} pid={process.pid} {ws_endpoint}, "
+            f"耗时 {time.perf_counter() - start:.2f}s"
+        )
+        return state
+
+    def _wait_for_endpoint(self, process: subprocess.Popen, log_path: str) -> str:
+        deadline = time.monotonic() + _START_TIMEOUT
+        while time.monotonic() < deadline:
+            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if line.startswith("ws://"):
+                        return line.strip()
+            if process.poll() is not None:
+                with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                    output = f.read().strip()
+                raise RuntimeError(f"浏览器服务启动失败（退出码 {process.returncode}）: {output[-2000:]}")
+            time.sleep(0.05)
+        self._kill(process.pid)
+        raise TimeoutError(f"浏览器服务 {_START_TIMEOUT}s 内未输出 websocket 地址，日志: {log_path}")
+
+    def stop(self) -> bool:
+        """
+        停止服务并删除状态文件
+        :return: 是否有正在运行的服务被停止
+        """
+        state = self.read_state()
+        stopped = False
+        if state is not None and _pid_alive(state["pid"]):
+            self._kill(state["pid"])
+            stopped = True
+        try:
+            os.unlink(self.state_path)
+        except FileNotFoundError:
+            pass
+        return stopped
+
+    def _kill(self, pid: int) -> None:
+        """结束服务所在的进程组（包括浏览器子进程）"""
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            return
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and _pid_alive(pid):
+            time.sleep(0.05)
+        if _pid_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def ensure(self) -> str:
+        """
+        获取健康的服务地址，服务不存在、已崩溃或启动选项变化时（重新）启动；
+        多个 xdist 工作进程同时调用时只有一个进程启动服务
+        :return: websocket 地址
+        """
+        state = self.status()
+        if state is not None:
+            return state["ws_endpoint"]
+        with file_lock(f"{self.state_path}.lock", timeout=_START_TIMEOUT * 2):
+            state = self.status()
+            if state is None:
+                if self.read_state() is not None:
+                    self.logger.warning(f"浏览器服务 {self.name} 不健康或启动选项已变化，重新启动")
+                    self.stop()
+                state = self.start()
+        return state["ws_endpoint"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="管理本地常驻浏览器服务")
+    parser.add_argument("command", choices=["start", "stop", "restart", "status"])
+    parser.add_argument("--browser", default=None, help="浏览器引擎，默认使用 TestConfig.browser_type")
+    parser.add_argument("--worker", default=None,
+                        help="工作进程ID（master、gw0...），start/status 默认 master，stop 默认该引擎的全部服务")
+    args = parser.parse_args()
+
+    from config.config import TestConfig
+    test_config = TestConfig()
+    browser_type = args.browser or test_config.browser_type
+    if args.command in ("stop", "restart"):
+        workers = [args.worker] if args.worker else BrowserServer.worker_ids(test_config, browser_type)
+        for worker_id in workers:
+            server = BrowserServer(test_config, browser_type, worker_id)
+            print(f"{server.name}: {'已停止' if server.stop() else '未运行'}")
+    server = BrowserServer(test_config, browser_type, args.worker or "master")
+    if args.command in ("start", "restart"):
+        print(f"{server.name}: {server.ensure()}")
+    if args.command == "status":
+        state = server.status()
+        if state is None:
+            print(f"{server.name}: 未运行或不健康")
+            return 1
+        print(f"{server.name}: pid={state['pid']} {state['ws_endpoint']}, "
+              f"已运行 {time.time() - state['started_at']:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import json
+import time
+from typing import Dict, Any, List
+from playwright.sync_api import Browser, BrowserContext
+from .logger import Logger
+
+
+class PooledContext:
+    """池中的浏览器上下文及其使用记录"""
+
+    def __init__(self, context: BrowserContext, key: str):
+        self.context = context
+        self.key = key
+        self.uses = 0
+
+
+class ContextPool:
+    """
+    浏览器上下文池
+
+    上下文在测试之间复用，归还时清理 cookies、存储、权限、路由和已打开的页面，
+    使用次数达到 TestConfig.context_max_uses 后关闭并重新创建。
+    """
+
+    def __init__(self, test_config):
+        self.test_config = test_config
+        self.logger = Logger.get_logger()
+        self._idle: Dict[str, List[PooledContext]] = {}
+        self._in_use: Dict[int, PooledContext] = {}
+        self.created = 0
+        self.reused = 0
+        self.retired = 0
+        self.reset_seconds = 0.0
+
+    @staticmethod
+    def _make_key(browser: Browser, options: Dict[str, Any]) -> str:
+        """按浏览器实例和上下文选项生成池键"""
+        return f"{id(browser)}:{json.dumps(options, sort_keys=True, default=str)}"
+
+    def acquire(self, browser: Browser, options: Dict[str, Any]) -> BrowserContext:
+        """
+        获取一个可用的上下文，没有空闲上下文时新建
+        :param browser: 浏览器实例
+        :param options: 上下文选项
+        :return: 浏览器上下文
+        """
+        key = self._make_key(browser, options)
+        idle = self._idle.setdefault(key, [])
+        if idle:
+            pooled = idle.pop()
+            self.reused += 1
+        else:
+            pooled = PooledContext(browser.new_context(**options), key)
+            self.created += 1
+        pooled.uses += 1
+        pooled.context.set_default_timeout(self.test_config.timeout)
+        pooled.context.set_default_navigation_timeout(self.test_config.navigation_timeout)
+        self._in_use[id(pooled.context)] = pooled
+        return pooled.context
+
+    def release(self, context: BrowserContext, reusable: bool = True) -> None:
+        """
+        归还上下文，重置后放回池中，或在达到使用上限/不可复用时关闭
+        :param context: 浏览器上下文
+        :param reusable: 是否允许复用，例如测试失败时传入 False
+        """
+        pooled = self._in_use.pop(id(context), None)
+        if pooled is None:
+            context.close()
+            return
+        if not reusable or pooled.uses >= self.test_config.context_max_uses:
+            self._retire(pooled)
+            return
+        start = time.perf_counter()
+        try:
+            self._reset(pooled.context)
+        except Exception as e:
+            self.logger.warning(f"重置浏览器上下文失败，将其关闭: {str(e)}")
+            self._retire(pooled)
+            return
+        finally:
+            self.reset_seconds += time.perf_counter() - start
+        self._idle[pooled.key].append(pooled)
+
+    def _reset(self, context: BrowserContext) -> None:
+        """
+        清理上下文中上一个测试留下的状态
+        页面在归还前已由 page fixture 关闭，sessionStorage 随页面销毁；cookies、所有源的 localStorage 和 IndexedDB
+        通过设置空的存储状态清理，不依赖仍然打开的页面
+        """
+        for page in list(context.pages):
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.set_storage_state({"cookies": [], "origins": []})
+        context.clear_permissions()
+        context.set_extra_http_headers({})
+        context.set_offline(False)
+
+    def _retire(self, pooled: PooledContext) -> None:
+        """关闭并淘汰上下文"""
+        self.retired += 1
+        try:
+            pooled.context.close()
+        except Exception as e:
+            self.logger.warning(f"关闭浏览器上下文失败: {str(e)}")
+
+    def close(self) -> None:
+        """关闭池中所有上下文"""
+        for pooled in list(self._in_use.values()):
+            self._retire(pooled)
+        for idle in self._idle.values():
+            for pooled in idle:
+                self._retire(pooled)
+        self._in_use = {}
+        self._idle = {}
+        self.logger.info(f"浏览器上下文池已关闭: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取上下文池统计
+        :return: 统计信息字典
+        """
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "retired": self.retired,
+            "reset_seconds": round(self.reset_seconds, 3),
+        }
@@ -0,0 +1,134 @@
+import os
+import glob
+import json
+import functools
+import threading
+from typing import Dict, Any, Optional
+from .logger import Logger
+
+
+class DriverCallCounter:
+    """
+    统计发送给 Playwright 驱动的协议调用次数
+
+    通过包装 Connection._send_message_to_server（Playwright 内部接口）计数，
+    同步和异步 API 的所有调用都经过这里；接口不存在时只记录警告，不影响测试执行。
+    不需要回复的消息（如等待信息）不计入。
+    """
+
+    def __init__(self):
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self.installed = False
+        self.test_calls: Dict[str, int] = {}
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    def install(self) -> bool:
+        """
+        安装计数钩子，重复调用无副作用
+        :return: 是否安装成功
+        """
+        if self.installed:
+            return True
+        try:
+            from playwright._impl._connection import Connection
+            original = Connection._send_message_to_server
+        except (ImportError, AttributeError) as e:
+            self.logger.warning(f"当前 Playwright 版本不支持驱动调用计数: {e}")
+            return False
+
+        counter = self
+
+        @functools.wraps(original)
+        def send_message_to_server(connection, *args, **kwargs):
+            try:
+                counter._count_message(args, kwargs)
+            except Exception:
+                # 计数失败不影响消息发送
+                pass
+            return original(connection, *args, **kwargs)
+
+        Connection._send_message_to_server = send_message_to_server
+        self.installed = True
+        return True
+
+    def _count_message(self, args: tuple, kwargs: dict) -> None:
+        """
+        按 (object, method, params, timeout, no_reply) 读取参数计数，参数按位置或关键字传入均可，
+        不按固定签名转发，Playwright 调整参数时不影响消息发送
+        """
+        names = ("object", "method", "params", "timeout", "no_reply")
+        values = dict(zip(names, args))
+        values.update(kwargs)
+        if values.get("no_reply"):
+            return
+        method = values.get("method")
+        if method is None:
+            return
+        self._count(f"{getattr(values.get('object'), '_type', 'Unknown')}.{method}")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.test_calls[key] = self.test_calls.get(key, 0) + 1
+
+    def start_test(self) -> None:
+        """开始新的测试计数"""
+        with self._lock:
+            self.test_calls = {}
+
+    def finish_test(self, test_id: str) -> Dict[str, Any]:
+        """
+        结束当前测试计数
+        :param test_id: 测试 nodeid
+        :return: {"total": 总调用次数, "by_method": {对象.方法: 次数}}
+        """
+        with self._lock:
+            calls, self.test_calls = self.test_calls, {}
+        result = {"total": sum(calls.values()), "by_method": dict(sorted(calls.items()))}
+        self.tests[test_id] = result
+        return result
+
+    def dump(self, raw_dir: str, worker_id: str) -> Optional[str]:
+        """
+        写出当前进程各测试的调用次数
+        :param raw_dir: 原始数据目录
+        :param worker_id: 工作进程ID
+        :return: 文件路径，无数据时返回 None
+        """
+        if not self.tests:
+            return None
+        os.makedirs(raw_dir, exist_ok=True)
+        path = os.path.join(raw_dir, f"driver_calls_{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.tests, f, ensure_ascii=False)
+        return path
+
+
+def write_report(raw_dir: str, output_dir: str) -> Dict[str, Any]:
+    """
+    汇总所有工作进程的驱动调用次数，写出 driver_calls.json
+    :param raw_dir: 原始数据目录
+    :param output_dir: 报告目录
+    :return: {"total": 总次数, "by_method": {...}, "tests": {nodeid: 次数}}
+    """
+    tests: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(glob.glob(os.path.join(raw_dir, "driver_calls_*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            tests.update(json.load(f))
+    by_method: Dict[str, int] = {}
+    for result in tests.values():
+        for method, count in result["by_method"].items():
+            by_method[method] = by_method.get(method, 0) + count
+    report = {
+        "total": sum(result["total"] for result in tests.values()),
+        "by_method": dict(sorted(by_method.items(), key=lambda item: item[1], reverse=True)),
+        "tests": {test_id: result["total"] for test_id, result in sorted(tests.items())},
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "driver_calls.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+# 全局驱动调用计数器
+driver_calls = DriverCallCounter()
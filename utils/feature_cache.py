@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import pickle
+import hashlib
+import threading
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, Optional
+from .logger import Logger
+
+# 缓存格式版本，解析结果结构变化时递增
+_FORMAT_VERSION = 1
+
+
+# pickle 的 Feature 对象依赖这些包的类定义，任一版本变化时缓存失效
+_PICKLED_PACKAGES = ("pytest-bdd", "gherkin-official")
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "-"
+
+
+@lru_cache(maxsize=None)
+def _version_tag() -> str:
+    """缓存格式、pytest-bdd/gherkin 和 Python 版本，任一变化时全部缓存失效"""
+    packages = "/".join(f"{name}=={_package_version(name)}" for name in _PICKLED_PACKAGES)
+    return f"{_FORMAT_VERSION}/{packages}/{sys.version}"
+
+
+def _scenario_module() -> Any:
+    """pytest_bdd 包的 scenario 属性是同名装饰器函数，需从 sys.modules 获取模块本身"""
+    import pytest_bdd.scenario
+    return sys.modules["pytest_bdd.scenario"]
+
+
+class FeatureCache:
+    """
+    pytest-bdd 特性文件解析结果的磁盘缓存
+
+    以文件内容、路径、编码和 pytest-bdd/gherkin/Python 版本的哈希为键保存 pickle 后的 Feature 对象，
+    文件内容变化后自动失效。缓存文件先写临时文件再原子替换，多个 xdist 工作进程并发写入同一个键是安全的。
+    步骤匹配器在步骤模块导入时创建，无法跨进程复用，因此只缓存特性文件解析结果。
+    """
+
+    def __init__(self):
+        self.cache_dir = ""
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self._original_get_feature = None
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _key(self, full_name: str, rel_name: str, encoding: str, content: bytes) -> str:
+        digest = hashlib.sha256()
+        for part in (_version_tag(), full_name, rel_name, encoding):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get_feature(self, base_path: str, filename: str, encoding: str = "utf-8") -> Any:
+        """
+        与 pytest_bdd.feature.get_feature 签名相同：先查进程内缓存，再查磁盘缓存，最后解析文件
+        :param base_path: 特性文件根目录
+        :param filename: 特性文件名
+        :param encoding: 文件编码
+        :return: pytest-bdd Feature 对象
+        """
+        __tracebackhide__ = True
+        from pytest_bdd import feature as feature_module
+        from pytest_bdd.parser import FeatureParser
+
+        full_name = os.path.abspath(os.path.join(base_path, filename))
+        feature = feature_module.features.get(full_name)
+        if feature:
+            return feature
+
+        with open(full_name, "rb") as f:
+            content = f.read()
+        path = os.path.join(self.cache_dir, self._key(full_name, filename, encoding, content) + ".pickle")
+        feature = self._load(path)
+        if feature is None:
+            start = time.perf_counter()
+            feature = FeatureParser(base_path, filename, encoding).parse()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.misses += 1
+                self.parse_seconds += elapsed
+            self._store(path, feature, elapsed)
+        feature_module.features[full_name] = feature
+        return feature
+
+    def _load(self, path: str) -> Optional[Any]:
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 损坏或不兼容的缓存文件按未命中处理，随后被覆盖
+            self.logger.warning(f"特性文件缓存 {path} 无法读取，重新解析: {e}")
+            return None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.hits += 1
+            self.load_seconds += elapsed
+            self.saved_seconds += max(0.0, payload["parse_seconds"] - elapsed)
+        return payload["feature"]
+
+    def _store(self, path: str, feature: Any, parse_seconds: float) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"feature": feature, "parse_seconds": parse_seconds}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"写入特性文件缓存 {path} 失败: {e}")
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+
+    def install(self, cache_dir: str) -> None:
+        """
+        替换 pytest-bdd 的 get_feature（feature 模块和 scenario 模块中的引用），需在导入测试模块之前调用
+        :param cache_dir: 缓存目录
+        """
+        from pytest_bdd import feature as feature_module
+        scenario_module = _scenario_module()
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        if self._original_get_feature is not None:
+            return
+        self._original_get_feature = feature_module.get_feature
+        feature_module.get_feature = self.get_feature
+        scenario_module.get_feature = self.get_feature
+
+    def uninstall(self) -> None:
+        """恢复 pytest-bdd 原来的 get_feature"""
+        from pytest_bdd import feature as feature_module
+        scenario_module = _scenario_module()
+        if self._original_get_feature is None:
+            return
+        feature_module.get_feature = self._original_get_feature
+        scenario_module.get_feature = self._original_get_feature
+        self._original_get_feature = None
+
+    def prune(self, max_age_days: float = 30.0) -> int:
+        """
+        删除长时间未更新的缓存文件（内容已变化的特性文件留下的旧条目）
+        :param max_age_days: 保留天数
+        :return: 删除的文件数
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+        saved_ms 为命中时按缓存中记录的解析耗时减去读取耗时估算的节省时间
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "parse_ms": round(self.parse_seconds * 1000, 1),
+                "load_ms": round(self.load_seconds * 1000, 1),
+                "saved_ms": round(self.saved_seconds * 1000, 1),
+            }
+
+
+# 全局特性文件缓存
+feature_cache = FeatureCache()
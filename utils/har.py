@@ -0,0 +1,150 @@
+import os
+import json
+import uuid
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from playwright.sync_api import BrowserContext, Route
+from .logger import Logger
+from .helpers import file_lock
+from .browser_pool import get_worker_id
+
+
+# HAR 网络模式
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+_MODES = (OFF, RECORD, REPLAY)
+
+
+def _entry_key(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+    """按方法、URL 和请求体标识 HAR 条目"""
+    request = entry.get("request", {})
+    body = (request.get("postData") or {}).get("text", "")
+    return request.get("method", "GET"), request.get("url", ""), body
+
+
+def merge_har(source_path: str, target_path: str) -> int:
+    """
+    将 source 中的条目合并到 target，相同方法、URL 和请求体的条目以新录制的为准
+    :param source_path: 新录制的 HAR 文件
+    :param target_path: 功能级 HAR 文件
+    :return: 合并后的条目数
+    """
+    with open(source_path, "r", encoding="utf-8") as f:
+        source = json.load(f)
+    if os.path.exists(target_path):
+        with open(target_path, "r", encoding="utf-8") as f:
+            target = json.load(f)
+    else:
+        target = {"log": dict(source["log"], entries=[])}
+    entries = {_entry_key(entry): entry for entry in target["log"].get("entries", [])}
+    for entry in source["log"].get("entries", []):
+        entries[_entry_key(entry)] = entry
+    target["log"]["entries"] = list(entries.values())
+    tmp_path = f"{target_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(target, f, ensure_ascii=False)
+    os.replace(tmp_path, target_path)
+    return len(entries)
+
+
+class HarSession:
+    """单个测试的 HAR 录制/回放状态"""
+
+    def __init__(self, feature: str, har_path: str, partial_path: Optional[str] = None):
+        self.feature = feature
+        self.har_path = har_path
+        self.partial_path = partial_path
+        self.misses: List[Dict[str, str]] = []
+
+
+class HarNetwork:
+    """
+    基于 HAR 的网络录制与回放
+
+    录制模式下每个测试录制到临时 HAR，上下文关闭后合并进 feature 级 HAR；
+    回放模式下通过请求路由从 HAR 返回响应（按 URL、方法和请求体匹配），
+    未命中的请求会被记录并默认中止，保证离线环境下可运行。
+    """
+
+    def __init__(self, test_config):
+        if test_config.har_mode not in _MODES:
+            raise ValueError(f"未知的 HAR 模式: {test_config.har_mode}，可选值: {', '.join(_MODES)}")
+        self.mode = test_config.har_mode
+        self.har_dir = test_config.har_dir
+        self.allow_network = test_config.har_replay_allow_network
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self.misses: Dict[str, int] = {}
+
+    @property
+    def requires_fresh_context(self) -> bool:
+        """录制的 HAR 在上下文关闭时才写入，因此录制模式不能复用上下文"""
+        return self.mode == RECORD
+
+    def har_path(self, feature: str) -> str:
+        """获取功能级 HAR 文件路径"""
+        return os.path.join(self.har_dir, f"{feature}.har")
+
+    def start(self, context: BrowserContext, feature: str) -> Optional[HarSession]:
+        """
+        为上下文开启录制或回放
+        :param context: 浏览器上下文
+        :param feature: 功能标识，决定 HAR 文件名
+        :return: HAR 会话，关闭模式下返回 None
+        """
+        if self.mode == OFF:
+            return None
+        har_path = self.har_path(feature)
+        if self.mode == RECORD:
+            partial_dir = os.path.join(self.har_dir, ".partial")
+            os.makedirs(partial_dir, exist_ok=True)
+            partial_path = os.path.join(partial_dir, f"{feature}-{get_worker_id()}-{uuid.uuid4().hex}.har")
+            context.route_from_har(partial_path, update=True, update_content="embed", update_mode="minimal")
+            return HarSession(feature, har_path, partial_path)
+
+        session = HarSession(feature, har_path)
+        # 路由按注册的相反顺序匹配：HAR 未命中的请求回落到这里
+        context.route("**/*", lambda route: self._on_miss(session, route))
+        if os.path.exists(har_path):
+            context.route_from_har(har_path, not_found="fallback")
+        else:
+            self.logger.warning(f"HAR 文件不存在，所有请求都将视为未命中: {har_path}")
+        return session
+
+    def _on_miss(self, session: HarSession, route: Route) -> None:
+        """记录 HAR 中没有的请求"""
+        request = route.request
+        session.misses.append({"method": request.method, "url": request.url})
+        if self.allow_network:
+            route.continue_()
+        else:
+            route.abort("internetdisconnected")
+
+    def finish(self, session: Optional[HarSession]) -> List[Dict[str, str]]:
+        """
+        结束会话，必须在上下文关闭后调用
+        :param session: start 返回的会话
+        :return: 回放模式下未命中的请求列表
+        """
+        if session is None:
+            return []
+        if session.partial_path:
+            if not os.path.exists(session.partial_path):
+                return []
+            with file_lock(f"{session.har_path}.lock"):
+                count = merge_har(session.partial_path, session.har_path)
+            os.unlink(session.partial_path)
+            self.logger.info(f"HAR 已录制: {session.har_path} ({count} 条请求)")
+            return []
+        if session.misses:
+            with self._lock:
+                self.misses[session.feature] = self.misses.get(session.feature, 0) + len(session.misses)
+            self.logger.warning(f"{len(session.misses)} 个请求未在 HAR 中找到: {session.har_path}")
+        return session.misses
+
+    def report(self) -> None:
+        """输出回放未命中请求的汇总"""
+        for feature, count in self.misses.items():
+            self.logger.warning(f"HAR 回放未命中 {feature}: {count} 个请求")
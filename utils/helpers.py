@@ -1,17 +1,30 @@
+import copy
 import json
 import os
-from typing import Any, Dict, List
+import time
+import shutil
+from contextlib import contextmanager
+from typing import Any, Dict, List, Iterator
 from datetime import datetime
+from .logger import Logger
+from .test_data import data_cache
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 使用 msvcrt.locking
+    fcntl = None
+    import msvcrt
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """
-    加载JSON文件
+    加载JSON文件，未修改的文件从进程内缓存读取，返回副本，调用方可以修改；
+    只读且需要避免复制开销时直接使用 data_cache.load（返回共享对象）
     :param file_path: JSON文件路径
     :return: JSON数据字典
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return copy.deepcopy(data_cache.load(file_path))
     except Exception as e:
         raise Exception(f"Failed to load JSON file {file_path}: {str(e)}")
 
@@ -53,14 +66,62 @@ def get_test_data_path(env: str = 'test') -> str:
 
 def clean_dir(dir_path: str) -> None:
     """
-    清空目录内容
+    清空目录内容（含子目录），保留目录本身
     :param dir_path: 目录路径
     """
     if os.path.exists(dir_path):
         for file_name in os.listdir(dir_path):
             file_path = os.path.join(dir_path, file_name)
             try:
-                if os.path.isfile(file_path):
+                if os.path.isdir(file_path) and not os.path.islink(file_path):
+                    shutil.rmtree(file_path)
+                else:
                     os.unlink(file_path)
             except Exception as e:
-                print(f'Failed to delete {file_path}: {str(e)}') 
\ No newline at end of file
+                Logger.get_logger().warning(f'Failed to delete {file_path}: {str(e)}')
+
+def _try_lock(fd: int) -> bool:
+    """以非阻塞方式对文件描述符加排他锁，已被其他描述符持有时返回 False"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def file_lock(lock_path: str, timeout: float = 60.0) -> Iterator[None]:
+    """
+    基于操作系统文件锁（fcntl.flock / msvcrt.locking）的跨进程互斥锁，用于多个 xdist 工作进程写同一个文件
+    锁随持有进程退出由操作系统释放，不会留下需要按时间清理的残留锁，等待方也不会删除仍被持有的锁；
+    锁文件本身保留在磁盘上，其中记录最后一个持有者的进程ID
+    :param lock_path: 锁文件路径
+    :param timeout: 获取锁的超时时间（秒）
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Failed to acquire lock {lock_path} in {timeout}s")
+            time.sleep(0.05)
+        try:
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, str(os.getpid()).encode())
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
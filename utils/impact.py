@@ -0,0 +1,273 @@
+import os
+import ast
+import glob
+import json
+import subprocess
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from .helpers import file_lock
+
+# 项目根目录，影响映射中的文件路径相对于此目录（与 git diff 输出一致）
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 变更后不需要重新运行任何测试的文件（含运行时生成的日志和报告）
+_IGNORED_CHANGES = ("*.md", "benchmarks/*", "docs/*", "logs/*", "reports/*")
+
+# 变更后即使没有测试记录也不需要全量运行的目录：新增的测试没有映射记录，本来就会被选中
+_TEST_DIRS = ("tests/*",)
+
+
+def project_path(path: str) -> Optional[str]:
+    """
+    转换为相对于项目根目录的路径（使用 / 分隔）
+    :param path: 文件路径
+    :return: 相对路径，项目外的文件（如第三方库）返回 None
+    """
+    relative = os.path.relpath(os.path.abspath(path), _PROJECT_ROOT)
+    if relative.startswith(".."):
+        return None
+    return relative.replace(os.sep, "/")
+
+
+def function_symbol(func: Callable) -> Optional[str]:
+    """
+    函数的符号名：<文件>::<限定名>，如 pages/base_page.py::BasePage.click
+    :param func: 函数
+    :return: 符号名，项目外的函数返回 None
+    """
+    code = getattr(func, "__code__", None)
+    path = project_path(code.co_filename) if code is not None else None
+    return f"{path}::{func.__qualname__}" if path else None
+
+
+class ImpactRecorder:
+    """
+    记录每个测试运行时实际使用的步骤定义、页面对象方法和选择器
+
+    页面对象方法通过 step 装饰器记录（符号名中的类是定义该方法的类，继承的方法记为基类方法），
+    步骤定义通过 pytest_bdd_before_step 钩子记录，选择器在 BasePage._locate 中记录。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.symbols: Set[str] = set()
+        self.selectors: Set[str] = set()
+        self.tests: Dict[str, Dict[str, List[str]]] = {}
+
+    def use(self, symbol: Optional[str]) -> None:
+        """记录使用的函数符号"""
+        if self.enabled and symbol:
+            self.symbols.add(symbol)
+
+    def use_selector(self, selector: Any) -> None:
+        """记录使用的选择器"""
+        if self.enabled:
+            self.selectors.add(str(selector))
+
+    def start_test(self) -> None:
+        """开始记录新的测试"""
+        self.symbols = set()
+        self.selectors = set()
+
+    def finish_test(self, test_id: str, files: Iterable[str]) -> None:
+        """
+        结束当前测试的记录
+        :param test_id: 测试 nodeid
+        :param files: 测试直接依赖的文件（测试模块、feature 文件）
+        """
+        if not self.enabled:
+            return
+        symbols, self.symbols = self.symbols, set()
+        selectors, self.selectors = self.selectors, set()
+        all_files = {path for path in (project_path(f) for f in files) if path}
+        all_files.update(symbol.split("::", 1)[0] for symbol in symbols)
+        self.tests[test_id] = {
+            "files": sorted(all_files),
+            "symbols": sorted(symbols),
+            "selectors": sorted(selectors),
+        }
+
+    def dump(self, raw_dir: str, worker_id: str) -> Optional[str]:
+        """
+        写出当前进程记录的影响映射
+        :param raw_dir: 原始数据目录
+        :param worker_id: 工作进程ID
+        :return: 文件路径，无数据时返回 None
+        """
+        if not self.tests:
+            return None
+        os.makedirs(raw_dir, exist_ok=True)
+        path = os.path.join(raw_dir, f"impact_{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.tests, f, ensure_ascii=False)
+        return path
+
+
+# 全局影响记录器
+impact_recorder = ImpactRecorder()
+
+
+def load_impact_map(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    读取影响映射 {nodeid: {"files": [...], "symbols": [...], "selectors": [...]}}
+    :param path: 映射文件路径
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def merge_impact_map(raw_dir: str, path: str) -> int:
+    """
+    把各工作进程本次记录的映射合并到持久化的映射文件，本次运行过的测试覆盖旧记录
+    :param raw_dir: 原始数据目录
+    :param path: 映射文件路径
+    :return: 本次更新的测试数
+    """
+    tests: Dict[str, Dict[str, List[str]]] = {}
+    for raw_path in sorted(glob.glob(os.path.join(raw_dir, "impact_*.json"))):
+        with open(raw_path, "r", encoding="utf-8") as f:
+            tests.update(json.load(f))
+    if not tests:
+        return 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with file_lock(f"{path}.lock"):
+        impact_map = load_impact_map(path)
+        impact_map.update(tests)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(impact_map, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    return len(tests)
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=_PROJECT_ROOT, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def changed_lines(base: str) -> Dict[str, List[int]]:
+    """
+    获取工作区（含未提交修改和未跟踪文件）相对 base 的变更
+    :param base: git 引用，如 origin/main
+    :return: {文件: 新文件中变更的行号}，行号为空表示整个文件（新增、删除或非文本文件）
+    """
+    changes: Dict[str, List[int]] = {}
+    current: Optional[str] = None
+    for line in _git("diff", "--unified=0", "--no-color", "--no-renames", base).splitlines():
+        if line.startswith("--- "):
+            old = line[4:]
+            current = old[2:] if old != "/dev/null" else None
+            if current:
+                changes.setdefault(current, [])
+        elif line.startswith("+++ "):
+            new = line[4:]
+            if new != "/dev/null":
+                current = new[2:]
+                changes.setdefault(current, [])
+            elif current:
+                # 删除的文件按整个文件变更处理
+                changes[current] = []
+                current = None
+        elif line.startswith("@@") and current:
+            # @@ -a,b +c,d @@：新文件从第 c 行起 d 行，d 为 0 表示在 c 行之后删除了内容
+            new_range = line.split(" ")[2][1:]
+            start, _, count = new_range.partition(",")
+            count = int(count) if count else 1
+            changes[current].extend(range(int(start), int(start) + max(count, 1)))
+    for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes[path] = []
+    return changes
+
+
+def _node_range(node: ast.AST) -> Tuple[int, int]:
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return start, node.end_lineno
+
+
+def changed_symbols(path: str, lines: List[int]) -> Set[str]:
+    """
+    把变更行映射为符号：方法为 类.方法，类属性等类级别变更为 类，模块函数为函数名，其他模块级变更为空字符串
+    :param path: 相对项目根目录的文件路径
+    :param lines: 变更的行号，为空表示整个文件
+    :return: 符号集合
+    """
+    full_path = os.path.join(_PROJECT_ROOT, path)
+    if not lines or not path.endswith(".py") or not os.path.isfile(full_path):
+        return {""}
+    try:
+        with open(full_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (SyntaxError, UnicodeDecodeError):
+        return {""}
+    symbols: Set[str] = set()
+    for line in set(lines):
+        symbol = ""
+        for node in tree.body:
+            start, end = _node_range(node)
+            if not start <= line <= end:
+                continue
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                symbol = node.name
+            elif isinstance(node, ast.ClassDef):
+                symbol = node.name
+                for child in node.body:
+                    child_start, child_end = _node_range(child)
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and child_start <= line <= child_end:
+                        symbol = f"{node.name}.{child.name}"
+                        break
+            break
+        symbols.add(symbol)
+    return symbols
+
+
+def select_tests(test_ids: List[str], impact_map: Dict[str, Dict[str, List[str]]],
+                 changes: Dict[str, List[int]]) -> Tuple[Optional[Set[str]], List[str]]:
+    """
+    根据变更选择受影响的测试
+
+    规则：
+    1. 没有映射记录的测试（新增或从未运行过）总是选中
+    2. 被某个测试记录过的方法或函数变更时，选中使用过它的测试
+    3. 类级别变更（类属性、元素声明）或未被任何测试记录过的方法（如私有辅助方法）变更时，选中使用过该类的测试
+    4. 模块级变更选中依赖该文件的测试
+    5. 没有任何测试依赖的文件变更（如 conftest.py、配置、工具模块）无法判断影响范围，选中全部测试；
+       文档、基准测试和 tests 目录下的新文件除外
+    :param test_ids: 收集到的测试 nodeid
+    :param impact_map: 影响映射
+    :param changes: changed_lines 的结果
+    :return: (选中的 nodeid 集合，None 表示全部; 每条变更的处理说明)
+    """
+    used_symbols: Set[str] = set()
+    used_files: Set[str] = set()
+    for entry in impact_map.values():
+        used_symbols.update(entry["symbols"])
+        used_files.update(entry["files"])
+
+    selected = {test_id for test_id in test_ids if test_id not in impact_map}
+    reasons: List[str] = []
+    for path, lines in sorted(changes.items()):
+        if any(fnmatch(path, pattern) for pattern in _IGNORED_CHANGES):
+            continue
+        if path not in used_files:
+            if any(fnmatch(path, pattern) for pattern in _TEST_DIRS):
+                continue
+            reasons.append(f"{path}: 没有测试记录依赖该文件，运行全部测试")
+            return None, reasons
+        for symbol in changed_symbols(path, lines):
+            qualified = f"{path}::{symbol}"
+            if symbol and qualified in used_symbols:
+                matches = [t for t, e in impact_map.items() if qualified in e["symbols"]]
+            elif symbol:
+                prefix = f"{path}::{symbol.split('.')[0]}"
+                matches = [t for t, e in impact_map.items()
+                           if any(s == prefix or s.startswith(prefix + ".") for s in e["symbols"])]
+                if not matches:
+                    matches = [t for t, e in impact_map.items() if path in e["files"]]
+            else:
+                matches = [t for t, e in impact_map.items() if path in e["files"]]
+            selected.update(matches)
+            reasons.append(f"{qualified if symbol else path}: {len(matches)} 个测试")
+    return selected & set(test_ids), reasons
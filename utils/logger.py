@@ -1,66 +1,201 @@
+import copy
+import json
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import contextvars
 from datetime import datetime
 from typing import Optional
 
+# 当前测试ID和步骤，由 conftest 和步骤记录器设置，写入每条日志
+current_test_id: contextvars.ContextVar = contextvars.ContextVar("log_test_id", default="")
+current_step: contextvars.ContextVar = contextvars.ContextVar("log_step", default="")
+
+
+def _worker_id() -> str:
+    """当前 pytest-xdist 工作进程ID"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+class LogContextFilter(logging.Filter):
+    """为日志记录添加测试ID、步骤和工作进程字段"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.test_id = current_test_id.get()
+        record.step = current_step.get()
+        record.worker = _worker_id()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": getattr(record, "worker", ""),
+            "test_id": getattr(record, "test_id", ""),
+            "step": getattr(record, "step", ""),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    保留异常信息的队列处理器
+
+    默认的 prepare 会把异常堆栈拼接进消息并清空 exc_info，JSON 日志的 exc_info 字段因此为空；
+    这里在调用线程中只格式化异常文本并保存在 exc_text，消息保持原样，由各输出格式自行决定如何呈现
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            # 与标准 QueueHandler 一样不把 traceback 对象交给监听线程，只传递格式化后的文本
+            record.exc_info = None
+        return record
+
+
 class Logger:
+    """
+    框架日志
+
+    调用方只把日志记录放入队列，文件和控制台输出由后台 QueueListener 线程完成，
+    每个 xdist 工作进程写入独立的日志文件。
+    """
+
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialize_logger()
         return cls._instance
-    
+
     def _initialize_logger(self):
         """初始化日志配置"""
         self.logger = logging.getLogger('POBDD')
         self.logger.setLevel(logging.INFO)
-        
+        self.log_format = "text"
+        self.log_dir = "logs"
+        self.log_file = None
+        self.listener = None
+
+        # 队列处理器：调用线程只负责入队，上下文字段在入队前填充
+        self.queue_handler = ContextQueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(LogContextFilter())
+        self.logger.addHandler(self.queue_handler)
+
+        self._start_listener()
+        atexit.register(self.shutdown)
+
+    def _start_listener(self):
+        """创建文件/控制台处理器并启动后台监听线程"""
         # 创建日志目录
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        # 日志文件名格式：logs/test_YYYYMMDD_HHMMSS.log
-        log_file = os.path.join(log_dir, f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-        
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        # 日志文件名格式：logs/test_YYYYMMDD_HHMMSS_<worker>.log，JSON 格式使用 .jsonl
+        extension = "jsonl" if self.log_format == "json" else "log"
+        self.log_file = os.path.join(
+            self.log_dir, f"test_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{_worker_id()}.{extension}"
+        )
+
         # 文件处理器
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.FileHandler(self.log_file, encoding='utf-8', delay=True)
         file_handler.setLevel(logging.INFO)
-        
+
         # 控制台处理器
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        
+
         # 日志格式
         formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            '%(asctime)s - %(name)s - %(levelname)s - [%(worker)s] %(message)s'
         )
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(JsonLinesFormatter() if self.log_format == "json" else formatter)
         console_handler.setFormatter(formatter)
-        
-        # 添加处理器
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
+
+        self.listener = logging.handlers.QueueListener(
+            self.queue_handler.queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def _stop_listener(self):
+        """处理完队列中剩余的日志后停止监听线程"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+
+    @classmethod
+    def configure(cls, log_format: str = "text", log_dir: str = "logs") -> None:
+        """
+        按测试配置切换日志格式和目录
+        :param log_format: text 或 json（JSON Lines）
+        :param log_dir: 日志目录
+        """
+        if log_format not in ("text", "json"):
+            raise ValueError(f"未知的日志格式: {log_format}，可选值: text, json")
+        instance = cls()
+        if instance.log_format == log_format and instance.log_dir == log_dir:
+            return
+        instance._stop_listener()
+        instance.log_format = log_format
+        instance.log_dir = log_dir
+        instance._start_listener()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """刷新并停止后台日志线程"""
+        if cls._instance is not None:
+            cls._instance._stop_listener()
+
+    @staticmethod
+    def set_test_id(test_id: str) -> contextvars.Token:
+        """
+        设置当前测试ID
+        :param test_id: 测试 nodeid
+        :return: 用于恢复的令牌
+        """
+        return current_test_id.set(test_id)
+
+    @staticmethod
+    def reset_test_id(token: contextvars.Token) -> None:
+        """恢复之前的测试ID"""
+        current_test_id.reset(token)
+
     @classmethod
     def get_logger(cls) -> logging.Logger:
         """获取日志实例"""
         return cls().logger
-    
+
     def info(self, message: str):
         """记录信息日志"""
         self.logger.info(message)
-    
+
     def error(self, message: str):
         """记录错误日志"""
         self.logger.error(message)
-    
+
     def warning(self, message: str):
         """记录警告日志"""
         self.logger.warning(message)
-    
+
     def debug(self, message: str):
         """记录调试日志"""
-        self.logger.debug(message) 
\ No newline at end of file
+        self.logger.debug(message)
@@ -0,0 +1,309 @@
+import os
+import glob
+import json
+import time
+import inspect
+import threading
+import contextvars
+from functools import wraps
+from typing import Dict, Any, List, Optional, Callable
+from .logger import current_step, current_test_id
+
+
+class _ActionFrame:
+    """正在执行的页面操作，嵌套的等待和重试耗时累计到这里"""
+
+    __slots__ = ("wait", "retry", "retrying")
+
+    def __init__(self):
+        self.wait = 0.0
+        self.retry = 0.0
+        self.retrying = False
+
+
+_frame: contextvars.ContextVar = contextvars.ContextVar("action_frame", default=None)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """已排序列表的分位数（最近秩）"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class ActionMetrics:
+    """
+    BasePage 操作耗时统计
+
+    每次操作拆分为等待、动作和重试三部分，按页面对象、选择器和步骤标记；
+    每个工作进程在结束时写出原始数据，由主进程汇总为 JSON 报告和 Prometheus 文本文件。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.samples: List[Dict[str, Any]] = []
+
+    # ---------- 采集 ----------
+
+    def add_wait(self, seconds: float) -> None:
+        """把嵌套等待的耗时计入当前操作（重试期间的等待计入重试时间）"""
+        frame = _frame.get()
+        if frame is not None and not frame.retrying:
+            frame.wait += seconds
+
+    def mark_retrying(self) -> None:
+        """当前操作进入重试，之后的耗时不再计入等待"""
+        frame = _frame.get()
+        if frame is not None:
+            frame.retrying = True
+
+    def add_retry(self, seconds: float) -> None:
+        """把重试耗时计入当前操作"""
+        frame = _frame.get()
+        if frame is not None:
+            frame.retry += seconds
+
+    def _record(self, page_object: str, action: str, selector: Optional[str], total: float,
+                frame: _ActionFrame, failed: bool) -> None:
+        wait = min(frame.wait, total)
+        retry = min(frame.retry, total - wait)
+        sample = {
+            "page": page_object,
+            "action": action,
+            "selector": selector,
+            "step": current_step.get(),
+            "test_id": current_test_id.get(),
+            "total": total,
+            "wait": wait,
+            "action_time": total - wait - retry,
+            "retry": retry,
+            "failed": failed,
+        }
+        with self._lock:
+            self.samples.append(sample)
+
+    # ---------- 输出 ----------
+
+    def dump(self, raw_dir: str, worker_id: str) -> Optional[str]:
+        """
+        写出当前进程的原始数据
+        :param raw_dir: 原始数据目录
+        :param worker_id: 工作进程ID
+        :return: 文件路径，无数据时返回 None
+        """
+        with self._lock:
+            samples, self.samples = self.samples, []
+        if not samples:
+            return None
+        os.makedirs(raw_dir, exist_ok=True)
+        path = os.path.join(raw_dir, f"actions_{worker_id}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            for sample in samples:
+                f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        return path
+
+
+# 全局操作耗时统计
+action_metrics = ActionMetrics()
+
+
+def _selector_getter(func: Callable) -> Callable[[tuple, dict], Optional[str]]:
+    """根据函数签名生成读取 selector 参数的函数"""
+    params = list(inspect.signature(func).parameters)
+    name = next((p for p in ("selector", "container", "frame_selector", "source") if p in params), None)
+    if name is None:
+        return lambda args, kwargs: None
+    index = params.index(name) - 1  # 去掉 self
+
+    def getter(args: tuple, kwargs: dict) -> Optional[str]:
+        value = kwargs.get(name, args[index] if index < len(args) else None)
+        return str(value) if value is not None else None
+    return getter
+
+
+def timed(kind: str = "action"):
+    """
+    记录页面操作耗时的装饰器，应放在最外层
+    :param kind: action(操作) 或 wait(等待)；嵌套在其他操作中的等待计入外层操作的等待时间
+    """
+    def decorator(func: Callable):
+        get_selector = _selector_getter(func)
+        action = func.__name__
+
+        def enter():
+            parent = _frame.get()
+            if parent is not None:
+                return parent, None
+            frame = _ActionFrame()
+            return frame, _frame.set(frame)
+
+        def leave(page_object, args, kwargs, frame, token, elapsed: float, failed: bool):
+            if token is None:
+                if kind == "wait":
+                    action_metrics.add_wait(elapsed)
+                return
+            _frame.reset(token)
+            if kind == "wait":
+                frame.wait = elapsed
+            action_metrics._record(type(page_object).__name__, action, get_selector(args, kwargs),
+                                   elapsed, frame, failed)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not action_metrics.enabled:
+                    return await func(self, *args, **kwargs)
+                frame, token = enter()
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = await func(self, *args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    leave(self, args, kwargs, frame, token, time.perf_counter() - start, failed)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not action_metrics.enabled:
+                return func(self, *args, **kwargs)
+            frame, token = enter()
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(self, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                leave(self, args, kwargs, frame, token, time.perf_counter() - start, failed)
+        return wrapper
+    return decorator
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        "total_ms": round(sum(ordered) * 1000, 1),
+    }
+
+
+def aggregate(raw_dir: str, top: int = 20) -> Dict[str, Any]:
+    """
+    汇总所有工作进程的原始数据
+    :param raw_dir: 原始数据目录
+    :param top: 最慢选择器/步骤的数量
+    :return: 汇总报告
+    """
+    samples = []
+    for path in sorted(glob.glob(os.path.join(raw_dir, "actions_*.jsonl"))):
+        with open(path, "r", encoding="utf-8") as f:
+            samples.extend(json.loads(line) for line in f if line.strip())
+
+    def group(key_func):
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for sample in samples:
+            groups.setdefault(key_func(sample), []).append(sample)
+        return groups
+
+    actions = []
+    for (page, action), items in group(lambda s: (s["page"], s["action"])).items():
+        entry = {"page": page, "action": action, "count": len(items)}
+        entry.update(_summarize([s["total"] for s in items]))
+        for phase in ("wait", "action_time", "retry"):
+            entry[f"{phase}_total_ms"] = round(sum(s[phase] for s in items) * 1000, 1)
+        entry["failures"] = sum(1 for s in items if s["failed"])
+        actions.append(entry)
+    actions.sort(key=lambda e: e["total_ms"], reverse=True)
+
+    selectors = []
+    for (page, selector), items in group(lambda s: (s["page"], s["selector"])).items():
+        if selector is None:
+            continue
+        entry = {"page": page, "selector": selector, "count": len(items)}
+        entry.update(_summarize([s["total"] for s in items]))
+        selectors.append(entry)
+    selectors.sort(key=lambda e: e["p95_ms"], reverse=True)
+
+    steps = []
+    for step, items in group(lambda s: s["step"]).items():
+        if not step:
+            continue
+        entry = {"step": step, "count": len(items)}
+        entry.update(_summarize([s["total"] for s in items]))
+        steps.append(entry)
+    steps.sort(key=lambda e: e["p95_ms"], reverse=True)
+
+    tests = {}
+    for test_id, items in group(lambda s: s["test_id"]).items():
+        tests[test_id] = {
+            "actions": len(items),
+            "total_ms": round(sum(s["total"] for s in items) * 1000, 1),
+            "wait_ms": round(sum(s["wait"] for s in items) * 1000, 1),
+            "retry_ms": round(sum(s["retry"] for s in items) * 1000, 1),
+        }
+
+    return {
+        "samples": len(samples),
+        "actions": actions,
+        "slowest_selectors": selectors[:top],
+        "slowest_steps": steps[:top],
+        "tests": tests,
+    }
+
+
+def _label(value: Any) -> str:
+    """Prometheus 标签值转义"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(report: Dict[str, Any]) -> str:
+    """
+    将汇总报告转换为 Prometheus 文本格式（供 node_exporter textfile collector 使用）
+    :param report: aggregate 返回的汇总报告
+    """
+    lines = [
+        "# HELP pobdd_action_duration_seconds BasePage action duration.",
+        "# TYPE pobdd_action_duration_seconds summary",
+    ]
+    for entry in report["actions"]:
+        labels = f'page="{_label(entry["page"])}",action="{_label(entry["action"])}"'
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'pobdd_action_duration_seconds{{{labels},quantile="{quantile}"}} {round(entry[key] / 1000, 6)}')
+        lines.append(f"pobdd_action_duration_seconds_sum{{{labels}}} {round(entry['total_ms'] / 1000, 6)}")
+        lines.append(f"pobdd_action_duration_seconds_count{{{labels}}} {entry['count']}")
+    lines.append("# HELP pobdd_action_phase_seconds_total Time spent per action phase.")
+    lines.append("# TYPE pobdd_action_phase_seconds_total counter")
+    for entry in report["actions"]:
+        for phase, key in (("wait", "wait_total_ms"), ("action", "action_time_total_ms"), ("retry", "retry_total_ms")):
+            labels = f'page="{_label(entry["page"])}",action="{_label(entry["action"])}",phase="{phase}"'
+            lines.append(f"pobdd_action_phase_seconds_total{{{labels}}} {round(entry[key] / 1000, 6)}")
+    lines.append("# HELP pobdd_selector_duration_p95_seconds p95 duration of the slowest selectors.")
+    lines.append("# TYPE pobdd_selector_duration_p95_seconds gauge")
+    for entry in report["slowest_selectors"]:
+        labels = f'page="{_label(entry["page"])}",selector="{_label(entry["selector"])}"'
+        lines.append(f"pobdd_selector_duration_p95_seconds{{{labels}}} {round(entry['p95_ms'] / 1000, 6)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(raw_dir: str, output_dir: str) -> Dict[str, Any]:
+    """
+    汇总原始数据并写出 actions.json 和 actions.prom
+    :param raw_dir: 原始数据目录
+    :param output_dir: 报告目录
+    :return: 汇总报告
+    """
+    report = aggregate(raw_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "actions.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    tmp_path = os.path.join(output_dir, "actions.prom.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(report))
+    os.replace(tmp_path, os.path.join(output_dir, "actions.prom"))
+    return report
@@ -0,0 +1,305 @@
+import time
+import inspect
+import fnmatch
+import threading
+import weakref
+from typing import Dict, Any, List, Optional, Callable, Union, Pattern, Sequence
+from playwright.sync_api import Page, Request
+from playwright.async_api import Page as AsyncPage
+from .exceptions import TimeoutException
+
+
+class ReadinessStats:
+    """记录各页面就绪策略的实际等待耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, timed_out: bool = False) -> None:
+        """
+        记录一次等待
+        :param name: 策略名称
+        :param seconds: 等待耗时（秒）
+        :param timed_out: 是否超时
+        """
+        with self._lock:
+            self._durations.setdefault(name, []).append(seconds)
+            if timed_out:
+                self._timeouts[name] = self._timeouts.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        按策略汇总等待耗时
+        :return: {策略名称: 统计信息}
+        """
+        with self._lock:
+            result = {}
+            for name, durations in self._durations.items():
+                ordered = sorted(durations)
+                result[name] = {
+                    "count": len(ordered),
+                    "total_ms": round(sum(ordered) * 1000, 1),
+                    "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                    "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                    "timeouts": self._timeouts.get(name, 0),
+                }
+            return result
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._durations = {}
+            self._timeouts = {}
+
+
+# 全局就绪等待统计
+readiness_stats = ReadinessStats()
+
+
+class ReadinessStrategy:
+    """页面就绪策略基类"""
+
+    name = "custom"
+
+    def prepare(self, page: Page) -> None:
+        """
+        页面对象创建时调用，用于提前注册监听器
+        :param page: playwright页面对象
+        """
+
+    def wait(self, page: Page, timeout: int) -> None:
+        """
+        等待页面就绪，子类实现
+        :param page: playwright页面对象
+        :param timeout: 超时时间（毫秒）
+        """
+        raise NotImplementedError
+
+    async def wait_async(self, page: AsyncPage, timeout: int) -> None:
+        """
+        异步等待页面就绪，子类实现
+        :param page: playwright异步页面对象
+        :param timeout: 超时时间（毫秒）
+        """
+        raise NotImplementedError
+
+    def wait_ready(self, page: Page, timeout: int) -> float:
+        """
+        执行等待并记录耗时
+        :param page: playwright页面对象
+        :param timeout: 超时时间（毫秒）
+        :return: 实际等待耗时（秒）
+        """
+        start = time.perf_counter()
+        try:
+            self.wait(page, timeout)
+        except Exception:
+            readiness_stats.record(self.name, time.perf_counter() - start, timed_out=True)
+            raise
+        elapsed = time.perf_counter() - start
+        readiness_stats.record(self.name, elapsed)
+        return elapsed
+
+    async def wait_ready_async(self, page: AsyncPage, timeout: int) -> float:
+        """
+        异步执行等待并记录耗时
+        :param page: playwright异步页面对象
+        :param timeout: 超时时间（毫秒）
+        :return: 实际等待耗时（秒）
+        """
+        start = time.perf_counter()
+        try:
+            await self.wait_async(page, timeout)
+        except Exception:
+            readiness_stats.record(self.name, time.perf_counter() - start, timed_out=True)
+            raise
+        elapsed = time.perf_counter() - start
+        readiness_stats.record(self.name, elapsed)
+        return elapsed
+
+
+class LoadStateReadiness(ReadinessStrategy):
+    """依次等待一个或多个页面加载状态"""
+
+    def __init__(self, *states: str):
+        self.states = states or ("load",)
+        self.name = "load_state:" + "+".join(self.states)
+
+    def wait(self, page: Page, timeout: int) -> None:
+        for state in self.states:
+            page.wait_for_load_state(state, timeout=timeout)
+
+    async def wait_async(self, page: AsyncPage, timeout: int) -> None:
+        for state in self.states:
+            await page.wait_for_load_state(state, timeout=timeout)
+
+
+class SelectorReadiness(ReadinessStrategy):
+    """等待指定元素达到目标状态"""
+
+    def __init__(self, selector: str, state: str = "visible"):
+        self.selector = selector
+        self.state = state
+        self.name = f"selector:{selector}"
+
+    def wait(self, page: Page, timeout: int) -> None:
+        page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+    async def wait_async(self, page: AsyncPage, timeout: int) -> None:
+        await page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+
+class _NetworkTracker:
+    """跟踪页面上尚未完成的网络请求"""
+
+    def __init__(self, page: Page):
+        self.in_flight: Dict[int, str] = {}
+        self.last_activity = time.monotonic()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, request: Request) -> None:
+        self.in_flight[id(request)] = request.url
+        self.last_activity = time.monotonic()
+
+    def _on_end(self, request: Request) -> None:
+        self.in_flight.pop(id(request), None)
+        self.last_activity = time.monotonic()
+
+
+_trackers: "weakref.WeakKeyDictionary[Page, _NetworkTracker]" = weakref.WeakKeyDictionary()
+
+
+class NetworkSettledReadiness(ReadinessStrategy):
+    """
+    等待匹配的网络请求全部完成并保持静默一段时间
+
+    与 networkidle 不同，只关注 url_patterns 匹配的请求，长轮询和统计类请求不会拖住等待。
+    监听器在页面对象创建时注册，之前发出的请求无法被跟踪。
+    """
+
+    def __init__(self, url_patterns: Sequence[Union[str, Pattern]] = ("**/*",),
+                 quiet_ms: int = 200, poll_ms: int = 50):
+        self.url_patterns = list(url_patterns)
+        self.quiet_ms = quiet_ms
+        self.poll_ms = poll_ms
+        self.name = "network:" + ",".join(getattr(p, "pattern", p) for p in self.url_patterns)
+
+    def _matches(self, url: str) -> bool:
+        for pattern in self.url_patterns:
+            if isinstance(pattern, str):
+                if fnmatch.fnmatch(url, pattern):
+                    return True
+            elif pattern.search(url):
+                return True
+        return False
+
+    def prepare(self, page: Page) -> None:
+        if page not in _trackers:
+            _trackers[page] = _NetworkTracker(page)
+
+    def _pending(self, tracker: _NetworkTracker) -> List[str]:
+        """未完成的匹配请求，静默期未满时返回非空"""
+        pending = [url for url in tracker.in_flight.values() if self._matches(url)]
+        if not pending and (time.monotonic() - tracker.last_activity) * 1000 < self.quiet_ms:
+            return ["<quiet period>"]
+        return pending
+
+    def wait(self, page: Page, timeout: int) -> None:
+        self.prepare(page)
+        tracker = _trackers[page]
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            pending = self._pending(tracker)
+            if not pending:
+                return
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"网络请求在 {timeout}ms 内未完成: {pending[:5]}")
+            # 同步API只在等待期间分发事件，因此使用 wait_for_timeout 轮询
+            page.wait_for_timeout(self.poll_ms)
+
+    async def wait_async(self, page: AsyncPage, timeout: int) -> None:
+        self.prepare(page)
+        tracker = _trackers[page]
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            pending = self._pending(tracker)
+            if not pending:
+                return
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"网络请求在 {timeout}ms 内未完成: {pending[:5]}")
+            await page.wait_for_timeout(self.poll_ms)
+
+
+class PredicateReadiness(ReadinessStrategy):
+    """
+    等待自定义条件成立
+    predicate 为字符串时作为页面内 JavaScript 表达式执行，为函数时以页面对象为参数轮询，
+    异步页面上的函数可以返回协程
+    """
+
+    def __init__(self, predicate: Union[str, Callable[[Page], bool]],
+                 name: Optional[str] = None, poll_ms: int = 100):
+        self.predicate = predicate
+        self.poll_ms = poll_ms
+        self.name = name or f"predicate:{getattr(predicate, '__name__', predicate)}"
+
+    def wait(self, page: Page, timeout: int) -> None:
+        if isinstance(self.predicate, str):
+            page.wait_for_function(self.predicate, timeout=timeout)
+            return
+        deadline = time.monotonic() + timeout / 1000
+        while not self.predicate(page):
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"条件 {self.name} 在 {timeout}ms 内未成立")
+            page.wait_for_timeout(self.poll_ms)
+
+    async def wait_async(self, page: AsyncPage, timeout: int) -> None:
+        if isinstance(self.predicate, str):
+            await page.wait_for_function(self.predicate, timeout=timeout)
+            return
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            result = self.predicate(page)
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                return
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"条件 {self.name} 在 {timeout}ms 内未成立")
+            await page.wait_for_timeout(self.poll_ms)
+
+
+# 常用策略
+DOM_READY = LoadStateReadiness("domcontentloaded")
+PAGE_LOAD = LoadStateReadiness("load")
+NETWORK_IDLE = LoadStateReadiness("networkidle")
+FULL_LOAD = LoadStateReadiness("load", "domcontentloaded", "networkidle")
+
+_NAMED_STRATEGIES = {
+    "dom": DOM_READY,
+    "load": PAGE_LOAD,
+    "networkidle": NETWORK_IDLE,
+    "full": FULL_LOAD,
+}
+
+
+def resolve_readiness(strategy: Union[str, ReadinessStrategy, Callable[[Page], bool]]) -> ReadinessStrategy:
+    """
+    将策略名称、策略对象或判断函数统一转换为策略对象
+    :param strategy: dom/load/networkidle/full、ReadinessStrategy 实例或判断函数
+    :return: 就绪策略
+    """
+    if isinstance(strategy, ReadinessStrategy):
+        return strategy
+    if isinstance(strategy, str):
+        if strategy not in _NAMED_STRATEGIES:
+            raise ValueError(f"未知的页面就绪策略: {strategy}")
+        return _NAMED_STRATEGIES[strategy]
+    if callable(strategy):
+        return PredicateReadiness(strategy)
+    raise TypeError(f"不支持的页面就绪策略类型: {type(strategy)}")
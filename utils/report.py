@@ -1,14 +1,604 @@
 import os
+import json
+import time
+import atexit
+import zlib
+import queue
+import shutil
+import hashlib
+import threading
+from functools import partial
 import allure
-from typing import Optional, Dict, Any
+from allure_commons import hookimpl, plugin_manager
+from allure_commons.logger import AllureFileLogger
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from datetime import datetime
 from .logger import Logger
 from .helpers import create_dir_if_not_exists, get_timestamp
+from .browser_pool import get_worker_id
+
+# 流式复制、哈希和压缩的块大小
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _extension(file_name: str) -> str:
+    """Allure 附件文件名（<uuid>-attachment.<扩展名>）中的扩展名"""
+    return file_name.partition(".")[2]
+
+
+class ArtifactStore:
+    """
+    按内容寻址的报告附件存储
+
+    附件按 SHA-256 保存为 store_dir/<前两位>/<哈希>.<扩展名>，相同内容只保存一次；
+    Allure 结果目录和截图目录中的文件是指向存储对象的硬链接（跨文件系统时退化为复制）。
+    存储对象的修改时间在每次复用时更新，按保留天数和总大小淘汰最久未使用的对象，
+    淘汰时一并删除其在结果目录和截图目录中的链接。
+    """
 
-class TestReport:
     def __init__(self):
+        self.enabled = False
+        self.store_dir = "reports/artifacts"
+        self.compress_min_bytes: Optional[int] = None
+        self.max_bytes = 2 * 1024 ** 3
+        self.max_age_days = 7.0
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.stored_bytes = 0
+        self.deduplicated = 0
+        self.deduplicated_bytes = 0
+        self.compressed = 0
+        self.compressed_saved_bytes = 0
+
+    def configure(self, test_config) -> None:
+        """
+        从测试配置读取存储目录、压缩阈值和保留策略
+        :param test_config: 测试配置
+        """
+        self.enabled = test_config.artifact_store_enabled
+        self.store_dir = test_config.artifact_store_dir
+        self.compress_min_bytes = test_config.artifact_compress_min_bytes
+        self.max_bytes = test_config.artifact_max_bytes
+        self.max_age_days = test_config.artifact_max_age_days
+
+    def _blob_path(self, digest: str, extension: str) -> str:
+        name = f"{digest}.{extension}" if extension else digest
+        return os.path.join(self.store_dir, digest[:2], name)
+
+    def _tmp_path(self) -> str:
+        os.makedirs(self.store_dir, exist_ok=True)
+        return os.path.join(self.store_dir, f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _commit(self, tmp_path: str, digest: str, extension: str, size: int) -> str:
+        """把临时文件放到内容地址，已存在相同内容时丢弃临时文件并更新使用时间"""
+        path = self._blob_path(digest, extension)
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+            os.utime(path)
+            with self._lock:
+                self.deduplicated += 1
+                self.deduplicated_bytes += size
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stored += 1
+            self.stored_bytes += size
+        return path
+
+    def put_bytes(self, data: bytes, extension: str) -> str:
+        """
+        保存内容
+        :param data: 内容
+        :param extension: 扩展名
+        :return: 存储对象路径
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest, extension)
+        if os.path.exists(path):
+            os.utime(path)
+            with self._lock:
+                self.deduplicated += 1
+                self.deduplicated_bytes += len(data)
+            return path
+        tmp_path = self._tmp_path()
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return self._commit(tmp_path, digest, extension, len(data))
+
+    def put_file(self, source: str, extension: str) -> str:
+        """
+        流式复制并哈希文件（录像、追踪等大文件不整体读入内存）
+        :param source: 源文件路径
+        :param extension: 扩展名
+        :return: 存储对象路径，源文件本身是存储对象时直接返回
+        """
+        if os.path.dirname(os.path.dirname(os.path.abspath(source))) == os.path.abspath(self.store_dir):
+            return source
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = self._tmp_path()
+        with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        return self._commit(tmp_path, digest.hexdigest(), extension, size)
+
+    def put_gzip(self, content: str, extension: str) -> str:
+        """
+        分块编码并以 gzip 格式流式压缩文本，哈希压缩后的内容（gzip 头不含时间戳，相同文本得到相同对象）
+        :param content: 文本内容
+        :param extension: 扩展名，如 html.gz
+        :return: 存储对象路径
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        digest = hashlib.sha256()
+        size = raw_size = 0
+        tmp_path = self._tmp_path()
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(content), _CHUNK_SIZE):
+                raw = content[start:start + _CHUNK_SIZE].encode("utf-8")
+                raw_size += len(raw)
+                chunk = compressor.compress(raw)
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+            chunk = compressor.flush()
+            digest.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+        with self._lock:
+            self.compressed += 1
+            self.compressed_saved_bytes += raw_size - size
+        return self._commit(tmp_path, digest.hexdigest(), extension, size)
+
+    def link(self, blob: str, destination: str) -> None:
+        """
+        在目标位置创建指向存储对象的硬链接，不支持硬链接时复制
+        :param blob: 存储对象路径
+        :param destination: 目标文件路径
+        """
+        tmp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, destination)
+
+    def attach_text(self, content: str, name: str, attachment_type) -> None:
+        """
+        附加文本类内容到 Allure，设置了压缩阈值且内容超过阈值时以 <名称>.gz 附加压缩后的内容（Allure 中只能下载查看）
+        :param content: 文本内容
+        :param name: 附件名称
+        :param attachment_type: allure.attachment_type 中的类型
+        """
+        if not self.enabled or self.compress_min_bytes is None or len(content) < self.compress_min_bytes:
+            allure.attach(content, name=name, attachment_type=attachment_type)
+            return
+        extension = f"{attachment_type.extension}.gz"
+        blob = self.put_gzip(content, extension)
+        allure.attach.file(blob, name=f"{name}.gz", extension=extension)
+
+    def install_allure(self, config) -> int:
+        """
+        用 DedupFileLogger 代替 allure 插件注册的文件日志器（否则两者都会写入附件）；
+        需在 allure 插件的 pytest_configure 之后调用。原日志器在 pytest 清理阶段、allure 插件按原对象注销之前恢复注册
+        :param config: pytest 配置，结果目录来自 --alluredir
+        :return: 替换的日志器数量
+        """
+        report_dir = getattr(config.option, "allure_report_dir", None)
+        originals = [plugin for plugin in plugin_manager.get_plugins() if type(plugin) is AllureFileLogger]
+        if not report_dir or not originals:
+            return 0
+        for original in originals:
+            name = plugin_manager.get_name(original)
+            plugin_manager.unregister(original)
+            logger = DedupFileLogger(report_dir, self)
+            plugin_manager.register(logger)
+            config.add_cleanup(partial(_restore_logger, logger, original, name))
+        return len(originals)
+
+    def enforce_retention(self, linked_dirs: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        淘汰超过保留天数的存储对象，再按最久未使用的顺序淘汰到总大小不超过上限。
+        存储对象与 linked_dirs（Allure 结果目录、截图目录）中的硬链接共用磁盘空间，淘汰时先删除这些链接；
+        仍有其他链接（如已移动到别处的附件）的对象不释放空间，不计入释放的字节数。
+        linked_dirs 中不是存储对象链接的文件不受影响
+        :param linked_dirs: 可能包含存储对象硬链接的目录
+        :return: 淘汰的对象数、删除的链接数、剩余对象数、剩余字节数和已淘汰但仍被其他链接占用的字节数
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        blobs: List[Tuple[float, int, str, Tuple[int, int]]] = []
+        for root, _, files in os.walk(self.store_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                blobs.append((st.st_mtime, st.st_size, path, (st.st_dev, st.st_ino)))
+        inodes = {inode for _, _, _, inode in blobs}
+        links: Dict[Tuple[int, int], List[str]] = {}
+        for dir_path in linked_dirs:
+            for root, _, files in os.walk(dir_path):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    if st.st_nlink > 1 and (st.st_dev, st.st_ino) in inodes:
+                        links.setdefault((st.st_dev, st.st_ino), []).append(path)
+
+        total = sum(size for _, size, _, _ in blobs)
+        removed = unlinked = unreclaimed = 0
+        for mtime, size, path, inode in sorted(blobs):
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            for link_path in links.get(inode, []):
+                try:
+                    os.unlink(link_path)
+                    unlinked += 1
+                except FileNotFoundError:
+                    pass
+            try:
+                freed = os.stat(path).st_nlink == 1
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            if freed:
+                total -= size
+            else:
+                unreclaimed += size
+        return {"removed": removed, "unlinked": unlinked, "blobs": len(blobs) - removed,
+                "bytes": total - unreclaimed, "unreclaimed_bytes": unreclaimed}
+
+    def stats(self) -> Dict[str, Any]:
+        """获取存储和去重统计（当前进程）"""
+        with self._lock:
+            return {
+                "stored": self.stored,
+                "stored_bytes": self.stored_bytes,
+                "deduplicated": self.deduplicated,
+                "deduplicated_bytes": self.deduplicated_bytes,
+                "compressed": self.compressed,
+                "compressed_saved_bytes": self.compressed_saved_bytes,
+            }
+
+
+class DedupFileLogger(AllureFileLogger):
+    """
+    通过 ArtifactStore 写入附件的 Allure 文件日志器，结果和容器文件按原方式写入，存储失败时附件也按原方式写入
+    :param report_dir: Allure 结果目录
+    :param store: 附件存储
+    """
+
+    def __init__(self, report_dir: str, store: ArtifactStore):
+        super().__init__(report_dir)
+        self.report_dir = os.path.abspath(report_dir)
+        self.artifact_store = store
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        try:
+            blob = self.artifact_store.put_file(source, _extension(file_name))
+            self.artifact_store.link(blob, os.path.join(self.report_dir, file_name))
+        except OSError as e:
+            self.artifact_store.logger.warning(f"附件写入存储失败，直接复制: {e}")
+            super().report_attached_file(source, file_name)
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        try:
+            blob = self.artifact_store.put_bytes(data, _extension(file_name))
+            self.artifact_store.link(blob, os.path.join(self.report_dir, file_name))
+        except OSError as e:
+            self.artifact_store.logger.warning(f"附件写入存储失败，直接写入: {e}")
+            super().report_attached_data(body, file_name)
+
+
+def _restore_logger(logger: DedupFileLogger, original: AllureFileLogger, name: Optional[str]) -> None:
+    """注销 DedupFileLogger 并恢复原日志器的注册，使 allure 插件的清理函数能按原对象找到并注销它"""
+    if plugin_manager.is_registered(logger):
+        plugin_manager.unregister(logger)
+    plugin_manager.register(original, name=name)
+
+
+# 全局附件存储
+artifact_store = ArtifactStore()
+
+
+def _replace_sources(node: Any, renames: Dict[str, str]) -> bool:
+    """递归替换结果中（含嵌套步骤）附件的 source，返回是否有修改"""
+    changed = False
+    if isinstance(node, dict):
+        source = node.get("source")
+        if isinstance(source, str) and source in renames:
+            node["source"] = renames[source]
+            changed = True
+        for value in node.values():
+            changed = _replace_sources(value, renames) or changed
+    elif isinstance(node, list):
+        for value in node:
+            changed = _replace_sources(value, renames) or changed
+    return changed
+
+
+def compact_allure_results(results_dir: str) -> Dict[str, int]:
+    """
+    合并 Allure 结果目录中内容相同的附件：指向同一存储对象的硬链接只保留一个文件名，
+    结果和容器文件中的引用改为该文件名，报告生成和上传时相同附件只处理一次。
+    需在所有工作进程结束后调用
+    :param results_dir: Allure 结果目录
+    :return: 附件数、删除的重复附件数和节省的字节数
+    """
+    if not results_dir or not os.path.isdir(results_dir):
+        return {"attachments": 0, "removed": 0, "saved_bytes": 0}
+    canonical: Dict[Tuple[int, int], str] = {}
+    renames: Dict[str, str] = {}
+    saved_bytes = 0
+    attachments = 0
+    for name in sorted(os.listdir(results_dir)):
+        if "-attachment" not in name or name.endswith(".tmp"):
+            continue
+        attachments += 1
+        st = os.stat(os.path.join(results_dir, name))
+        if st.st_nlink < 2:
+            continue
+        first = canonical.setdefault((st.st_dev, st.st_ino), name)
+        if first != name:
+            renames[name] = first
+            saved_bytes += st.st_size
+    if not renames:
+        return {"attachments": attachments, "removed": 0, "saved_bytes": 0}
+    for name in os.listdir(results_dir):
+        if not name.endswith(("-result.json", "-container.json")):
+            continue
+        path = os.path.join(results_dir, name)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not _replace_sources(data, renames):
+            continue
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    for name in renames:
+        os.unlink(os.path.join(results_dir, name))
+    return {"attachments": attachments, "removed": len(renames), "saved_bytes": saved_bytes}
+
+
+class BackgroundWriter:
+    """
+    后台写文件线程，避免磁盘写入阻塞测试进程
+    :param store: 附件存储，指定时文件内容只保存一次，目标文件为指向存储对象的硬链接
+    """
+
+    def __init__(self, store: Optional[ArtifactStore] = None):
+        self.logger = Logger.get_logger()
+        self.store = store
+        self._queue: "queue.Queue[Optional[Tuple[str, bytes]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+        self._thread.start()
+        self.files = 0
+        self.write_seconds = 0.0
+
+    def submit(self, path: str, data: bytes) -> None:
+        """
+        提交写入任务
+        :param path: 文件路径
+        :param data: 文件内容
+        """
+        self._queue.put((path, data))
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                path, data = task
+                start = time.perf_counter()
+                if self.store:
+                    self.store.link(self.store.put_bytes(data, os.path.splitext(path)[1][1:]), path)
+                else:
+                    with open(path, "wb") as f:
+                        f.write(data)
+                self.files += 1
+                self.write_seconds += time.perf_counter() - start
+            except Exception as e:
+                self.logger.error(f"Failed to write {task[0]}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """等待已提交的写入任务完成"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """写完剩余任务后停止线程"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+class ScreenshotPipeline:
+    """
+    失败截图流水线
+
+    截图以 JPEG/PNG 在内存中直接附加到 Allure，可裁剪为视窗或指定元素；
+    落盘由后台线程完成，不在测试进程的关键路径上。
+    """
+
+    def __init__(self, screenshot_dir: str = "reports/screenshots", image_type: str = "jpeg",
+                 quality: int = 70, scope: str = "viewport", clip_selector: Optional[str] = None,
+                 save_to_disk: bool = True, timeout: int = 5000, store: Optional[ArtifactStore] = None):
+        self.logger = Logger.get_logger()
+        self.screenshot_dir = screenshot_dir
+        self.image_type = image_type
+        self.quality = quality
+        self.scope = scope
+        self.clip_selector = clip_selector
+        self.save_to_disk = save_to_disk
+        self.timeout = timeout
+        self.writer = BackgroundWriter(store) if save_to_disk else None
+        self.captures = 0
+        self.bytes = 0
+        self.capture_seconds = 0.0
+        create_dir_if_not_exists(screenshot_dir)
+
+    @classmethod
+    def from_config(cls, test_config) -> "ScreenshotPipeline":
+        """
+        根据测试配置创建截图流水线
+        :param test_config: TestConfig 实例
+        """
+        return cls(
+            screenshot_dir=test_config.screenshot_dir,
+            image_type=test_config.screenshot_type,
+            quality=test_config.screenshot_quality,
+            scope=test_config.screenshot_scope,
+            clip_selector=test_config.screenshot_clip_selector,
+            save_to_disk=test_config.screenshot_save_to_disk,
+            timeout=test_config.screenshot_timeout,
+            store=artifact_store if test_config.artifact_store_enabled else None,
+        )
+
+    @property
+    def attachment_type(self):
+        return allure.attachment_type.JPG if self.image_type == "jpeg" else allure.attachment_type.PNG
+
+    def _screenshot_options(self) -> Dict[str, Any]:
+        options = {
+            "type": self.image_type,
+            "scale": "css",
+            "animations": "disabled",
+            "caret": "hide",
+            "timeout": self.timeout,
+        }
+        if self.image_type == "jpeg":
+            options["quality"] = self.quality
+        return options
+
+    def capture(self, page, name: str, selector: Optional[str] = None) -> bytes:
+        """
+        截图并附加到 Allure，按配置在后台写入磁盘
+        :param page: playwright页面对象
+        :param name: 截图名称
+        :param selector: 只截取该元素，默认使用配置中的 clip_selector
+        :return: 截图内容
+        """
+        start = time.perf_counter()
+        options = self._screenshot_options()
+        selector = selector or self.clip_selector
+        if selector:
+            data = page.locator(selector).first.screenshot(**options)
+        else:
+            data = page.screenshot(full_page=self.scope == "full_page", **options)
+        self._attach(data, name, start)
+        return data
+
+    async def capture_async(self, page, name: str, selector: Optional[str] = None) -> bytes:
+        """
+        capture 的异步版本
+        :param page: playwright异步页面对象
+        :param name: 截图名称
+        :param selector: 只截取该元素，默认使用配置中的 clip_selector
+        :return: 截图内容
+        """
+        start = time.perf_counter()
+        options = self._screenshot_options()
+        selector = selector or self.clip_selector
+        if selector:
+            data = await page.locator(selector).first.screenshot(**options)
+        else:
+            data = await page.screenshot(full_page=self.scope == "full_page", **options)
+        self._attach(data, name, start)
+        return data
+
+    def _attach(self, data: bytes, name: str, start: float) -> None:
+        """附加到 Allure、记录统计并提交后台写入"""
+        allure.attach(data, name=name, attachment_type=self.attachment_type)
+        self.captures += 1
+        self.bytes += len(data)
+        self.capture_seconds += time.perf_counter() - start
+        if self.writer:
+            extension = "jpg" if self.image_type == "jpeg" else "png"
+            file_name = f"{name}_{get_timestamp()}_{get_worker_id()}_{self.captures}.{extension}"
+            path = os.path.join(self.screenshot_dir, file_name)
+            self.writer.submit(path, data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取截图统计，written/write_ms 为后台线程承担的写盘量和耗时，
+        即从测试进程关键路径上节省的时间
+        """
+        return {
+            "captures": self.captures,
+            "bytes": self.bytes,
+            "avg_bytes": self.bytes // self.captures if self.captures else 0,
+            "capture_ms": round(self.capture_seconds * 1000, 1),
+            "written": self.writer.files if self.writer else 0,
+            "write_ms": round(self.writer.write_seconds * 1000, 1) if self.writer else 0.0,
+        }
+
+    def close(self) -> None:
+        """等待后台写入完成并输出统计"""
+        if self.writer:
+            self.writer.close()
+        self.logger.info(f"失败截图统计: {self.stats()}")
+
+
+_default_pipeline: Optional[ScreenshotPipeline] = None
+_default_pipeline_config = None
+_default_pipeline_lock = threading.Lock()
+
+
+def configure_default_screenshot_pipeline(test_config) -> None:
+    """
+    默认截图流水线使用测试配置中的格式、质量和范围；流水线仍在第一次截图时才创建
+    :param test_config: TestConfig 实例
+    """
+    global _default_pipeline_config
+    with _default_pipeline_lock:
+        _default_pipeline_config = test_config
+
+
+def default_screenshot_pipeline(screenshot_dir: str = "reports/screenshots") -> ScreenshotPipeline:
+    """
+    进程内共享的默认截图流水线，首次使用时创建，进程退出时等待后台写入完成
+    :param screenshot_dir: 截图保存目录（仅首次创建且未设置测试配置时生效）
+    """
+    global _default_pipeline
+    with _default_pipeline_lock:
+        if _default_pipeline is None:
+            if _default_pipeline_config is not None:
+                _default_pipeline = ScreenshotPipeline.from_config(_default_pipeline_config)
+            else:
+                _default_pipeline = ScreenshotPipeline(screenshot_dir)
+            atexit.register(_default_pipeline.close)
+        return _default_pipeline
+
+
+def close_default_screenshot_pipeline() -> None:
+    """等待默认截图流水线的后台写入完成并输出统计，未创建过时不做任何事"""
+    global _default_pipeline
+    with _default_pipeline_lock:
+        pipeline, _default_pipeline = _default_pipeline, None
+    if pipeline is not None:
+        atexit.unregister(pipeline.close)
+        pipeline.close()
+
+
+class TestReport:
+    def __init__(self, screenshot_pipeline: Optional[ScreenshotPipeline] = None):
         self.logger = Logger.get_logger()
         self.screenshot_dir = "reports/screenshots"
+        # 未指定时使用共享的默认流水线，避免每个实例各自启动后台写入线程
+        self.screenshot_pipeline = screenshot_pipeline or default_screenshot_pipeline(self.screenshot_dir)
         self.create_report_dirs()
 
     def create_report_dirs(self):
@@ -24,17 +614,8 @@ class TestReport:
         """
         try:
             screenshot_name = name or f"screenshot_{get_timestamp()}"
-            screenshot_path = os.path.join(self.screenshot_dir, f"{screenshot_name}.png")
-            
-            # 保存截图
-            page.screenshot(path=screenshot_path)
-            
-            # 添加到Allure报告
-            allure.attach.file(
-                screenshot_path,
-                name=screenshot_name,
-                attachment_type=allure.attachment_type.PNG
-            )
+            # 截图在内存中附加到报告，落盘由后台线程完成
+            self.screenshot_pipeline.capture(page, screenshot_name)
         except Exception as e:
             self.logger.error(f"Failed to take screenshot: {str(e)}")
 
@@ -45,11 +626,8 @@ class TestReport:
         :param name: 附件名称
         """
         try:
-            allure.attach(
-                content,
-                name=name,
-                attachment_type=allure.attachment_type.HTML
-            )
+            # 设置了 artifact_compress_min_bytes 时超过阈值的内容以 gzip 附加
+            artifact_store.attach_text(content, name, allure.attachment_type.HTML)
         except Exception as e:
             self.logger.error(f"Failed to attach HTML content: {str(e)}")
 
@@ -60,11 +638,7 @@ class TestReport:
         :param name: 附件名称
         """
         try:
-            allure.attach(
-                content,
-                name=name,
-                attachment_type=allure.attachment_type.TEXT
-            )
+            artifact_store.attach_text(content, name, allure.attachment_type.TEXT)
         except Exception as e:
             self.logger.error(f"Failed to attach text content: {str(e)}")
 
@@ -0,0 +1,139 @@
+import fnmatch
+import threading
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional
+from playwright.sync_api import BrowserContext, Route, Request
+from .logger import Logger
+
+
+# 常见的两段公共后缀，位于其下的域名取最后三段作为站点；不是完整的公共后缀列表（Public Suffix List）
+_MULTI_LABEL_SUFFIXES = frozenset({
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn", "ac.cn",
+    "com.hk", "com.tw", "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "co.jp", "ne.jp", "or.jp", "co.kr", "com.au", "net.au", "org.au",
+    "com.br", "com.sg", "com.my", "co.in", "co.nz",
+})
+
+
+def _site(url: str) -> str:
+    """
+    取主机名的可注册域名作为站点标识：一般为最后两段，常见两段公共后缀（如 .com.cn）下为最后三段，IP 地址取完整地址。
+    未列出的多段公共后缀（如 github.io 这类私有后缀）仍按最后两段处理，其下的不同站点会被视为同一站点
+    """
+    host = urlparse(url).hostname or ""
+    labels = host.split(".")
+    if labels[-1].isdigit() or ":" in host:
+        return host
+    if ".".join(labels[-2:]) in _MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class BlockingProfile:
+    """
+    资源拦截配置
+    :param name: 配置名称
+    :param resource_types: 需要拦截的资源类型（image/media/font/stylesheet 等）
+    :param block_third_party: 是否拦截第三方站点的请求
+    :param url_patterns: 需要拦截的 URL 通配符
+    """
+
+    def __init__(self, name: str, resource_types: Optional[List[str]] = None,
+                 block_third_party: bool = False, url_patterns: Optional[List[str]] = None):
+        self.name = name
+        self.resource_types = set(resource_types or [])
+        self.block_third_party = block_third_party
+        self.url_patterns = list(url_patterns or [])
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.resource_types or self.block_third_party or self.url_patterns)
+
+    def block_reason(self, request: Request) -> Optional[str]:
+        """
+        判断请求是否需要拦截
+        :param request: playwright请求对象
+        :return: 拦截原因，不拦截时返回 None
+        """
+        if request.resource_type in self.resource_types:
+            return request.resource_type
+        url = request.url
+        for pattern in self.url_patterns:
+            if fnmatch.fnmatch(url, pattern):
+                return "url_pattern"
+        if self.block_third_party and not request.is_navigation_request():
+            try:
+                page_url = request.frame.page.url
+            except Exception:
+                # Service Worker 等没有所属页面的请求
+                return None
+            if page_url.startswith("http") and _site(url) != _site(page_url):
+                return "third_party"
+        return None
+
+
+class RequestFilter:
+    """通过请求路由应用资源拦截配置，并统计被拦截的请求"""
+
+    def __init__(self, test_config):
+        self.profiles = {
+            name: BlockingProfile(name, **options)
+            for name, options in test_config.blocking_profiles.items()
+        }
+        self.default_profile = test_config.blocking_profile
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self.blocked: Dict[str, Dict[str, int]] = {}
+        self.allowed: Dict[str, int] = {}
+
+    def get_profile(self, name: Optional[str] = None) -> BlockingProfile:
+        """
+        获取拦截配置
+        :param name: 配置名称，默认使用 TestConfig.blocking_profile
+        :return: 拦截配置
+        """
+        name = name or self.default_profile
+        if name not in self.profiles:
+            raise ValueError(f"未知的资源拦截配置: {name}，可选值: {', '.join(self.profiles)}")
+        return self.profiles[name]
+
+    def apply(self, context: BrowserContext, name: Optional[str] = None) -> BlockingProfile:
+        """
+        在上下文上注册拦截路由
+        需在 HAR 回放之后注册，使被拦截的请求不会被计为 HAR 未命中
+        :param context: 浏览器上下文
+        :param name: 配置名称
+        :return: 实际使用的拦截配置
+        """
+        profile = self.get_profile(name)
+        if not profile.is_empty:
+            context.route("**/*", lambda route: self._handle(profile, route))
+        return profile
+
+    def _handle(self, profile: BlockingProfile, route: Route) -> None:
+        reason = profile.block_reason(route.request)
+        with self._lock:
+            if reason is None:
+                self.allowed[profile.name] = self.allowed.get(profile.name, 0) + 1
+            else:
+                counts = self.blocked.setdefault(profile.name, {})
+                counts[reason] = counts.get(reason, 0) + 1
+        if reason is None:
+            route.fallback()
+        else:
+            route.abort("blockedbyclient")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        按配置汇总拦截统计
+        :return: {配置名称: {blocked, allowed, by_reason}}
+        """
+        with self._lock:
+            return {
+                name: {
+                    "blocked": sum(self.blocked.get(name, {}).values()),
+                    "allowed": self.allowed.get(name, 0),
+                    "by_reason": dict(self.blocked.get(name, {})),
+                }
+                for name in set(self.blocked) | set(self.allowed)
+            }
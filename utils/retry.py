@@ -0,0 +1,306 @@
+import time
+import random
+import asyncio
+import inspect
+import threading
+import contextvars
+from functools import wraps
+from typing import Dict, Any, Optional, Callable, Tuple, Type
+from .logger import Logger
+from .metrics import action_metrics
+
+
+class RetryPolicy:
+    """
+    重试策略：异常分类 + 带抖动的指数退避
+    :param attempts: 最大尝试次数（含首次执行）
+    :param base_delay: 首次重试前的基础等待时间（秒）
+    :param max_delay: 单次等待上限（秒）
+    :param multiplier: 退避倍数
+    :param jitter: 抖动比例，0 表示不抖动，1 表示在 [0, delay] 内随机
+    :param retry_on: 可重试的异常类型
+    :param give_up_on: 不可重试的异常类型，优先于 retry_on
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 10.0,
+                 multiplier: float = 2.0, jitter: float = 0.5,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 give_up_on: Tuple[Type[BaseException], ...] = ()):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        判断异常是否值得重试
+        :param error: 捕获到的异常
+        :return: 是否可重试
+        """
+        if isinstance(error, self.give_up_on):
+            return False
+        return isinstance(error, self.retry_on)
+
+    def backoff(self, retry_index: int) -> float:
+        """
+        计算第 retry_index 次重试前的等待时间
+        :param retry_index: 重试序号，从 0 开始
+        :return: 等待时间（秒）
+        """
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** retry_index))
+        return delay * (1 - self.jitter * random.random())
+
+
+class RetryBudget:
+    """单个测试内所有操作共享的重试时间预算"""
+
+    def __init__(self):
+        self.limit: Optional[float] = None
+        self.spent = 0.0
+
+    def start(self, seconds: Optional[float]) -> None:
+        """
+        开始新的预算周期
+        :param seconds: 预算秒数，None 表示不限制
+        """
+        self.limit = seconds
+        self.spent = 0.0
+
+    def allows(self, seconds: float) -> bool:
+        """判断剩余预算是否足够再花费 seconds 秒"""
+        return self.limit is None or self.spent + seconds <= self.limit
+
+    def charge(self, seconds: float) -> None:
+        """记录已花费的重试时间"""
+        self.spent += seconds
+
+
+class RetryStats:
+    """按操作名称统计重试次数和耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.actions: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, action: str, retries: int, retry_seconds: float, failed: bool) -> None:
+        with self._lock:
+            entry = self.actions.setdefault(
+                action, {"calls": 0, "retries": 0, "failures": 0, "retry_seconds": 0.0}
+            )
+            entry["calls"] += 1
+            entry["retries"] += retries
+            entry["failures"] += int(failed)
+            entry["retry_seconds"] = round(entry["retry_seconds"] + retry_seconds, 3)
+
+    def retried(self) -> Dict[str, Dict[str, Any]]:
+        """只返回发生过重试的操作"""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self.actions.items() if entry["retries"]}
+
+    def merge(self, other: "RetryStats") -> None:
+        """合并另一份统计"""
+        for name, entry in other.actions.items():
+            with self._lock:
+                target = self.actions.setdefault(
+                    name, {"calls": 0, "retries": 0, "failures": 0, "retry_seconds": 0.0}
+                )
+                for key in ("calls", "retries", "failures"):
+                    target[key] += entry[key]
+                target["retry_seconds"] = round(target["retry_seconds"] + entry["retry_seconds"], 3)
+
+
+# 并发场景任务（asyncio 任务复制执行上下文）各自的时间预算和统计，未设置时使用当前测试的
+_task_budget: contextvars.ContextVar = contextvars.ContextVar("retry_task_budget", default=None)
+_task_stats: contextvars.ContextVar = contextvars.ContextVar("retry_task_stats", default=None)
+
+
+class RetryEngine:
+    """重试执行器，持有默认策略、当前测试的时间预算和统计"""
+
+    def __init__(self):
+        self.logger = Logger.get_logger()
+        self.attempts = 3
+        self.base_delay = 1.0
+        self.max_delay = 10.0
+        self._budget = RetryBudget()
+        self._test_stats = RetryStats()
+        self.session_stats = RetryStats()
+
+    @property
+    def budget(self) -> RetryBudget:
+        """当前执行上下文的时间预算"""
+        return _task_budget.get() or self._budget
+
+    @property
+    def test_stats(self) -> RetryStats:
+        """当前执行上下文的重试统计"""
+        return _task_stats.get() or self._test_stats
+
+    def configure(self, test_config) -> None:
+        """
+        使用测试配置中的重试参数
+        :param test_config: TestConfig 实例
+        """
+        self.attempts = test_config.retry_count
+        self.base_delay = test_config.retry_delay
+        self.max_delay = test_config.retry_max_delay
+
+    def start_test(self, budget_seconds: Optional[float]) -> None:
+        """开始新的测试：重置时间预算和单测统计"""
+        self._budget.start(budget_seconds)
+        self._test_stats = RetryStats()
+
+    def isolate(self) -> RetryStats:
+        """
+        在当前执行上下文（如并发场景的 asyncio 任务）中使用独立的时间预算（额度与当前测试相同）和统计，
+        避免同一线程上交错执行的场景互相消耗预算
+        :return: 该上下文的统计，由调用方合并到当前测试
+        """
+        budget = RetryBudget()
+        budget.start(self._budget.limit)
+        stats = RetryStats()
+        _task_budget.set(budget)
+        _task_stats.set(stats)
+        return stats
+
+    def finish_test(self) -> Dict[str, Dict[str, Any]]:
+        """
+        结束当前测试并合并统计
+        :return: 当前测试中发生过重试的操作统计
+        """
+        self.session_stats.merge(self.test_stats)
+        return self.test_stats.retried()
+
+    def policy(self, attempts: Optional[int] = None, delay: Optional[float] = None,
+               **kwargs) -> RetryPolicy:
+        """基于默认配置创建策略"""
+        return RetryPolicy(
+            attempts=attempts if attempts is not None else self.attempts,
+            base_delay=delay if delay is not None else self.base_delay,
+            max_delay=self.max_delay,
+            **kwargs
+        )
+
+    def call(self, action: str, func: Callable, policy: RetryPolicy, *args, **kwargs) -> Any:
+        """
+        按策略执行函数
+        :param action: 操作名称，用于日志和统计
+        :param func: 被执行的函数
+        :param policy: 重试策略
+        :return: 函数返回值
+        """
+        state = _RetryState()
+        while True:
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_failure(action, policy, state, e, time.perf_counter() - started)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._on_success(action, state, time.perf_counter() - started)
+            return result
+
+    async def call_async(self, action: str, func: Callable, policy: RetryPolicy, *args, **kwargs) -> Any:
+        """
+        按策略执行异步函数，退避等待不阻塞事件循环
+        :param action: 操作名称，用于日志和统计
+        :param func: 被执行的异步函数
+        :param policy: 重试策略
+        :return: 函数返回值
+        """
+        state = _RetryState()
+        while True:
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_failure(action, policy, state, e, time.perf_counter() - started)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._on_success(action, state, time.perf_counter() - started)
+            return result
+
+    def _on_success(self, action: str, state: "_RetryState", elapsed: float) -> None:
+        if state.attempt:
+            state.retry_seconds += elapsed
+            self.budget.charge(elapsed)
+        self.test_stats.record(action, state.retries, state.retry_seconds, failed=False)
+        action_metrics.add_retry(state.retry_seconds)
+
+    def _on_failure(self, action: str, policy: RetryPolicy, state: "_RetryState",
+                    error: Exception, elapsed: float) -> Optional[float]:
+        """
+        处理一次失败
+        :return: 重试前的等待时间（秒），不再重试时返回 None
+        """
+        if state.attempt:
+            state.retry_seconds += elapsed
+            self.budget.charge(elapsed)
+        state.attempt += 1
+        if not policy.is_retryable(error) or state.attempt >= policy.attempts:
+            self._give_up(action, state, error)
+            return None
+        delay = policy.backoff(state.retries)
+        # 下一次尝试按刚失败的这次耗时估算（超时失败时即为完整的操作超时），连同等待时间一起计入预算检查
+        if not self.budget.allows(delay + elapsed):
+            self.logger.warning(f"{action} 重试时间预算已耗尽，不再重试: {str(error)}")
+            self._give_up(action, state, error)
+            return None
+        self.logger.warning(f"{action} 第 {state.attempt} 次尝试失败，{delay:.2f}s 后重试: {str(error)}")
+        state.retries += 1
+        state.retry_seconds += delay
+        action_metrics.mark_retrying()
+        self.budget.charge(delay)
+        return delay
+
+    def _give_up(self, action: str, state: "_RetryState", error: Exception) -> None:
+        self.test_stats.record(action, state.retries, state.retry_seconds, failed=True)
+        action_metrics.add_retry(state.retry_seconds)
+        self.logger.error(f"{action} 在 {state.attempt} 次尝试后仍然失败: {type(error).__name__}")
+
+
+class _RetryState:
+    """单次调用的重试进度"""
+
+    def __init__(self):
+        self.attempt = 0
+        self.retries = 0
+        self.retry_seconds = 0.0
+
+
+# 全局重试执行器
+retry_engine = RetryEngine()
+
+
+def retry(retries: Optional[int] = None, delay: Optional[float] = None,
+          retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+          give_up_on: Tuple[Type[BaseException], ...] = ()):
+    """
+    重试装饰器，支持同步和异步函数，未指定的参数使用 TestConfig.retry_count / retry_delay
+    :param retries: 最大尝试次数
+    :param delay: 基础退避时间（秒）
+    :param retry_on: 可重试的异常类型
+    :param give_up_on: 不可重试的异常类型
+    """
+    def decorator(func: Callable):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                policy = retry_engine.policy(retries, delay, retry_on=retry_on, give_up_on=give_up_on)
+                return await retry_engine.call_async(func.__qualname__, func, policy, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            policy = retry_engine.policy(retries, delay, retry_on=retry_on, give_up_on=give_up_on)
+            return retry_engine.call(func.__qualname__, func, policy, *args, **kwargs)
+        return wrapper
+    return decorator
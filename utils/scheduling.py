@@ -0,0 +1,153 @@
+import os
+import json
+import heapq
+import threading
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .helpers import file_lock
+from .logger import Logger
+
+# 历史耗时的指数移动平均系数，越大越偏向最近一次运行
+_EWMA_ALPHA = 0.3
+
+# 没有任何历史数据时对单个测试的耗时估计（秒）
+_DEFAULT_ESTIMATE = 1.0
+
+
+class DurationHistory:
+    """
+    按测试 nodeid（场景大纲的每个示例单独记录）保存的历史耗时
+
+    文件格式为 {nodeid: {"seconds": 指数移动平均耗时, "runs": 运行次数}}，
+    写入时持有文件锁并原子替换，多个 CI 任务共享同一个文件也是安全的。
+    :param path: 历史文件路径
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = Logger.get_logger()
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"耗时历史 {self.path} 无法读取，按无历史处理: {e}")
+            return {}
+
+    def default_estimate(self) -> float:
+        """没有历史的测试的耗时估计：已知测试耗时的中位数"""
+        with self._lock:
+            known = [entry["seconds"] for entry in self.entries.values()]
+        return median(known) if known else _DEFAULT_ESTIMATE
+
+    def estimate(self, test_ids: Iterable[str]) -> Dict[str, float]:
+        """
+        获取一组测试的预计耗时
+        :param test_ids: 测试 nodeid
+        :return: {nodeid: 预计耗时（秒）}
+        """
+        default = self.default_estimate()
+        with self._lock:
+            return {
+                test_id: self.entries[test_id]["seconds"] if test_id in self.entries else default
+                for test_id in test_ids
+            }
+
+    def update(self, durations: Dict[str, float]) -> None:
+        """
+        合并本次运行的耗时并写回文件（与文件中其他进程写入的记录合并）
+        :param durations: {nodeid: 耗时（秒）}
+        """
+        if not durations:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            with self._lock:
+                self.entries = self._read()
+                for test_id, seconds in durations.items():
+                    entry = self.entries.get(test_id)
+                    if entry is None:
+                        self.entries[test_id] = {"seconds": round(seconds, 4), "runs": 1}
+                    else:
+                        entry["seconds"] = round(_EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * entry["seconds"], 4)
+                        entry["runs"] += 1
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.entries, f, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_path, self.path)
+
+
+def lpt_order(test_ids: Sequence[str], estimates: Dict[str, float]) -> List[str]:
+    """
+    按预计耗时从长到短排序，耗时相同时保持原有顺序
+    :param test_ids: 测试 nodeid
+    :param estimates: 预计耗时
+    """
+    return sorted(test_ids, key=lambda test_id: -estimates[test_id])
+
+
+def lpt_partition(test_ids: Sequence[str], estimates: Dict[str, float], count: int) -> Tuple[List[List[str]], List[float]]:
+    """
+    最长处理时间优先（LPT）分组：依次把耗时最长的测试分给当前总耗时最小的组
+    :param test_ids: 测试 nodeid
+    :param estimates: 预计耗时
+    :param count: 分组数
+    :return: (各组 nodeid 列表, 各组预计总耗时)
+    """
+    groups: List[List[str]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    heap = [(0.0, index) for index in range(count)]
+    for test_id in lpt_order(test_ids, estimates):
+        load, index = heapq.heappop(heap)
+        groups[index].append(test_id)
+        loads[index] = load + estimates[test_id]
+        heapq.heappush(heap, (loads[index], index))
+    return groups, loads
+
+
+def parse_shard(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    解析分片参数 "i/n"（i 从 1 开始）
+    :param value: 分片参数
+    :return: (i, n)，未指定时返回 None
+    """
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"分片参数格式应为 i/n: {value}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号超出范围: {value}")
+    return index, count
+
+
+def makespan_report(test_durations: Dict[str, Tuple[str, float]], history: DurationHistory,
+                    wall_seconds: float) -> Dict[str, Any]:
+    """
+    比较本次运行的预计和实际完成时间
+    :param test_durations: {nodeid: (工作进程ID, 实际耗时)}
+    :param history: 运行前的耗时历史
+    :param wall_seconds: 会话实际耗时
+    :return: 预计/实际完成时间和各工作进程负载
+    """
+    worker_loads: Dict[str, float] = {}
+    for worker_id, seconds in test_durations.values():
+        worker_loads[worker_id] = worker_loads.get(worker_id, 0.0) + seconds
+    workers = max(len(worker_loads), 1)
+    estimates = history.estimate(test_durations)
+    _, predicted_loads = lpt_partition(list(test_durations), estimates, workers)
+    return {
+        "tests": len(test_durations),
+        "workers": workers,
+        "predicted_makespan": round(max(predicted_loads, default=0.0), 3),
+        "actual_makespan": round(max(worker_loads.values(), default=0.0), 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "worker_loads": {worker_id: round(load, 3) for worker_id, load in sorted(worker_loads.items())},
+        "unknown_tests": sum(1 for test_id in test_durations if test_id not in history.entries),
+    }
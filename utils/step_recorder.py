@@ -0,0 +1,291 @@
+import time
+import inspect
+import threading
+import contextvars
+from functools import wraps
+from typing import Dict, Any, List, Optional, Callable
+from allure_commons._allure import StepContext
+from allure_commons.utils import func_parameters, represent
+from .logger import current_step
+from .impact import impact_recorder, function_symbol
+
+
+# 步骤记录模式
+FULL = "full"              # 每个步骤都写入 Allure
+TOP_LEVEL = "top-level"    # 只记录最外层操作，内部辅助步骤并入父步骤
+BUFFERED = "buffered"      # 步骤先缓存在内存中，仅在测试失败时写入 Allure
+
+_MODES = (FULL, TOP_LEVEL, BUFFERED)
+
+
+class BufferedStep:
+    """缓存中的步骤记录"""
+
+    def __init__(self, title: str, params: Dict[str, Any]):
+        self.title = title
+        self.params = params
+        self.children: List["BufferedStep"] = []
+        self.duration = 0.0
+        self.error: Optional[BaseException] = None
+
+
+class _StepFrame:
+    """正在执行的步骤"""
+
+    def __init__(self, emit: bool):
+        self.emit = emit
+        self.context: Optional[StepContext] = None
+        self.node: Optional[BufferedStep] = None
+        self.depth_token = None
+        self.current_token = None
+        self.log_token = None
+
+
+_depth: contextvars.ContextVar = contextvars.ContextVar("step_depth", default=0)
+_current: contextvars.ContextVar = contextvars.ContextVar("step_current", default=None)
+# 当前执行上下文的步骤是否与其他并发场景隔离：隔离时只缓存，不进入 Allure 按线程维护的步骤栈
+_isolated: contextvars.ContextVar = contextvars.ContextVar("step_isolated", default=False)
+
+
+class StepRecorder:
+    """
+    BasePage 步骤记录器
+
+    根据 TestConfig.step_recording_mode 决定步骤如何写入 Allure，
+    并统计每种模式下记录步骤本身的开销。
+    """
+
+    def __init__(self):
+        self.mode = FULL
+        self._lock = threading.Lock()
+        self._buffer = _BufferRoots()
+        self.steps = 0
+        self.emitted = 0
+        self.overhead_seconds = 0.0
+
+    def configure(self, mode: str) -> None:
+        """
+        设置步骤记录模式
+        :param mode: full / top-level / buffered
+        """
+        if mode not in _MODES:
+            raise ValueError(f"未知的步骤记录模式: {mode}，可选值: {', '.join(_MODES)}")
+        self.mode = mode
+
+    def _account(self, overhead: float, emitted: bool) -> None:
+        with self._lock:
+            self.steps += 1
+            self.emitted += int(emitted)
+            self.overhead_seconds += overhead
+
+    def _begin(self, title: str, func: Callable, args: tuple, kwargs: dict) -> "_StepFrame":
+        """进入步骤：按模式写入 Allure 或缓存，并增加嵌套深度"""
+        depth = _depth.get()
+        recorded = self.mode == FULL or (self.mode == TOP_LEVEL and depth == 0)
+        frame = _StepFrame(emit=recorded and not _isolated.get())
+        if recorded or self.mode == BUFFERED:
+            params = func_parameters(func, *args, **kwargs)
+            formatted = _format_title(title, args, params)
+            frame.log_token = current_step.set(formatted)
+            if frame.emit:
+                frame.context = StepContext(formatted, params)
+                frame.context.__enter__()
+            else:
+                frame.node = BufferedStep(formatted, params)
+                parent = _current.get()
+                (parent.children if parent else self._buffer.get()).append(frame.node)
+                frame.current_token = _current.set(frame.node)
+        frame.depth_token = _depth.set(depth + 1)
+        return frame
+
+    def _end(self, frame: "_StepFrame", duration: float, error: Optional[BaseException]) -> None:
+        """离开步骤：恢复嵌套深度并记录结果"""
+        _depth.reset(frame.depth_token)
+        if frame.log_token is not None:
+            current_step.reset(frame.log_token)
+        if frame.current_token is not None:
+            _current.reset(frame.current_token)
+        if frame.context is not None:
+            if error is None:
+                frame.context.__exit__(None, None, None)
+            else:
+                frame.context.__exit__(type(error), error, error.__traceback__)
+        if frame.node is not None:
+            frame.node.duration = duration
+            frame.node.error = error
+
+    def run(self, title: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """
+        按当前模式执行一个步骤
+        :param title: 步骤标题模板
+        :param func: 步骤函数
+        :return: 函数返回值
+        """
+        entered = time.perf_counter()
+        frame = self._begin(title, func, args, kwargs)
+        started = time.perf_counter()
+        error = None
+        try:
+            return func(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            finished = time.perf_counter()
+            self._end(frame, finished - started, error)
+            self._account((started - entered) + (time.perf_counter() - finished), frame.emit)
+
+    async def run_async(self, title: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """
+        按当前模式执行一个异步步骤
+        :param title: 步骤标题模板
+        :param func: 异步步骤函数
+        :return: 函数返回值
+        """
+        entered = time.perf_counter()
+        frame = self._begin(title, func, args, kwargs)
+        started = time.perf_counter()
+        error = None
+        try:
+            return await func(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            finished = time.perf_counter()
+            self._end(frame, finished - started, error)
+            self._account((started - entered) + (time.perf_counter() - finished), frame.emit)
+
+    def start_test(self) -> None:
+        """开始新的测试，丢弃上一个测试的缓存步骤"""
+        self._buffer.clear()
+
+    def isolate(self) -> List[BufferedStep]:
+        """
+        在当前执行上下文（如并发场景的 asyncio 任务）中隔离步骤记录：步骤按当前模式的记录范围缓存，
+        由调用方在并发结束后通过 replay 依次写入 Allure
+        :return: 该上下文的顶层步骤列表
+        """
+        _isolated.set(True)
+        self._buffer.clear()
+        return self._buffer.get()
+
+    def replay(self, title: str, steps: List[BufferedStep], duration: float,
+               error: Optional[BaseException] = None) -> None:
+        """
+        把一组缓存步骤作为 title 的子步骤写入 Allure
+        :param title: 父步骤标题
+        :param steps: 缓存的顶层步骤
+        :param duration: 父步骤耗时（秒）
+        :param error: 父步骤的异常
+        """
+        node = BufferedStep(title, {})
+        node.children = steps
+        node.duration = duration
+        node.error = error
+        _replay(node)
+
+    def mark(self) -> int:
+        """
+        当前缓存的顶层步骤数量，作为 flush 的起始位置，例如在每个 BDD 步骤开始时记录
+        """
+        return len(self._buffer.get())
+
+    def flush(self, title: Optional[str] = None, start: int = 0) -> int:
+        """
+        将缓存的步骤写入 Allure（仅 buffered 模式）并从缓存中移除，步骤标题附带实际耗时
+        :param title: 指定时把这些步骤合并为一个该标题的步骤写入，否则作为当前步骤的子步骤逐个写入
+        :param start: 从第几个顶层步骤开始写入
+        :return: 写入的顶层步骤数量
+        """
+        roots = self._buffer.get()
+        nodes = roots[start:]
+        if nodes and title is not None:
+            self.replay(title, nodes, sum(node.duration for node in nodes))
+        else:
+            for node in nodes:
+                _replay(node)
+        del roots[start:]
+        return len(nodes)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取步骤记录开销统计
+        :return: 统计信息字典
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "steps": self.steps,
+                "emitted": self.emitted,
+                "overhead_ms": round(self.overhead_seconds * 1000, 2),
+                "avg_overhead_us": round(self.overhead_seconds / self.steps * 1e6, 1) if self.steps else 0.0,
+            }
+
+
+class _BufferRoots:
+    """按执行上下文隔离的顶层缓存步骤列表"""
+
+    def __init__(self):
+        self._roots: contextvars.ContextVar = contextvars.ContextVar("step_buffer", default=None)
+
+    def get(self) -> List[BufferedStep]:
+        roots = self._roots.get()
+        if roots is None:
+            roots = []
+            self._roots.set(roots)
+        return roots
+
+    def clear(self) -> None:
+        self._roots.set([])
+
+
+def _format_title(title: str, args: tuple, params: Dict[str, Any]) -> str:
+    """与 allure.step 相同的标题格式化规则"""
+    try:
+        return title.format(*[represent(arg) for arg in args], **params)
+    except (IndexError, KeyError):
+        return title
+
+
+def _replay(node: BufferedStep) -> None:
+    """递归写入缓存步骤"""
+    context = StepContext(f"{node.title} ({node.duration * 1000:.0f} ms)", node.params)
+    context.__enter__()
+    for child in node.children:
+        _replay(child)
+    error = node.error
+    if error is None:
+        context.__exit__(None, None, None)
+    else:
+        context.__exit__(type(error), error, error.__traceback__)
+
+
+# 全局步骤记录器
+step_recorder = StepRecorder()
+
+
+def step(title: str):
+    """
+    替代 allure.step 的步骤装饰器，支持同步和异步函数，记录方式由 step_recorder 的模式决定
+    :param title: 步骤标题，支持与 allure.step 相同的参数占位符
+    """
+    def decorator(func: Callable):
+        # 变更影响分析使用的符号名，如 pages/base_page.py::BasePage.click
+        symbol = function_symbol(func)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                __tracebackhide__ = True
+                impact_recorder.use(symbol)
+                return await step_recorder.run_async(title, func, args, kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            __tracebackhide__ = True
+            impact_recorder.use(symbol)
+            return step_recorder.run(title, func, args, kwargs)
+        return wrapper
+    return decorator
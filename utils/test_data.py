@@ -0,0 +1,187 @@
+import io
+import os
+import csv
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .logger import Logger
+
+# 项目根目录，相对路径的数据文件以此为基准
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 一次性解析的数据文件格式
+_PARSERS = {
+    ".json": lambda f: json.load(f),
+    ".jsonl": lambda f: [json.loads(line) for line in f if line.strip()],
+    ".csv": lambda f: list(csv.DictReader(f)),
+}
+
+# 支持逐行读取的数据集格式
+_STREAMING = (".jsonl", ".csv")
+
+
+def resolve_data_path(path: str) -> str:
+    """
+    解析数据文件路径，相对路径基于项目根目录
+    :param path: 文件路径
+    """
+    return path if os.path.isabs(path) else os.path.join(_PROJECT_ROOT, path)
+
+
+def _file_key(path: str) -> Tuple[str, int, int]:
+    """文件的缓存键：绝对路径、修改时间和大小，文件被改写后键随之变化"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+class DataCache:
+    """
+    进程内数据文件缓存，按路径和修改时间判断是否失效，按文件大小之和做 LRU 淘汰
+
+    返回的是缓存中的对象本身，调用方不应修改；需要修改时自行复制。
+    :param max_bytes: 缓存文件大小之和的上限，超过上限的单个文件不缓存
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, path: str) -> Any:
+        """
+        读取并解析数据文件（.json/.jsonl/.csv），未修改的文件直接返回缓存
+        :param path: 文件路径
+        :return: 解析后的数据
+        """
+        abs_path, mtime_ns, size = _file_key(path)
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry[:2] == (mtime_ns, size):
+                self._entries.move_to_end(abs_path)
+                self.hits += 1
+                return entry[2]
+        extension = os.path.splitext(abs_path)[1].lower()
+        if extension not in _PARSERS:
+            raise ValueError(f"不支持的数据文件格式: {abs_path}")
+        with open(abs_path, "r", encoding="utf-8", newline="") as f:
+            data = _PARSERS[extension](f)
+        with self._lock:
+            self.misses += 1
+            self._discard(abs_path)
+            if size <= self.max_bytes:
+                self._entries[abs_path] = (mtime_ns, size, data)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+                    self.evictions += 1
+        return data
+
+    def _discard(self, abs_path: str) -> None:
+        entry = self._entries.pop(abs_path, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存命中和淘汰统计"""
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# 全局数据文件缓存
+data_cache = DataCache()
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取 JSONL/CSV 数据集，不把整个文件载入内存
+    :param path: 文件路径
+    :return: 记录迭代器，CSV 记录以表头为键
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _STREAMING:
+        raise ValueError(f"只支持逐行读取 JSONL/CSV 数据集: {path}")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class RecordIndex:
+    """
+    JSONL/CSV 数据集的行偏移索引，按序号随机读取单条记录
+    CSV 的每条记录必须占一行（不支持字段内换行）
+    :param path: 文件路径
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.extension = os.path.splitext(path)[1].lower()
+        if self.extension not in _STREAMING:
+            raise ValueError(f"只支持索引 JSONL/CSV 数据集: {path}")
+        self.header: Optional[List[str]] = None
+        self.offsets: List[int] = []
+        with open(self.path, "rb") as f:
+            if self.extension == ".csv":
+                self.header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    self.offsets.append(offset)
+                offset += len(line)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def read(self, index: int) -> Dict[str, Any]:
+        """
+        读取第 index 条记录
+        :param index: 记录序号，从 0 开始
+        """
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[index])
+            line = f.readline().decode("utf-8")
+        if self.extension == ".csv":
+            values = next(csv.reader(io.StringIO(line)), [])
+            return dict(zip(self.header, values))
+        return json.loads(line)
+
+
+_index_lock = threading.Lock()
+_indexes: Dict[str, Tuple[Tuple[int, int], RecordIndex]] = {}
+
+
+def get_record_index(path: str) -> RecordIndex:
+    """
+    获取数据集的行偏移索引，文件修改后重建
+    :param path: 文件路径
+    """
+    abs_path, mtime_ns, size = _file_key(path)
+    with _index_lock:
+        cached = _indexes.get(abs_path)
+        if cached is not None and cached[0] == (mtime_ns, size):
+            return cached[1]
+    index = RecordIndex(abs_path)
+    with _index_lock:
+        _indexes[abs_path] = ((mtime_ns, size), index)
+    Logger.get_logger().debug(f"数据集索引 {abs_path}: {len(index)} 条记录")
+    return index